@@ -0,0 +1,51 @@
+import itertools
+import random
+
+from user import Academy, AcademyIndex
+
+SPORTS = ["Cricket", "Football", "Chess"]
+STATES = ["Delhi", "Maharashtra", "Karnataka"]
+CITIES = ["New Delhi", "Mumbai", "Pune", "Bengaluru", None]
+
+
+def build(count=300, seed=1):
+    rng = random.Random(seed)
+    index = AcademyIndex()
+    rows = []
+    for academy_id in range(1, count + 1):
+        academy = Academy(id=academy_id, name=f"Academy {academy_id}")
+        city = rng.choice(CITIES)
+        if city is not None:
+            academy["city"] = city
+        sport, state = rng.choice(SPORTS), rng.choice(STATES)
+        index.add(academy, sport, state)
+        rows.append((sport, state, city, academy))
+    return index, rows
+
+
+def brute_force(rows, sport, state, city):
+    return [academy for row_sport, row_state, row_city, academy in rows
+            if sport in (None, row_sport) and state in (None, row_state) and city in (None, row_city)]
+
+
+def test_lookup_matches_brute_force():
+    index, rows = build()
+    for sport, state, city in itertools.product(SPORTS + [None], STATES + [None], CITIES + ["Chennai"]):
+        assert index.lookup(sport, state, city) == brute_force(rows, sport, state, city)
+
+
+def test_remove_and_resolve():
+    index, rows = build()
+    rng = random.Random(2)
+    removed = rng.sample(rows, 100)
+    for row in removed:
+        index.remove(row[3])
+    rows = [row for row in rows if row not in removed]
+    assert len(index) == len(rows)
+    for sport, state, city in itertools.product(SPORTS + [None], STATES + [None], CITIES):
+        assert index.lookup(sport, state, city) == brute_force(rows, sport, state, city)
+    for sport, state, city, academy in rows:
+        assert index.resolve(academy["id"]) == (sport, state, city, academy)
+        assert index.location(academy) == (sport, state, city)
+    assert all(index.resolve(row[3]["id"]) is None for row in removed)
+    assert index.next_id() == max(academy["id"] for *_, academy in rows) + 1
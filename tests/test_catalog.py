@@ -0,0 +1,41 @@
+from user import Academy, Catalog, Course, EquipmentItem, Webinar, write_synthetic_catalog
+
+
+def test_sections_load_on_first_use():
+    catalog = Catalog()
+    assert not any(catalog.is_loaded(name) for name in Catalog.SECTIONS)
+    courses = catalog.section("courses")
+    assert catalog.is_loaded("courses") and not catalog.is_loaded("academies")
+    assert catalog.section("courses") is courses
+    assert all(isinstance(course, Course) and course["id"] == course_id for course_id, course in courses.items())
+
+
+def test_shipped_catalog_builds_typed_records():
+    catalog = Catalog()
+    for name in Catalog.SECTIONS:
+        assert catalog.section(name)
+    academies = [academy for by_state in catalog.section("academies").values()
+                 for state_academies in by_state.values() for academy in state_academies]
+    assert all(isinstance(academy, Academy) for academy in academies)
+    assert len({academy["id"] for academy in academies}) == len(academies)
+    assert all(isinstance(webinar, Webinar) for webinar in catalog.section("webinars").values())
+    assert all(isinstance(item, EquipmentItem) for item in catalog.section("equipment").values())
+    assert all(len(point) == 2 for point in catalog.section("cities").values())
+
+
+def test_synthetic_catalog_academies_resolve_by_id(tmp_path):
+    write_synthetic_catalog(str(tmp_path), 60)
+    catalog = Catalog(str(tmp_path))
+    index = catalog.academy_index
+    assert len(index) == 60
+    for academy in index.lookup():
+        sport, state, city, record = index.resolve(academy["id"])
+        assert record is academy and academy in catalog.section("academies")[sport][state]
+
+    academy = Academy.from_dict({"name": "New Academy", "rating": 4.0, "coach": "Coach", "facilities": [],
+                                 "address": "", "city": "Pune", "fees": "", "timings": ""})
+    catalog.add_academy(academy, "Chess", "Maharashtra")
+    assert academy["id"] == 61
+    assert index.lookup("Chess", "Maharashtra", "Pune") == [academy]
+    catalog.remove_academy(academy)
+    assert index.resolve(61) is None and index.lookup("Chess", "Maharashtra", "Pune") == []
@@ -0,0 +1,96 @@
+import random
+
+import pytest
+
+import user
+from user import ColumnarTable, EquipmentItem
+
+CATEGORIES = ["Cricket", "Football", "Chess"]
+DERIVED = {"discounted_price": (("price", "discount"), lambda price, discount: price * (100 - discount) / 100)}
+
+
+@pytest.fixture(params=["numpy", "array"])
+def backend(request, monkeypatch):
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(user, "np", None)
+    return request.param
+
+
+def random_items(count, seed):
+    rng = random.Random(seed)
+    return [EquipmentItem(id=item_id, category=rng.choice(CATEGORIES), price=rng.randint(1, 40) * 250,
+                          discount=rng.choice([0, 5, 10, 20]), rating=rng.choice([3.5, 4.0, 4.5, 5.0]),
+                          stock=rng.randint(0, 5))
+            for item_id in range(count)]
+
+
+def build(items):
+    return ColumnarTable(items, numeric=("price", "discount", "rating", "stock"), categorical=("category",),
+                         derived=DERIVED)
+
+
+def brute_force(items, equals, ranges, sort, descending):
+    def value(item, name):
+        return item["price"] * (100 - item["discount"]) / 100 if name == "discounted_price" else item[name]
+
+    rows = [item for item in items
+            if all(item[name] == wanted for name, wanted in equals.items())
+            and all((low is None or value(item, name) >= low) and (high is None or value(item, name) <= high)
+                    for name, (low, high) in ranges.items())]
+    return sorted(rows, key=lambda item: (-value(item, sort) if descending else value(item, sort), item["id"]))
+
+
+def read_all(table, limit, **query):
+    records, cursor, total = table.select(limit=limit, **query)
+    found = list(records)
+    while cursor is not None:
+        assert len(records) == limit
+        records, cursor, page_total = table.select(after=cursor, limit=limit, **query)
+        assert page_total == total
+        found.extend(records)
+    return found, total
+
+
+QUERIES = [
+    ({}, {}, "id", False),
+    ({"category": "Cricket"}, {}, "rating", True),
+    ({}, {"price": (2000, 6000)}, "price", False),
+    ({"category": "Chess"}, {"stock": (1, None), "discounted_price": (None, 5000)}, "discounted_price", False),
+    ({}, {"rating": (4.5, None)}, "stock", True),
+    ({"category": "Hockey"}, {}, "id", False),
+]
+
+
+@pytest.mark.parametrize("equals, ranges, sort, descending", QUERIES)
+@pytest.mark.parametrize("limit", [1, 20, 1000])
+def test_select_matches_brute_force(backend, equals, ranges, sort, descending, limit):
+    items = random_items(300, seed=1)
+    table = build(items)
+    expected = brute_force(items, equals, ranges, sort, descending)
+    found, total = read_all(table, limit, equals=equals, ranges=ranges, sort=sort, descending=descending)
+    assert found == expected and total == len(expected)
+
+
+def test_update_refreshes_row_and_derived_columns(backend):
+    items = random_items(200, seed=2)
+    table = build(items)
+    rng = random.Random(3)
+    for item in rng.sample(items, 50):
+        item.update({"price": rng.randint(1, 40) * 250, "discount": 50,
+                     "category": rng.choice(CATEGORIES + ["Hockey"])})
+        table.update(item)
+    table.update(EquipmentItem(id=10 ** 6, price=1))
+    assert table.value(items[0]["id"], "discounted_price") == items[0]["price"] * (100 - items[0]["discount"]) / 100
+    for equals, ranges, sort, descending in QUERIES + [({"category": "Hockey"}, {}, "price", True)]:
+        found, _ = read_all(table, 20, equals=equals, ranges=ranges, sort=sort, descending=descending)
+        assert found == brute_force(items, equals, ranges, sort, descending)
+
+
+def test_from_columns(backend):
+    table = ColumnarTable.from_columns({"id": [3, 1, 2], "price": [30.0, 10.0, 10.0], "sport": ["a", "b", "a"]},
+                                       categorical=("sport",))
+    assert table.select(sort="price")[0] == [1, 2, 3]
+    assert table.select(equals={"sport": "a"}, sort="price", descending=True)[0] == [3, 2]
+    assert len(table) == 3
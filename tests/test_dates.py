@@ -0,0 +1,58 @@
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from user import Catalog, Webinar, parse_date, webinar_window
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("Friday, 17th March 2023", date(2023, 3, 17)),
+    ("Monday, 1st January 2024", date(2024, 1, 1)),
+    ("22nd Oct 2026", date(2026, 10, 22)),
+    ("3rd June 2025", date(2025, 6, 3)),
+    ("Saturday, 21 Nov 2026", date(2026, 11, 21)),
+    ("2024-03-15", date(2024, 3, 15)),
+    ("  2024-03-15 ", date(2024, 3, 15)),
+    ("31st February 2024", None),
+    ("next Friday", None),
+    ("", None),
+    (None, None),
+])
+def test_parse_date(text, expected):
+    assert parse_date(text) == expected
+
+
+def test_webinar_window():
+    # Wednesday afternoon
+    now = datetime(2026, 10, 14, 15, 30)
+    assert webinar_window("This Week", now) == (now, datetime(2026, 10, 19))
+    assert webinar_window("Next Week", now) == (datetime(2026, 10, 19), datetime(2026, 10, 26))
+    assert webinar_window("This Month", now) == (now, datetime(2026, 11, 1))
+    assert webinar_window("All", now) == (now, None)
+    # Sunday night still belongs to the week that started on Monday
+    sunday = datetime(2026, 10, 18, 23, 0)
+    assert webinar_window("This Week", sunday) == (sunday, datetime(2026, 10, 19))
+    december = datetime(2026, 12, 31, 9, 0)
+    assert webinar_window("This Month", december) == (december, datetime(2027, 1, 1))
+
+
+def test_webinar_times():
+    webinar = Webinar.from_dict({"date": "Saturday, 31st October 2026", "time": "11:30 PM - 12:30 AM"})
+    assert webinar.starts_at == datetime(2026, 10, 31, 23, 30)
+    assert webinar.ends_at == datetime(2026, 11, 1, 0, 30)
+    assert Webinar.from_dict({"date": "Saturday, 31st October 2026", "time": "TBA"}).starts_at is None
+
+
+def test_webinars_between_matches_brute_force():
+    catalog = Catalog()
+    webinars = [webinar for webinar in catalog.section("webinars").values() if webinar.starts_at is not None]
+    assert webinars
+    starts = sorted(webinar.starts_at for webinar in webinars)
+    edges = [None, starts[0], starts[len(starts) // 2], starts[-1], starts[-1] + timedelta(seconds=1)]
+    for start in edges:
+        for end in edges:
+            expected = sorted((webinar for webinar in webinars
+                               if (start is None or webinar.starts_at >= start)
+                               and (end is None or webinar.starts_at < end)),
+                              key=lambda webinar: (webinar.starts_at, webinar["id"]))
+            assert catalog.webinars_between(start, end) == expected
@@ -0,0 +1,144 @@
+import itertools
+import random
+
+import pytest
+
+from user import FacetIndex, batches, facility_tags, parse_fee, parse_timings
+
+SPORTS = ["Cricket", "Football", "Chess"]
+FACILITIES = ["gym", "pool", "hostel"]
+
+
+def random_items(count, seed):
+    rng = random.Random(seed)
+    items = {}
+    for key in range(count):
+        facets = {"sport": [rng.choice(SPORTS)], "facility": rng.sample(FACILITIES, rng.randint(0, 3))}
+        numbers = {"fee": rng.choice([None, rng.randint(1000, 9000)])}
+        items[key] = (facets, numbers)
+    return items
+
+
+def build(items):
+    index = FacetIndex(conjunctive=("facility",))
+    for key, (facets, numbers) in items.items():
+        index.add(key, key, facets, numbers)
+    return index
+
+
+def matches(facets, facet, values, conjunctive):
+    have = set(facets.get(facet, ()))
+    return set(values) <= have if conjunctive else bool(have & set(values))
+
+
+def brute_force(items, selected, base, conjunctive=("facility",)):
+    def keep(key, skip=None):
+        return key in base and all(matches(items[key][0], facet, values, facet in conjunctive)
+                                   for facet, values in selected.items() if values and facet != skip)
+
+    result = [key for key in items if keep(key)]
+    counts = {}
+    for facet, values in (("sport", SPORTS), ("facility", FACILITIES)):
+        skip = None if facet in conjunctive else facet
+        pool = [key for key in items if keep(key, skip)]
+        counts[facet] = {value: sum(value in items[key][0][facet] for key in pool) for value in values}
+    return result, counts
+
+
+SELECTIONS = [{}, {"sport": ["Cricket"]}, {"sport": ["Cricket", "Chess"]}, {"facility": ["gym"]},
+              {"facility": ["gym", "pool"]}, {"sport": ["Football"], "facility": ["hostel"]},
+              {"sport": [], "facility": ["pool", "hostel", "gym"]}]
+
+
+@pytest.mark.parametrize("selected", SELECTIONS)
+def test_query_matches_brute_force(selected):
+    items = random_items(400, seed=1)
+    index = build(items)
+    result, counts = index.query(selected)
+    expected, expected_counts = brute_force(items, selected, set(items))
+    assert result == expected
+    for facet, facet_counts in expected_counts.items():
+        assert {value: counts[facet].get(value, 0) for value in facet_counts} == facet_counts
+
+
+@pytest.mark.parametrize("low, high", [(None, None), (3000, None), (None, 5000), (2500, 7000), (9001, None)])
+def test_range_and_base_masks_match_brute_force(low, high):
+    items = random_items(400, seed=2)
+    index = build(items)
+    rng = random.Random(3)
+    for key in rng.sample(sorted(items), 100):
+        index.remove(key)
+        del items[key]
+    in_range = {key for key, (_, numbers) in items.items() if numbers["fee"] is not None
+                and (low is None or numbers["fee"] >= low) and (high is None or numbers["fee"] <= high)}
+    assert set(index.items(index.range_mask("fee", low, high))) == in_range
+
+    subset = rng.sample(sorted(items), 150) + [10 ** 6]
+    assert index.items(index.mask(subset)) == sorted(key for key in subset if key in items)
+    for selected in SELECTIONS:
+        base = in_range & set(subset)
+        result, counts = index.query(selected, base=index.range_mask("fee", low, high) & index.mask(subset))
+        expected, expected_counts = brute_force(items, selected, base)
+        assert result == expected
+        for facet, facet_counts in expected_counts.items():
+            assert {value: counts[facet].get(value, 0) for value in facet_counts} == facet_counts
+
+
+def test_items_walks_every_bit():
+    index = FacetIndex()
+    for key in range(70):
+        index.add(key, key, {})
+    for keys in itertools.combinations([0, 7, 8, 15, 16, 63, 64, 69], 3):
+        assert index.items(index.mask(keys)) == list(keys)
+    assert index.items(0) == [] and len(index) == 70
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("₹15,000 per quarter", (15000, "quarter")),
+    ("₹5,000/month", (5000, "month")),
+    ("₹4,500 monthly", (4500, "month")),
+    ("Rs. 60,000 per annum", (60000, "year")),
+    ("₹60,000 annually", (60000, "year")),
+    ("₹60,000 a year", (60000, "year")),
+    ("₹30,000 half-yearly", (30000, "half-year")),
+    ("₹2,499.50 per months", (2499.5, "month")),
+    ("Free", (None, None)),
+    ("", (None, None)),
+    (None, (None, None)),
+])
+def test_parse_fee(text, expected):
+    assert parse_fee(text) == expected
+
+
+def test_timings_batches_and_tags():
+    sessions = parse_timings("6:00 AM - 9:00 AM, 4:30 PM - 7 PM")
+    assert sessions == ((360, 540), (990, 1140))
+    assert batches(sessions) == ["morning", "evening"]
+    assert batches(parse_timings("11 AM - 1:00 PM")) == ["morning", "afternoon"]
+    assert parse_timings("By appointment") == ()
+    assert facility_tags(["Indoor nets", "Physiotherapy room", "Swimming Pool"]) == {"indoor", "medical", "pool"}
+
+
+def test_churn_keeps_bitmaps_bounded():
+    items = random_items(200, seed=4)
+    index = build(items)
+    rng = random.Random(5)
+    next_key = len(items)
+    for _ in range(5000):
+        key = rng.choice(sorted(items))
+        index.remove(key)
+        del items[key]
+        items[next_key] = random_items(1, seed=next_key)[0]
+        index.add(next_key, next_key, *items[next_key])
+        next_key += 1
+        assert len(index._items) <= 2 * len(items) + FacetIndex.MIN_COMPACT_GAPS
+    assert index.mask().bit_length() <= len(index._items)
+    assert len(index) == len(items)
+    for selected in SELECTIONS:
+        result, counts = index.query(selected)
+        expected, expected_counts = brute_force(items, selected, set(items))
+        assert result == expected
+        for facet, facet_counts in expected_counts.items():
+            assert {value: counts[facet].get(value, 0) for value in facet_counts} == facet_counts
+    assert set(index.items(index.range_mask("fee", 3000, 6000))) == {
+        key for key, (_, numbers) in items.items() if numbers["fee"] is not None and 3000 <= numbers["fee"] <= 6000}
@@ -0,0 +1,82 @@
+import random
+
+import pytest
+
+from user import FuzzyIndex, levenshtein
+
+SYLLABLES = ["bhai", "chung", "ras", "quin", "ha", "sha", "rma", "vik", "ram", "ath", "ore", "san", "jay"]
+
+
+def reference_levenshtein(a, b):
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b)))
+        previous = current
+    return previous[-1]
+
+
+def random_name(rng):
+    return " ".join("".join(rng.choices(SYLLABLES, k=rng.randint(1, 3))).title() for _ in range(rng.randint(1, 2)))
+
+
+def typo(rng, text):
+    i = rng.randrange(len(text))
+    return rng.choice([text[:i] + text[i + 1:], text[:i] + "x" + text[i:], text[:i] + "e" + text[i + 1:]])
+
+
+def brute_force(names, query, max_distance=None):
+    """Closest distance per document over its whole names and their words"""
+    query = FuzzyIndex.normalize(query)
+    if len(query) < FuzzyIndex.MIN_TERM_LENGTH:
+        return {}
+    distance = FuzzyIndex.default_distance(query) if max_distance is None else max_distance
+    distance = min(distance, (len(query) + 1) // 3)
+    found = {}
+    for doc_key, doc_names in names.items():
+        terms = {term for name in doc_names for normalized in [FuzzyIndex.normalize(name)]
+                 for term in {normalized, *normalized.split()} if len(term) >= FuzzyIndex.MIN_TERM_LENGTH}
+        best = min((reference_levenshtein(query, term) for term in terms), default=distance + 1)
+        if best <= distance:
+            found[doc_key] = best
+    return found
+
+
+def test_levenshtein_matches_reference():
+    rng = random.Random(1)
+    for _ in range(500):
+        a, b = random_name(rng).lower(), random_name(rng).lower()
+        exact = reference_levenshtein(a, b)
+        assert levenshtein(a, b) == exact
+        for limit in range(4):
+            assert levenshtein(a, b, limit) == min(exact, limit + 1)
+
+
+@pytest.mark.parametrize("max_distance", [None, 1, 2])
+def test_search_matches_brute_force(max_distance):
+    rng = random.Random(2)
+    names = {doc_key: (random_name(rng), random_name(rng)) for doc_key in range(150)}
+    index = FuzzyIndex()
+    for doc_key, doc_names in names.items():
+        index.add(doc_key, *doc_names)
+    queries = [typo(rng, rng.choice(rng.choice(list(names.values())))) for _ in range(30)] + ["ab", "zzzzzz"]
+    for query in queries:
+        expected = brute_force(names, query, max_distance)
+        results = index.search(query, limit=len(names), max_distance=max_distance)
+        assert dict((doc_key, found) for found, doc_key in results) == expected
+        assert [found for found, _ in results] == sorted(expected.values())
+        assert len(index.search(query, limit=3, max_distance=max_distance)) == min(3, len(expected))
+
+
+def test_removed_and_reindexed_documents():
+    index = FuzzyIndex()
+    index.add("a", "Bhaichung Bhutia")
+    index.add("b", "Rahul Dravid")
+    assert index.search("Bhaichng") == [(1, "a")]
+    assert index.search("bhutia") == [(0, "a")]
+    index.add("a", "Sunil Chhetri")
+    assert index.search("Bhaichng") == []
+    assert index.search("Chetri") == [(1, "a")]
+    index.remove("a")
+    assert index.search("Chetri") == [] and len(index) == 1
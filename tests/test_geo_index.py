@@ -0,0 +1,76 @@
+import random
+
+import pytest
+
+from user import GeoIndex, distance_km
+
+
+def random_points(count, seed, lat_range=(8.0, 32.0), lon_range=(68.0, 97.0)):
+    rng = random.Random(seed)
+    return {key: (rng.uniform(*lat_range), rng.uniform(*lon_range)) for key in range(count)}
+
+
+def build(points, **kwargs):
+    index = GeoIndex(**kwargs)
+    for key, (lat, lon) in points.items():
+        index.add(key, lat, lon, key)
+    return index
+
+
+def brute_force(points, lat, lon, accept=None):
+    return sorted((distance_km(lat, lon, *point), key) for key, point in points.items()
+                  if accept is None or accept(key))
+
+
+def even(key):
+    return key % 2 == 0
+
+
+QUERIES = [(19.07, 72.88), (28.61, 77.21), (8.0, 68.0), (40.0, 60.0), (-33.9, 151.2)]
+
+
+@pytest.mark.parametrize("accept", [None, even])
+@pytest.mark.parametrize("radius", [5, 50, 400])
+def test_within_matches_brute_force(accept, radius):
+    points = random_points(2000, seed=1)
+    index = build(points)
+    for lat, lon in QUERIES:
+        expected = [(distance, key) for distance, key in brute_force(points, lat, lon, accept) if distance <= radius]
+        assert sorted(index.within(lat, lon, radius, accept)) == pytest.approx(expected)
+
+
+@pytest.mark.parametrize("accept", [None, even])
+@pytest.mark.parametrize("k", [1, 5, 50])
+def test_nearest_matches_brute_force(accept, k):
+    points = random_points(2000, seed=2)
+    index = build(points, cell_degrees=0.5)
+    for lat, lon in QUERIES:
+        expected = brute_force(points, lat, lon, accept)[:k]
+        results = index.nearest(lat, lon, k, accept)
+        assert [distance for distance, _ in results] == pytest.approx([distance for distance, _ in expected])
+
+
+def test_nearest_after_moves_and_removals():
+    points = random_points(500, seed=3)
+    index = build(points)
+    rng = random.Random(4)
+    for key in rng.sample(sorted(points), 200):
+        index.remove(key)
+        del points[key]
+    for key, point in random_points(100, seed=5, lat_range=(-10.0, 50.0), lon_range=(60.0, 120.0)).items():
+        index.add(key, *point, key)
+        points[key] = point
+    assert len(index) == len(points)
+    for lat, lon in QUERIES:
+        expected = brute_force(points, lat, lon)
+        assert index.nearest(lat, lon, 10) == pytest.approx(expected[:10])
+        assert index.nearest(lat, lon, len(points) + 5) == pytest.approx(expected)
+
+
+def test_empty_index():
+    index = GeoIndex()
+    assert index.nearest(19.07, 72.88) == [] and index.within(19.07, 72.88, 100) == []
+    index.add("a", 19.0, 72.8)
+    index.remove("a")
+    index.remove("a")
+    assert index.nearest(19.07, 72.88) == [] and len(index) == 0
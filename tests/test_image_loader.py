@@ -0,0 +1,46 @@
+import os
+
+import pytest
+from PIL import Image
+
+from user import ImageLoader
+
+
+@pytest.fixture
+def loader(tmp_path):
+    image_dir = tmp_path / "images"
+    image_dir.mkdir()
+    Image.new("RGB", (400, 200), "red").save(image_dir / "bat.jpg")
+    (image_dir / "broken.jpg").write_bytes(b"not an image")
+    loader = ImageLoader(None, image_dir=str(image_dir), cache_dir=str(tmp_path / "thumbnails"))
+    yield loader
+    loader.close()
+
+
+def test_thumbnail_is_resized_and_cached_on_disk(loader):
+    image = loader.thumbnail("bat.jpg")
+    assert image.size == (64, 32)
+    cached = os.listdir(loader.cache_dir)
+    assert len(cached) == 1 and cached[0].endswith("-64x64.png")
+
+    # A second read comes from the cached PNG instead of decoding the original
+    path = os.path.join(loader.cache_dir, cached[0])
+    Image.new("RGBA", (10, 10), "blue").save(path)
+    assert loader.thumbnail("bat.jpg").size == (10, 10)
+
+
+def test_changed_source_gets_a_new_thumbnail(loader):
+    loader.thumbnail("bat.jpg")
+    Image.new("RGB", (100, 300), "green").save(os.path.join(loader.image_dir, "bat.jpg"))
+    assert loader.thumbnail("bat.jpg").size == (21, 64)
+    assert len(os.listdir(loader.cache_dir)) == 2
+
+
+def test_missing_and_unreadable_files(loader):
+    assert loader.thumbnail("missing.jpg") is None
+    assert loader.thumbnail("broken.jpg") is None
+    assert loader.exists("bat.jpg") and loader.exists("broken.jpg")
+    assert not loader.exists("missing.jpg") and not loader.exists("") and not loader.exists(None)
+    # Existence is checked once per name
+    os.remove(os.path.join(loader.image_dir, "bat.jpg"))
+    assert loader.exists("bat.jpg")
@@ -0,0 +1,126 @@
+import os
+
+import pytest
+
+from user import JournaledUserStore
+
+
+def open_store(tmp_path, **kwargs):
+    return JournaledUserStore(str(tmp_path / "users.json"), **kwargs)
+
+
+def populate(store):
+    store.create("alice", {"password": "x", "email": "alice@example.com", "full_name": "Alice", "bookings": []})
+    store.create("bob", {"password": "y", "email": "bob@example.com", "bookings": []})
+    store.update("alice", {"email": "alice@new.example.com", "premium": True})
+    store.add_booking("alice", {"type": "Academy", "name": "Mumbai Cricket Club", "date": "2024-03-15"})
+    store.add_booking("alice", {"type": "Course", "name": "Batting Basics", "date": "2024-03-16"})
+
+
+def snapshot(store):
+    return dict(store.iter_users())
+
+
+def test_reopen_replays_journal(tmp_path):
+    store = open_store(tmp_path)
+    assert store.is_empty()
+    populate(store)
+    expected = snapshot(store)
+    store.close()
+
+    store = open_store(tmp_path)
+    assert snapshot(store) == expected
+    assert store.get("alice")["premium"] is True
+    assert [booking["name"] for booking in store.get("alice")["bookings"]] == ["Mumbai Cricket Club",
+                                                                           "Batting Basics"]
+    assert store.find_by_email("alice@new.example.com") == "alice"
+    assert store.find_by_email("alice@example.com") is None
+    assert "bob" in store and "carol" not in store
+    store.close()
+
+
+def test_torn_final_line_is_ignored(tmp_path):
+    store = open_store(tmp_path)
+    populate(store)
+    expected = snapshot(store)
+    store.close()
+    with open(tmp_path / "users.journal", 'a', encoding='utf-8') as f:
+        f.write('{"op": "create", "user": "carol", "da')
+
+    store = open_store(tmp_path)
+    assert snapshot(store) == expected
+    store.close()
+
+
+def test_compaction_folds_journal_into_snapshot(tmp_path):
+    store = open_store(tmp_path, compact_after=3)
+    populate(store)
+    expected = snapshot(store)
+    store.compact()
+    store.close()
+    assert os.path.exists(tmp_path / "users.json")
+    assert not os.path.exists(tmp_path / "users.journal.compacting")
+
+    store = open_store(tmp_path)
+    assert snapshot(store) == expected
+    store.close()
+
+
+def test_interrupted_compaction_is_finished_on_open(tmp_path):
+    store = open_store(tmp_path)
+    populate(store)
+    expected = snapshot(store)
+    store.close()
+    # Journal rotated but the snapshot never written
+    os.replace(tmp_path / "users.journal", tmp_path / "users.journal.compacting")
+
+    store = open_store(tmp_path)
+    assert snapshot(store) == expected
+    assert not os.path.exists(tmp_path / "users.journal.compacting")
+    store.close()
+    store = open_store(tmp_path)
+    assert snapshot(store) == expected
+    store.close()
+
+
+def test_replaying_a_journal_already_in_the_snapshot_is_idempotent(tmp_path):
+    store = open_store(tmp_path)
+    populate(store)
+    expected = snapshot(store)
+    store.close()
+    with open(tmp_path / "users.journal", 'r', encoding='utf-8') as f:
+        journal = f.read()
+
+    store = open_store(tmp_path)
+    store.compact()
+    store.close()
+    # Snapshot written but the rotated journal not yet removed
+    with open(tmp_path / "users.journal.compacting", 'w', encoding='utf-8') as f:
+        f.write(journal)
+
+    store = open_store(tmp_path)
+    assert snapshot(store) == expected
+    assert len(store.get("alice")["bookings"]) == 2
+    store.close()
+
+
+def test_unknown_user_raises_key_error_without_writing(tmp_path):
+    store = open_store(tmp_path)
+    populate(store)
+    expected = snapshot(store)
+    with pytest.raises(KeyError):
+        store.update("nobody", {"premium": True})
+    with pytest.raises(KeyError):
+        store.add_booking("nobody", {"type": "Course", "name": "Batting Basics"})
+    with pytest.raises(KeyError):
+        store.apply([("create", "carol", {"password": "z"}), ("booking", "nobody", {"name": "Orphan"})])
+    # A user created earlier in the same batch can be updated and booked
+    store.apply([("create", "dave", {"password": "w"}), ("update", "dave", {"premium": True}),
+                 ("booking", "dave", {"type": "Course", "name": "Batting Basics"})])
+    assert "carol" not in store and store.get("dave")["premium"] is True
+    expected["dave"] = store.get("dave")
+    store.close()
+
+    store = open_store(tmp_path)
+    assert snapshot(store) == expected
+    store.close()
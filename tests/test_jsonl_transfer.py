@@ -0,0 +1,69 @@
+import io
+import json
+
+import pytest
+
+from user import JournaledUserStore, ThroughputReporter, export_users, import_users
+
+
+def reporter():
+    return ThroughputReporter("test", interval=float("inf"))
+
+
+def lines(*entries):
+    return [entry if isinstance(entry, str) else json.dumps(entry) for entry in entries]
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = JournaledUserStore(str(tmp_path / "users.json"))
+    yield store
+    store.close()
+
+
+def test_export_then_import_round_trips(tmp_path, store):
+    store.create("alice", {"password": "x", "email": "alice@example.com", "full_name": "Ålice", "bookings": []})
+    store.add_booking("alice", {"type": "Academy", "name": "Mumbai Cricket Club", "date": "2024-03-15"})
+    store.add_booking("alice", {"type": "Course", "name": "Batting Basics"})
+    store.create("bob", {"password": "y", "bookings": []})
+    out = io.StringIO()
+    export_users(store, out, reporter())
+
+    target = JournaledUserStore(str(tmp_path / "copy.json"))
+    exported = out.getvalue().splitlines(keepends=True)
+    assert len(exported) == 4
+    counts = import_users(target, [line.encode('utf-8') for line in exported], reporter(), batch_size=1)
+    assert counts == {"users": 2, "bookings": 2, "duplicates": 0, "invalid": 0, "orphaned": 0}
+    assert dict(target.iter_users()) == dict(store.iter_users())
+    target.close()
+
+
+@pytest.mark.parametrize("batch_size", [1, 2, 1000])
+def test_counts_duplicates_orphans_and_invalid_lines(store, batch_size):
+    store.create("alice", {"password": "x", "email": "alice@example.com", "bookings": []})
+    counts = import_users(store, lines(
+        {"kind": "user", "username": "alice", "password": "x"},                       # existing username
+        {"kind": "booking", "username": "alice", "name": "Skipped with duplicate"},
+        {"kind": "user", "username": "alias", "password": "x", "email": "alice@example.com"},  # existing email
+        {"kind": "user", "username": "bob", "password": "y", "email": "bob@example.com"},
+        {"kind": "booking", "username": "bob", "name": "Bob 1"},
+        {"kind": "booking", "username": "bob", "name": "Bob 2"},
+        {"kind": "user", "username": "bob", "password": "y"},                           # repeated in the file
+        {"kind": "user", "username": "bobby", "password": "y", "email": "bob@example.com"},  # email in the file
+        {"kind": "booking", "username": "alice", "name": "Alice 1"},                    # existing account
+        {"kind": "booking", "username": "nobody", "name": "Orphan"},
+        {"kind": "user", "username": "carol", "email": "carol@example.com"},            # no password
+        {"kind": "booking", "username": "carol", "name": "Skipped with invalid user"},
+        {"kind": "user", "username": "dave", "password": ""},                           # empty password
+        {"kind": "refund", "username": "bob"},
+        {"kind": "user", "password": "z"},                                              # no username
+        "not json",
+        "",
+        {"kind": "user", "username": "erin", "password": "z"},
+    ), reporter(), batch_size=batch_size)
+
+    assert counts == {"users": 2, "bookings": 3, "duplicates": 4, "invalid": 5, "orphaned": 1}
+    assert sorted(username for username, _ in store.iter_users()) == ["alice", "bob", "erin"]
+    assert [booking["name"] for booking in store.get("bob")["bookings"]] == ["Bob 1", "Bob 2"]
+    assert [booking["name"] for booking in store.get("alice")["bookings"]] == ["Alice 1"]
+    assert store.find_by_email("bob@example.com") == "bob"
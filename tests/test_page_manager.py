@@ -0,0 +1,102 @@
+import pytest
+
+import user
+from user import PageManager
+
+
+class FakeFrame:
+    """Stands in for ttk.Frame: tracks packing, children and whether it was destroyed"""
+
+    def __init__(self, parent=None):
+        self.children = []
+        self.packed = False
+        self.destroyed = False
+        if isinstance(parent, FakeFrame):
+            parent.children.append(self)
+
+    def pack(self, **kwargs):
+        self.packed = True
+
+    def pack_forget(self):
+        self.packed = False
+
+    def destroy(self):
+        self.destroyed = True
+
+    def winfo_children(self):
+        return self.children
+
+
+@pytest.fixture(autouse=True)
+def fake_frames(monkeypatch):
+    monkeypatch.setattr(user.ttk, "Frame", FakeFrame)
+
+
+class Page:
+    """A page builder with ``widgets`` child widgets that counts builds and refreshes"""
+
+    def __init__(self, widgets=1):
+        self.widgets = widgets
+        self.built = []
+        self.refreshes = 0
+
+    def build(self, frame):
+        self.built.append(frame)
+        for _ in range(self.widgets):
+            FakeFrame(frame)
+
+    def refresh(self):
+        self.refreshes += 1
+
+
+def test_pages_are_built_once_and_reused():
+    pages = PageManager(FakeFrame())
+    home, courses = Page(), Page()
+    frame = pages.show("home", home.build, home.refresh)
+    assert home.built == [frame] and frame.packed
+
+    other = pages.show("courses", courses.build, courses.refresh)
+    assert not frame.packed and other.packed
+    for _ in range(3):
+        assert pages.show("home", home.build, home.refresh) is frame
+        assert frame.packed and not other.packed
+        assert pages.show("courses", courses.build, courses.refresh) is other
+    assert home.built == [frame] and courses.built == [other]
+    assert home.refreshes == courses.refreshes == 0
+    assert pages.stats() == {"pages": 2, "builds": 2, "hits": 6, "widgets": 4}
+
+
+def test_stale_pages_refresh_when_shown():
+    pages = PageManager(FakeFrame())
+    home, profile = Page(), Page()
+    pages.show("home", home.build, home.refresh)
+    pages.show("profile", profile.build, profile.refresh)
+
+    # The page on screen refreshes straight away, hidden ones on their next show
+    pages.invalidate()
+    assert profile.refreshes == 1 and home.refreshes == 0
+    pages.show("home", home.build, home.refresh)
+    assert home.refreshes == 1
+    pages.show("profile", profile.build, profile.refresh)
+    pages.show("home", home.build, home.refresh)
+    assert home.refreshes == 1 and profile.refreshes == 1 and len(home.built) == 1
+
+
+def test_dropped_and_evicted_pages_are_rebuilt():
+    pages = PageManager(FakeFrame(), max_widgets=10)
+    home, courses, shop = Page(3), Page(5), Page(5)
+    first = pages.show("home", home.build)
+    pages.drop("home")
+    assert first.destroyed and pages.current is None
+    assert pages.show("home", home.build) is not first and len(home.built) == 2
+
+    pages.show("courses", courses.build)
+    pages.show("shop", shop.build)
+    assert pages.stats()["pages"] == 3 and pages.stats()["widgets"] == 10
+    # Hiding shop brings the cache to 16 widgets: idle pages go, least recently shown first
+    pages.show("courses", courses.build)
+    assert home.built[-1].destroyed and shop.built[-1].destroyed and not courses.built[-1].destroyed
+    assert pages.stats()["pages"] == 1
+    pages.show("home", home.build)
+    pages.show("courses", courses.build)
+    assert len(home.built) == 3 and len(courses.built) == 1
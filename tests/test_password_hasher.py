@@ -0,0 +1,65 @@
+import hashlib
+
+import pytest
+
+from user import PasswordHasher
+
+
+PBKDF2 = {"algorithm": "pbkdf2_sha256", "iterations": 1000}
+SCRYPT = {"algorithm": "scrypt", "n": 16, "r": 8, "p": 1}
+
+
+@pytest.fixture
+def hasher():
+    hasher = PasswordHasher(dict(PBKDF2))
+    yield hasher
+    hasher.close()
+
+
+@pytest.mark.parametrize("settings", [PBKDF2, SCRYPT])
+def test_verify(settings):
+    hasher = PasswordHasher(dict(settings))
+    stored = hasher.hash("s3cret")
+    assert stored.startswith(settings["algorithm"] + "$")
+    assert hasher.verify("s3cret", stored)
+    assert not hasher.verify("s3cret!", stored)
+    # Salted: the same password hashes differently each time
+    assert hasher.hash("s3cret") != stored
+    assert not hasher.needs_rehash(stored)
+    hasher.close()
+
+
+def test_needs_rehash_when_cost_changes(hasher):
+    stored = hasher.hash("s3cret")
+    stronger = PasswordHasher({"algorithm": "pbkdf2_sha256", "iterations": 2000})
+    assert stronger.needs_rehash(stored)
+    # Old hashes keep verifying under the new settings
+    assert stronger.verify("s3cret", stored)
+    assert PasswordHasher(dict(SCRYPT)).needs_rehash(stored)
+    stronger.close()
+
+
+def test_legacy_sha256_hashes(hasher):
+    stored = hashlib.sha256(b"s3cret").hexdigest()
+    assert hasher.is_legacy(stored)
+    assert hasher.verify("s3cret", stored)
+    assert not hasher.verify("wrong", stored)
+    assert hasher.needs_rehash(stored)
+
+
+def test_async(hasher):
+    stored = hasher.hash_async("s3cret").result(timeout=10)
+    assert hasher.verify_async("s3cret", stored).result(timeout=10)
+    assert not hasher.verify_async("wrong", stored).result(timeout=10)
+
+
+def test_settings_round_trip(tmp_path):
+    path = str(tmp_path / "kdf.json")
+    assert PasswordHasher.load_settings(path) == PasswordHasher.DEFAULT_SETTINGS
+    PasswordHasher.save_settings(SCRYPT, path)
+    assert PasswordHasher.load_settings(path) == SCRYPT
+
+
+def test_unknown_algorithm():
+    with pytest.raises(ValueError):
+        PasswordHasher({"algorithm": "md5"}).hash("s3cret")
@@ -0,0 +1,66 @@
+import random
+
+import pytest
+
+from user import PrefixIndex
+
+WORDS = ["Mumbai", "Cricket", "Club", "Delhi", "Football", "Academy", "Chess", "Champions", "Chennai", "Cricketers",
+         "United", "Bengal", "Bengaluru"]
+
+
+def random_entries(count, seed):
+    rng = random.Random(seed)
+    return {value: (" ".join(rng.choices(WORDS, k=rng.randint(1, 3))), rng.randint(0, 5))
+            for value in range(count)}
+
+
+def brute_force(entries, prefix, k):
+    prefix = prefix.strip().lower()
+    matches = []
+    for value, (text, score) in entries.items():
+        normalized = text.lower()
+        if any(normalized[start:].startswith(prefix) for start in PrefixIndex._word_starts(normalized)):
+            matches.append((-score, normalized, value))
+    return [value for _, _, value in sorted(matches)[:k]]
+
+
+PREFIXES = ["c", "cr", "cricket c", "CHE", " ben", "club", "united m", "x", "a"]
+
+
+@pytest.mark.parametrize("k", [1, 3, 10])
+def test_matches_brute_force(k):
+    entries = random_entries(200, seed=1)
+    index = PrefixIndex(k=k)
+    for value, (text, score) in entries.items():
+        index.add(text, score, value)
+    for prefix in PREFIXES:
+        assert index.complete(prefix) == brute_force(entries, prefix, k)
+        assert index.complete(prefix, 1) == brute_force(entries, prefix, 1)
+
+
+def test_matches_brute_force_after_removals_and_readds():
+    entries = random_entries(200, seed=2)
+    index = PrefixIndex(k=5)
+    for value, (text, score) in entries.items():
+        index.add(text, score, value)
+    rng = random.Random(3)
+    for value in rng.sample(sorted(entries), 120):
+        index.remove(value)
+        del entries[value]
+    for value, (text, score) in random_entries(60, seed=4).items():
+        # Re-adding an existing value replaces its entry
+        index.add(text, score, value)
+        entries[value] = (text, score)
+    assert len(index) == len(entries)
+    for prefix in PREFIXES:
+        assert index.complete(prefix) == brute_force(entries, prefix, 5)
+
+
+def test_values_default_to_text():
+    index = PrefixIndex()
+    index.add("Delhi", 2)
+    index.add("Dehradun", 1)
+    assert index.complete("de") == ["Delhi", "Dehradun"]
+    assert index.complete("") == ["Delhi", "Dehradun"]
+    index.remove("Delhi")
+    assert index.complete("del") == [] and index.complete("d") == ["Dehradun"]
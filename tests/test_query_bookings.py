@@ -0,0 +1,75 @@
+import pytest
+
+from user import BookingsTable, parse_date, query_bookings
+
+BOOKINGS = [
+    {"type": "Academy", "name": "Mumbai Cricket Club", "date": "2024-03-15", "status": "Confirmed"},
+    {"type": "Course", "name": "Batting Basics", "date": "21st Oct 2026", "status": "Enrolled"},
+    {"type": "Webinar", "name": "Mental Strength", "date": "Friday, 17th March 2023", "status": "Registered"},
+    {"type": "Academy", "name": "Delhi Football Academy", "date": "2025-01-02", "status": "Cancelled"},
+    {"type": "Course", "name": "Chess Openings", "date": "soon", "status": "Enrolled"},
+    {"type": "Course", "name": "cricket fitness", "status": None},
+]
+
+
+@pytest.mark.parametrize("kind", [None, "Academy", "Course", "Equipment"])
+@pytest.mark.parametrize("text", ["", "cricket", " ENROLLED ", "academy"])
+@pytest.mark.parametrize("sort, descending", [("date", False), ("date", True), ("name", False), ("status", True)])
+def test_matches_brute_force(kind, text, sort, descending):
+    needle = text.strip().lower()
+    rows = [booking for booking in BOOKINGS if kind in (None, booking["type"])
+            and any(needle in str(booking.get(field) or "").lower() for field in ("type", "name", "status"))]
+    if sort == "date":
+        key = lambda booking: parse_date(booking.get("date")) or parse_date("0001-01-01")
+    else:
+        key = lambda booking: str(booking.get(sort) or "").lower()
+    assert query_bookings(BOOKINGS, sort, descending, kind, text) == sorted(rows, key=key, reverse=descending)
+
+
+def test_unparseable_dates_sort_first():
+    names = [booking["name"] for booking in query_bookings(BOOKINGS, "date")]
+    assert names == ["Chess Openings", "cricket fitness", "Mental Strength", "Mumbai Cricket Club",
+                     "Delhi Football Academy", "Batting Basics"]
+
+
+def drain(table):
+    pages = []
+    while not table.exhausted:
+        pages.append([booking["name"] for booking in table.next_page()])
+    return pages
+
+
+def test_table_pages_through_filtered_rows():
+    table = BookingsTable(BOOKINGS, page_size=2)
+    assert table.exhausted and table.next_page() == []
+    table.filter(kind="Course")
+    expected = [booking["name"] for booking in query_bookings(BOOKINGS, "date", True, kind="Course")]
+    pages = drain(table)
+    assert [name for page in pages for name in page] == expected
+    assert [len(page) for page in pages] == [2, 1]
+    assert table.next_page() == []
+    table.filter(text="cricket")
+    assert drain(table)[0][0] == "Mumbai Cricket Club"
+
+
+def test_table_sort_transitions():
+    table = BookingsTable(BOOKINGS)
+    assert (table.column, table.descending) == ("date", True)
+    assert table.heading("date", "Date") == "Date ▼" and table.heading("name", "Name") == "Name"
+    states = []
+    for column in ("date", "name", "name", "status", "date", "date"):
+        table.sort_by(column)
+        states.append((table.column, table.descending))
+    assert states == [("date", False), ("name", False), ("name", True), ("status", False),
+                      ("date", True), ("date", False)]
+    assert table.heading("date", "Date") == "Date ▲"
+
+
+def test_table_sort_keeps_filter_and_restarts_paging():
+    table = BookingsTable(BOOKINGS, page_size=1)
+    table.filter(kind="Academy", text="club")
+    table.next_page()
+    assert table.exhausted
+    table.sort_by("name")
+    assert not table.exhausted
+    assert drain(table) == [["Mumbai Cricket Club"]]
@@ -0,0 +1,67 @@
+from user import Catalog, QueryCache, write_synthetic_catalog
+
+
+def test_lru_eviction_and_stats():
+    cache = QueryCache(max_entries=2)
+    calls = []
+
+    def compute(key):
+        return lambda: calls.append(key) or key.upper()
+
+    assert cache.get("a", compute("a")) == "A"
+    assert cache.get("b", compute("b")) == "B"
+    assert cache.get("a", compute("a")) == "A"
+    # "b" is now least recently used
+    assert cache.get("c", compute("c")) == "C"
+    assert cache.get("a", compute("a")) == "A"
+    assert cache.get("b", compute("b")) == "B"
+    assert calls == ["a", "b", "c", "b"]
+    stats = cache.stats()
+    assert (stats["entries"], stats["hits"], stats["misses"], stats["evictions"]) == (2, 2, 4, 2)
+    assert stats["hit_rate"] == 2 / 6
+
+
+def test_invalidate_drops_only_tagged_entries():
+    cache = QueryCache()
+    cache.get("cricket page", lambda: 1, tags=[("course", "Cricket"), ("course", None)])
+    cache.get("chess page", lambda: 2, tags=[("course", "Chess"), ("course", None)])
+    cache.get("all courses", lambda: 3, tags=[("course", None)])
+    cache.get("bats", lambda: 4, tags=[("equipment", "Cricket")])
+
+    cache.invalidate(("course", "Cricket"))
+    assert cache.get("cricket page", lambda: 10) == 10
+    assert cache.get("chess page", lambda: 20) == 2
+    cache.invalidate(("course", None))
+    assert cache.get("chess page", lambda: 20) == 20
+    assert cache.get("all courses", lambda: 30) == 30
+    assert cache.get("bats", lambda: 40) == 4
+    cache.invalidate(("webinar", None))
+    assert len(cache) == 4
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_catalog_updates_invalidate_cached_pages(tmp_path):
+    write_synthetic_catalog(str(tmp_path), 100)
+    catalog = Catalog(str(tmp_path))
+    cache = QueryCache()
+    catalog.listeners.append(lambda kind, groups: cache.invalidate(*[(kind, group) for group in groups | {None}]))
+    items = catalog.section("equipment")
+
+    def page(category):
+        return cache.get(("equipment", category), lambda: catalog.sorted_index("equipment", "Price").page(category)[0],
+                         tags=[("equipment", category)])
+
+    def fresh(category):
+        return sorted((item for item in items.values() if category in (None, item["category"])),
+                      key=lambda item: (item["price"] * (100 - item["discount"]) / 100, item["id"]))[:20]
+
+    categories = ["Cricket", "Chess", None]
+    for category in categories:
+        assert page(category) == fresh(category)
+    cheapest_cricket = fresh("Cricket")[0]
+    catalog.update_record("equipment", fresh("Chess")[-1], {"price": 1})
+    catalog.update_record("equipment", cheapest_cricket, {"category": "Hockey", "price": 1})
+    for category in categories + ["Hockey"]:
+        assert page(category) == fresh(category)
+    assert cache.invalidations > 0
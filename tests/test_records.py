@@ -0,0 +1,72 @@
+import sys
+
+import pytest
+
+from user import Academy, BookingRecord, Course, EquipmentItem, UserRecord, Webinar
+
+
+USER = {"password": "x", "email": "alice@example.com", "full_name": "Alice", "type": "Student", "premium": False,
+        "joined": "2024-03-15", "bookings": [{"type": "Academy", "academy_id": 7, "name": "Mumbai Cricket Club",
+                                              "sport": "Cricket", "status": "Confirmed", "note": "Bring kit"}],
+        "referrer": "bob"}
+ACADEMY = {"id": 7, "name": "Mumbai Cricket Club", "rating": 4.5, "coach": "Coach", "established": 1999,
+           "facilities": ["Gym", "Swimming Pool"], "address": "1 Marine Drive", "city": "Mumbai",
+           "contact": "022-1234", "fees": "₹15,000 per quarter", "timings": "6:00 AM - 9:00 AM",
+           "lat": 18.94, "lon": 72.82}
+WEBINAR = {"id": 3, "title": "Mental Strength", "price": 399, "date": "Friday, 17th March 2023",
+           "time": "7:00 PM - 8:30 PM", "duration": "90 minutes", "instructor": "Coach", "description": "",
+           "image": "webinar3.jpg", "seats": 100, "registered": 0}
+
+
+@pytest.mark.parametrize("cls, data", [
+    (UserRecord, USER),
+    (BookingRecord, USER["bookings"][0]),
+    (Academy, ACADEMY),
+    (Webinar, WEBINAR),
+    (Course, {"id": 1, "title": "Batting Basics", "price": 999, "sport": "Cricket", "modules": ["Grip", "Stance"]}),
+    (EquipmentItem, {"id": 2, "name": "Bat", "price": 2500, "category": "Cricket", "discount": 10}),
+])
+def test_round_trip(cls, data):
+    record = cls.from_dict(data)
+    assert record.to_dict() == data
+    assert cls.from_dict(record.to_dict()).to_dict() == data
+    for key, value in data.items():
+        if key != "bookings":
+            assert record[key] == value and record.get(key) == value and key in record
+    assert record.get("missing", "default") == "default" and "missing" not in record
+    with pytest.raises(KeyError):
+        record["missing"]
+
+
+def test_bookings_become_records():
+    user = UserRecord.from_dict(USER)
+    assert isinstance(user["bookings"][0], BookingRecord)
+    assert user["bookings"][0]["note"] == "Bring kit"
+
+
+def test_interned_values_are_shared():
+    first = BookingRecord.from_dict({"status": "".join(["Con", "firmed"])})
+    second = BookingRecord.from_dict({"status": "".join(["Confir", "med"])})
+    assert first["status"] is second["status"] is sys.intern("Confirmed")
+
+
+def test_copy_is_independent():
+    user = UserRecord.from_dict(USER)
+    clone = user.copy()
+    clone["email"] = "other@example.com"
+    clone["referrer"] = "carol"
+    assert user["email"] == "alice@example.com" and user["referrer"] == "bob"
+    assert clone.to_dict() == {**USER, "email": "other@example.com", "referrer": "carol"}
+
+
+def test_derived_fields():
+    academy = Academy.from_dict(ACADEMY)
+    assert (academy.fee_amount, academy.fee_period, academy.monthly_fee) == (15000, "quarter", 5000)
+    assert academy.sessions == ((360, 540),)
+    assert academy.facility_tags == {"gym", "pool"}
+
+    webinar = Webinar.from_dict(WEBINAR)
+    assert webinar.starts_at.isoformat() == "2023-03-17T19:00:00"
+    assert webinar.ends_at.isoformat() == "2023-03-17T20:30:00"
+    webinar["date"] = "sometime soon"
+    assert webinar.starts_at is None and webinar.ends_at is None
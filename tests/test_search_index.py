@@ -0,0 +1,81 @@
+import math
+import random
+
+import pytest
+
+from user import SearchIndex
+
+WORDS = ["cricket", "football", "coaching", "academy", "pools", "pool", "hostel", "batting", "bowling", "fitness",
+         "mumbai", "delhi", "chess", "strategy", "junior", "elite", "camp", "indoor", "turf", "stadium"]
+
+
+def random_docs(count, seed):
+    rng = random.Random(seed)
+    return {doc_id: " ".join(rng.choices(WORDS, k=rng.randint(1, 30))) for doc_id in range(count)}
+
+
+def brute_force(docs, query, k1=1.2, b=0.75):
+    """BM25 scored straight from the definition, for every document"""
+    tokenized = {doc_id: SearchIndex.tokenize(text) for doc_id, text in docs.items()}
+    average = sum(map(len, tokenized.values())) / len(tokenized)
+    scores = {}
+    for term in set(SearchIndex.tokenize(query)):
+        df = sum(term in tokens for tokens in tokenized.values())
+        if not df:
+            continue
+        idf = math.log(1 + (len(docs) - df + 0.5) / (df + 0.5))
+        for doc_id, tokens in tokenized.items():
+            tf = tokens.count(term)
+            if tf:
+                scores[doc_id] = scores.get(doc_id, 0.0) + \
+                    idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * len(tokens) / average))
+    return scores
+
+
+def check(index, docs, query, limit):
+    expected = brute_force(docs, query)
+    results = index.search(query, limit)
+    assert len(results) == min(limit, len(expected))
+    for score, doc_id in results:
+        assert score == pytest.approx(expected[doc_id])
+    assert [score for score, _ in results] == pytest.approx(sorted(expected.values(), reverse=True)[:limit])
+
+
+QUERIES = ["cricket", "cricket coaching", "elite pools camp", "the junior academy in delhi", "batting bowling turf"]
+
+
+@pytest.mark.parametrize("query", QUERIES)
+@pytest.mark.parametrize("limit", [1, 5, 50])
+def test_matches_brute_force(query, limit):
+    docs = random_docs(300, seed=1)
+    index = SearchIndex()
+    for doc_id, text in docs.items():
+        index.add(doc_id, text)
+    check(index, docs, query, limit)
+
+
+def test_matches_brute_force_after_updates():
+    docs = random_docs(300, seed=2)
+    index = SearchIndex(stats_tolerance=0)
+    for doc_id, text in docs.items():
+        index.add(doc_id, text)
+    index.search("cricket")
+    extra = random_docs(400, seed=3)
+    for doc_id in range(100):
+        index.remove(doc_id)
+        del docs[doc_id]
+    for doc_id in range(200, 400):
+        index.add(doc_id, extra[doc_id])
+        docs[doc_id] = extra[doc_id]
+    assert len(index) == len(docs)
+    for query in QUERIES:
+        check(index, docs, query, 10)
+
+
+def test_tokenize_and_misses():
+    assert SearchIndex.tokenize("The Pools of Mumbai, and GYMS!") == ["pool", "mumbai", "gym"]
+    assert SearchIndex.tokenize("Chess class") == ["chess", "class"]
+    index = SearchIndex()
+    assert index.search("cricket") == []
+    index.add("a", "Cricket academy")
+    assert index.search("hockey") == [] and index.search("the and of") == []
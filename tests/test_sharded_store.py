@@ -0,0 +1,99 @@
+import os
+
+import pytest
+
+from user import JournaledUserStore, ShardedUserStore
+
+
+@pytest.fixture(autouse=True)
+def workdir(tmp_path, monkeypatch):
+    # Legacy files are found beside the store, not in the working directory
+    (tmp_path / "elsewhere").mkdir()
+    monkeypatch.chdir(tmp_path / "elsewhere")
+
+
+def open_store(tmp_path, **kwargs):
+    kwargs.setdefault("shards", 4)
+    return ShardedUserStore(str(tmp_path / "users.d"), **kwargs)
+
+
+def test_reopen_keeps_accounts_across_shards(tmp_path):
+    store = open_store(tmp_path, cache_size=1)
+    assert store.is_empty()
+    users = {f"user{i}": {"password": "x", "email": f"user{i}@example.com", "bookings": []} for i in range(50)}
+    store.apply(("create", username, record) for username, record in users.items())
+    store.update("user3", {"email": "three@example.com"})
+    store.add_booking("user3", {"type": "Course", "name": "Batting Basics"})
+    store.close()
+
+    store = open_store(tmp_path, cache_size=1)
+    assert not store.is_empty()
+    assert store._index["count"] == 50
+    users["user3"] = {**users["user3"], "email": "three@example.com",
+                      "bookings": [{"type": "Course", "name": "Batting Basics"}]}
+    assert dict(store.iter_users()) == users
+    assert store.find_by_email("three@example.com") == "user3"
+    assert store.find_by_email("user3@example.com") is None
+    assert store.find_by_email("user7@example.com") == "user7"
+    assert "user49" in store and "user50" not in store
+    store.close()
+
+
+def test_failed_batch_leaves_store_unchanged(tmp_path):
+    store = open_store(tmp_path)
+    store.create("alice", {"password": "x", "bookings": []})
+    with pytest.raises(KeyError):
+        store.apply([("create", "bob", {"password": "y"}), ("update", "nobody", {"premium": True})])
+    with pytest.raises(KeyError):
+        store.add_booking("nobody", {"type": "Course", "name": "Batting Basics"})
+    assert "bob" not in store
+    store.close()
+
+    store = open_store(tmp_path)
+    assert [username for username, _ in store.iter_users()] == ["alice"]
+    assert store._index["count"] == 1
+    store.close()
+
+
+def test_migrates_legacy_users_file(tmp_path):
+    legacy = JournaledUserStore(str(tmp_path / "users.json"))
+    legacy.create("alice", {"password": "x", "email": "alice@example.com", "bookings": []})
+    legacy.add_booking("alice", {"type": "Academy", "name": "Mumbai Cricket Club"})
+    expected = dict(legacy.iter_users())
+    legacy.close()
+
+    store = open_store(tmp_path)
+    assert dict(store.iter_users()) == expected
+    assert store.find_by_email("alice@example.com") == "alice"
+    store.close()
+
+
+def test_failed_shard_write_commits_nothing(tmp_path, monkeypatch):
+    store = open_store(tmp_path)
+    store.create("alice", {"password": "x", "email": "alice@example.com", "bookings": []})
+    expected = dict(store.iter_users())
+    stage = ShardedUserStore._stage_json
+    calls = []
+
+    def failing_stage(path, data):
+        calls.append(path)
+        if len(calls) == 3:
+            raise OSError("disk full")
+        return stage(path, data)
+
+    monkeypatch.setattr(ShardedUserStore, "_stage_json", staticmethod(failing_stage))
+    users = [("create", f"user{i}", {"password": "y", "email": f"user{i}@example.com"}) for i in range(20)]
+    with pytest.raises(OSError):
+        store.apply(users + [("update", "alice", {"email": "new@example.com"})])
+    monkeypatch.undo()
+    assert len(calls) == 3
+
+    assert dict(store.iter_users()) == expected
+    assert store.find_by_email("alice@example.com") == "alice" and store.find_by_email("user1@example.com") is None
+    assert not [name for name in os.listdir(tmp_path / "users.d") if name.endswith(".tmp")]
+    store.close()
+    store = open_store(tmp_path)
+    assert dict(store.iter_users()) == expected and store._index["count"] == 1
+    store.apply(users)
+    assert store._index["count"] == 21
+    store.close()
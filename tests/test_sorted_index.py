@@ -0,0 +1,84 @@
+import random
+
+import pytest
+
+from user import Course, SortedIndex, offset_pages, sorted_pages
+
+SPORTS = ["Cricket", "Football", "Chess"]
+
+
+def random_courses(count, seed, start=0):
+    rng = random.Random(seed)
+    return [Course(id=course_id, sport=rng.choice(SPORTS), price=rng.randint(1, 50) * 100,
+                   rating=rng.choice([4.0, 4.5, 5.0]))
+            for course_id in range(start, start + count)]
+
+
+def sort_key(course):
+    return course["price"]
+
+
+def build(courses):
+    index = SortedIndex(sort_key, lambda course: (course["sport"], None))
+    for course in courses:
+        index.add(course)
+    return index
+
+
+def expected(courses, group):
+    return sorted((course for course in courses if group in (None, course["sport"])),
+                  key=lambda course: (sort_key(course), course["id"]))
+
+
+def read_all(fetch, limit):
+    records, cursor = fetch(None)
+    pages = [records]
+    while cursor is not None:
+        records, cursor = fetch(cursor)
+        assert len(pages[-1]) == limit
+        pages.append(records)
+    return [record for page in pages for record in page]
+
+
+@pytest.mark.parametrize("limit", [1, 7, 20, 1000])
+def test_pages_match_sorted(limit):
+    courses = random_courses(300, seed=1)
+    index = build(courses)
+    for group in SPORTS + [None, "Hockey"]:
+        assert index.count(group) == len(expected(courses, group))
+        assert read_all(lambda after: index.page(group, after, limit), limit) == expected(courses, group)
+        assert read_all(sorted_pages(expected(courses, group)[::-1], sort_key, limit), limit) \
+            == expected(courses, group)
+        assert read_all(offset_pages(expected(courses, group), limit), limit) == expected(courses, group)
+
+
+def test_range_matches_brute_force():
+    courses = random_courses(300, seed=2)
+    index = build(courses)
+    for low, high in [(None, None), (1000, None), (None, 2000), (1500, 3500), (3500, 1500)]:
+        for group in SPORTS + [None]:
+            assert index.range(group, low, high) == [
+                course for course in expected(courses, group)
+                if (low is None or course["price"] >= low) and (high is None or course["price"] < high)]
+
+
+def test_cursor_survives_changes_between_pages():
+    courses = random_courses(200, seed=3)
+    index = build(courses)
+    first, cursor = index.page(None, limit=50)
+    rng = random.Random(4)
+    # Reprice, remove and add records, including some sorting before the cursor
+    for course in rng.sample(courses, 40):
+        course["price"] = rng.randint(1, 50) * 100
+        index.add(course)
+    for course in rng.sample(courses, 30):
+        index.remove(course)
+        courses.remove(course)
+    for course in random_courses(40, seed=5, start=1000):
+        index.add(course)
+        courses.append(course)
+
+    rest = read_all(lambda after: index.page(None, after or cursor, 50), 50)
+    assert rest == [course for course in expected(courses, None)
+                    if (sort_key(course), course["id"]) > cursor]
+    assert index.count(None) == len(courses)
@@ -0,0 +1,107 @@
+import sqlite3
+
+import pytest
+
+from user import JournaledUserStore, SQLiteUserStore
+
+
+def open_store(tmp_path):
+    return SQLiteUserStore(str(tmp_path / "users.db"), legacy_path=None)
+
+
+def populate(store):
+    store.create("alice", {"password": "x", "email": "alice@example.com", "full_name": "Alice", "premium": False,
+                           "premium_until": None, "bookings": []})
+    store.create("bob", {"password": "y", "email": "bob@example.com", "phone": "98765", "bookings": []})
+    store.update("alice", {"email": "alice@new.example.com", "premium": True, "premium_until": "2025-01-01"})
+    store.add_booking("alice", {"type": "Academy", "academy_id": 7, "name": "Mumbai Cricket Club",
+                                "date": "2024-03-15", "status": "Confirmed"})
+    store.add_booking("alice", {"type": "Course", "name": "Batting Basics", "price": 999})
+
+
+def test_reopen_keeps_accounts_and_bookings(tmp_path):
+    store = open_store(tmp_path)
+    assert store.is_empty()
+    populate(store)
+    store.close()
+
+    store = open_store(tmp_path)
+    alice = store.get("alice")
+    assert alice["premium"] is True
+    assert alice["premium_until"] == "2025-01-01"
+    assert [(booking["name"], booking.get("academy_id"), booking.get("price")) for booking in alice["bookings"]] \
+        == [("Mumbai Cricket Club", 7, None), ("Batting Basics", None, 999)]
+    assert store.get("bob")["phone"] == "98765"
+    assert store.get("carol") is None
+    assert "bob" in store and "carol" not in store
+    assert store.find_by_email("alice@new.example.com") == "alice"
+    assert store.find_by_email("alice@example.com") is None
+    assert sorted(username for username, _ in store.iter_users(page_size=1)) == ["alice", "bob"]
+    store.close()
+
+
+def test_matches_journaled_store(tmp_path):
+    sqlite_store = open_store(tmp_path)
+    journaled = JournaledUserStore(str(tmp_path / "users.json"))
+    populate(sqlite_store)
+    populate(journaled)
+    assert dict(sqlite_store.iter_users()) == dict(journaled.iter_users())
+    sqlite_store.close()
+    journaled.close()
+
+
+def test_migrates_legacy_users_file(tmp_path):
+    legacy = JournaledUserStore(str(tmp_path / "users.json"))
+    populate(legacy)
+    expected = dict(legacy.iter_users())
+    legacy.close()
+
+    store = SQLiteUserStore(str(tmp_path / "users.db"), legacy_path=str(tmp_path / "users.json"))
+    assert dict(store.iter_users()) == expected
+    store.close()
+
+
+def test_unknown_user_raises_key_error(tmp_path):
+    store = open_store(tmp_path)
+    with pytest.raises(KeyError):
+        store.update("nobody", {"premium": True})
+    with pytest.raises(KeyError):
+        store.add_booking("nobody", {"type": "Course", "name": "Batting Basics"})
+    assert store.is_empty()
+    store.close()
+
+
+def test_absent_premium_round_trips(tmp_path):
+    store = open_store(tmp_path)
+    store.create("bob", {"password": "y", "bookings": []})
+    store.create("carol", {"password": "z", "premium": False, "bookings": []})
+    store.close()
+
+    store = open_store(tmp_path)
+    assert store.get("bob") == {"password": "y", "bookings": []}
+    assert store.get("carol") == {"password": "z", "premium": False, "bookings": []}
+    store.update("bob", {"premium": True})
+    assert store.get("bob")["premium"] is True
+    store.close()
+
+
+def test_upgrades_table_with_non_null_premium(tmp_path):
+    path = str(tmp_path / "users.db")
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        CREATE TABLE users (username TEXT PRIMARY KEY, email TEXT, password TEXT, full_name TEXT, phone TEXT,
+                            type TEXT, premium INTEGER NOT NULL DEFAULT 0, joined TEXT, last_login TEXT,
+                            extra TEXT NOT NULL DEFAULT '{}');
+        CREATE INDEX users_email ON users (email);
+        INSERT INTO users (username, email, password, premium) VALUES ('alice', 'alice@example.com', 'x', 1);
+    """)
+    conn.close()
+
+    store = open_store(tmp_path)
+    store.add_booking("alice", {"type": "Course", "name": "Batting Basics"})
+    store.create("bob", {"password": "y", "bookings": []})
+    assert store.get("alice") == {"email": "alice@example.com", "password": "x", "premium": True,
+                                  "bookings": [{"type": "Course", "name": "Batting Basics"}]}
+    assert store.get("bob") == {"password": "y", "bookings": []}
+    assert store.find_by_email("alice@example.com") == "alice"
+    store.close()
@@ -0,0 +1,237 @@
+from types import SimpleNamespace
+
+import pytest
+
+import user
+from user import TkDispatcher, VirtualList, WidgetPool, offset_pages
+
+
+class FakeWidget:
+    """Stands in for a Tk widget: records how it is packed and ignores everything else"""
+
+    def __init__(self, *args, **kwargs):
+        self.manager = ""
+
+    def pack(self, **kwargs):
+        self.manager = "pack"
+
+    def pack_forget(self):
+        self.manager = ""
+
+    def winfo_manager(self):
+        return self.manager
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: None
+
+
+class FakeCanvas(FakeWidget):
+    """A canvas viewport ``height`` pixels tall whose top edge is at ``top``"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__()
+        self.top = 0
+        self.width = 200
+        self.height = 50
+        self.items = {}
+        self.options = {}
+
+    def canvasy(self, y):
+        return self.top + y
+
+    def winfo_width(self):
+        return self.width
+
+    def winfo_height(self):
+        return self.height
+
+    def yview_moveto(self, fraction):
+        self.top = 0
+
+    def configure(self, **kwargs):
+        self.options.update(kwargs)
+
+    def create_window(self, x, y, **kwargs):
+        item = len(self.items) + 1
+        self.items[item] = {"y": y, **kwargs}
+        return item
+
+    def coords(self, item, x, y):
+        self.items[item]["y"] = y
+
+    def itemconfigure(self, item, **kwargs):
+        self.items[item].update(kwargs)
+
+
+class FakeCard:
+    PACK = {}
+
+    def __init__(self, parent):
+        self.frame = FakeWidget()
+        self.record = None
+
+    def bind(self, record):
+        self.record = record
+
+
+class FakeScheduler:
+    """``after``/``after_cancel`` that only run callbacks when the test says so"""
+
+    def __init__(self):
+        self.jobs = {}
+        self.next_id = 0
+
+    def after(self, ms, callback):
+        self.next_id += 1
+        self.jobs[self.next_id] = callback
+        return self.next_id
+
+    def after_cancel(self, job):
+        del self.jobs[job]
+
+    def run_next(self):
+        self.jobs.pop(min(self.jobs))()
+
+
+@pytest.fixture
+def scheduler(monkeypatch):
+    # Let VirtualList run without a display: no Tk widgets, and ``after`` goes to a fake scheduler
+    monkeypatch.setattr(user.ttk.Frame, "__init__", FakeWidget.__init__)
+    monkeypatch.setattr(user.ttk.Frame, "destroy", lambda self: None)
+    monkeypatch.setattr(user.ttk, "Scrollbar", FakeWidget)
+    monkeypatch.setattr(user.tk, "Canvas", FakeCanvas)
+    # Every refresh finishes in its first slice unless a test lowers the budget
+    monkeypatch.setattr(user, "RENDER_BUDGET_MS", float("inf"))
+    scheduler = FakeScheduler()
+    monkeypatch.setattr(VirtualList, "after", lambda self, ms, callback: scheduler.after(ms, callback),
+                        raising=False)
+    monkeypatch.setattr(VirtualList, "after_cancel", lambda self, job: scheduler.after_cancel(job), raising=False)
+    return scheduler
+
+
+def make_list(**kwargs):
+    return VirtualList(None, FakeCard, row_height=10, **kwargs)
+
+
+def shown(virtual_list):
+    """Row index -> records bound to the row's packed cards, checking each row sits at its offset"""
+    rows = {}
+    for index, (frame, cards, item) in virtual_list._rows.items():
+        placed = virtual_list.canvas.items[item]
+        assert placed["y"] == index * virtual_list.row_height and placed["state"] == user.tk.NORMAL
+        rows[index] = [card.record for card in cards if card.frame.winfo_manager()]
+    return rows
+
+
+def test_pool_hands_back_released_widgets():
+    made = []
+    pool = WidgetPool(lambda: made.append(object()) or made[-1])
+    first, second = pool.acquire(), pool.acquire()
+    assert first is not second and pool.stats() == {"created": 2, "reused": 0, "free": 0}
+    pool.release(first)
+    assert pool.acquire() is first
+    assert pool.acquire() is made[2]
+    assert pool.stats() == {"created": 3, "reused": 1, "free": 0}
+
+
+def test_visible_window_follows_scroll_and_resize(scheduler):
+    items = list(range(100))
+    virtual_list = make_list(overscan=2)
+    virtual_list.load(offset_pages(items, 20), len(items))
+    # Rows 0-4 fill the 50px viewport, plus one partly visible row and two rows of overscan
+    assert shown(virtual_list) == {index: [index] for index in range(8)}
+    assert virtual_list.canvas.options["scrollregion"] == (0, 0, 200, 1000)
+    assert len(virtual_list._items) == 20
+
+    virtual_list.canvas.top = 305
+    virtual_list._on_scroll("0.3", "0.35")
+    assert shown(virtual_list) == {index: [index] for index in range(28, 38)}
+    # Rows that scrolled away were hidden and rebound rather than rebuilt
+    assert virtual_list.stats()["created"] == 10 and virtual_list.stats()["reused"] == 8
+
+    virtual_list.canvas.height, virtual_list.canvas.width = 100, 300
+    virtual_list._on_resize(SimpleNamespace(width=300, height=100))
+    assert shown(virtual_list) == {index: [index] for index in range(28, 43)}
+    assert all(item["width"] == 300 for item in virtual_list.canvas.items.values())
+    assert virtual_list.canvas.options["scrollregion"] == (0, 0, 300, 1000)
+    assert not scheduler.jobs
+
+    virtual_list.canvas.top = 0
+    virtual_list._on_scroll("0.0", "0.1")
+    assert shown(virtual_list) == {index: [index] for index in range(13)}
+    assert virtual_list.widget_rows == 13 and virtual_list.stats()["free"] == 2
+    hidden = [item for item in virtual_list.canvas.items.values() if item["state"] == user.tk.HIDDEN]
+    assert len(hidden) == 2
+
+
+def test_grid_rows_and_short_last_row(scheduler):
+    virtual_list = make_list(columns=3, overscan=0)
+    virtual_list.load(offset_pages(list("abcdefg"), 4), 7)
+    assert shown(virtual_list) == {0: ["a", "b", "c"], 1: ["d", "e", "f"], 2: ["g"]}
+    assert virtual_list.canvas.options["scrollregion"] == (0, 0, 200, 30)
+
+    # A shorter result set rebinds the same rows, unpacking the cards it no longer needs
+    virtual_list.load(offset_pages(list("xyzw"), 4), 4)
+    assert shown(virtual_list) == {0: ["x", "y", "z"], 1: ["w"]}
+    assert virtual_list.stats()["created"] == 3 and virtual_list.stats()["reused"] == 2
+
+
+def test_unrecycled_rows_are_rebuilt(scheduler):
+    virtual_list = make_list(overscan=0, recycle=False)
+    virtual_list.load(offset_pages(list(range(50))), 50)
+    virtual_list.canvas.top = 200
+    virtual_list._on_scroll("0.4", "0.5")
+    assert shown(virtual_list) == {index: [index] for index in range(20, 26)}
+    assert virtual_list.stats()["reused"] == 0 and virtual_list.stats()["free"] == 0
+
+
+def test_slices_render_viewport_rows_first(scheduler, monkeypatch):
+    monkeypatch.setattr(user, "RENDER_BUDGET_MS", 0)
+    virtual_list = make_list(overscan=2)
+    virtual_list.load(offset_pages(list(range(100))), 100)
+    virtual_list.canvas.top = 300
+    virtual_list._on_scroll("0.3", "0.35")
+    order = []
+    while virtual_list.rendering:
+        order.append(set(virtual_list._rows))
+        scheduler.run_next()
+    # One row per slice, starting at the top of the viewport; the overscan above comes last
+    assert [len(rows) for rows in order] == list(range(1, 10))
+    assert order[0] == {30} and order[5] == set(range(30, 36)) and 28 not in order[-2]
+    assert shown(virtual_list) == {index: [index] for index in range(28, 38)}
+
+
+def test_new_query_cancels_pending_slices(scheduler, monkeypatch):
+    monkeypatch.setattr(user, "RENDER_BUDGET_MS", 0)
+    dispatcher = TkDispatcher(scheduler, poll_ms=50)
+    virtual_list = make_list(overscan=2)
+    old = [("old", index) for index in range(100)]
+    new = [("new", index) for index in range(100)]
+
+    # Results come back from a worker thread through the dispatcher, as in the app
+    dispatcher.post(virtual_list.load, offset_pages(old), len(old))
+    scheduler.run_next()
+    assert shown(virtual_list) == {0: [old[0]]} and virtual_list.rendering
+    stale = virtual_list._job
+    assert stale in scheduler.jobs
+
+    dispatcher.post(virtual_list.load, offset_pages(new), len(new))
+    scheduler.run_next()
+    assert stale not in scheduler.jobs
+    while virtual_list.rendering:
+        scheduler.jobs.pop(virtual_list._job)()
+    assert shown(virtual_list) == {index: [new[index]] for index in range(8)}
+    # Only the dispatcher's next poll is left
+    assert list(scheduler.jobs.values()) == [dispatcher._poll]
+
+
+def test_dispatcher_runs_posted_callbacks_in_order_and_keeps_polling():
+    scheduler = FakeScheduler()
+    dispatcher = TkDispatcher(scheduler, poll_ms=50)
+    calls = []
+    dispatcher.post(calls.append, 1)
+    dispatcher.post(calls.append, 2)
+    scheduler.run_next()
+    assert calls == [1, 2] and list(scheduler.jobs.values()) == [dispatcher._poll]
+    scheduler.run_next()
+    assert calls == [1, 2] and len(scheduler.jobs) == 1
@@ -0,0 +1,72 @@
+import time
+
+from user import JournaledUserStore, WriteBehindUserStore
+
+
+class RecordingStore(JournaledUserStore):
+    """Journaled store that records each batch it is given and can be told to fail"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.batches = []
+        self.failures = 0
+
+    def apply(self, ops):
+        if self.failures:
+            self.failures -= 1
+            raise OSError("disk full")
+        self.batches.append(list(ops))
+        super().apply(ops)
+
+
+def test_reads_see_queued_writes_and_updates_coalesce(tmp_path):
+    inner = RecordingStore(str(tmp_path / "users.json"))
+    store = WriteBehindUserStore(inner, flush_interval=60, max_pending=1000)
+    store.create("alice", {"password": "x", "email": "alice@example.com", "bookings": []})
+    store.update("alice", {"last_login": "2024-03-15"})
+    store.update("alice", {"last_login": "2024-03-16", "premium": True})
+    store.add_booking("alice", {"type": "Course", "name": "Batting Basics"})
+
+    assert inner.batches == []
+    assert "alice" in store and not store.is_empty()
+    assert store.find_by_email("alice@example.com") == "alice"
+    alice = store.get("alice")
+    assert alice["last_login"] == "2024-03-16" and alice["premium"] is True
+    assert [booking["name"] for booking in alice["bookings"]] == ["Batting Basics"]
+
+    store.flush()
+    assert len(inner.batches) == 1
+    assert [op for op, _, _ in inner.batches[0]] == ["create", "update", "booking"]
+    assert inner.get("alice") == alice
+    store.close()
+
+    reopened = JournaledUserStore(str(tmp_path / "users.json"))
+    assert reopened.get("alice") == alice
+    reopened.close()
+
+
+def test_close_flushes_pending_writes(tmp_path):
+    inner = RecordingStore(str(tmp_path / "users.json"))
+    store = WriteBehindUserStore(inner, flush_interval=60, max_pending=1000)
+    store.create("bob", {"password": "y", "bookings": []})
+    store.close()
+
+    reopened = JournaledUserStore(str(tmp_path / "users.json"))
+    assert "bob" in reopened
+    reopened.close()
+
+
+def test_failed_batch_is_reported_once_and_retried(tmp_path):
+    inner = RecordingStore(str(tmp_path / "users.json"))
+    inner.failures = 2
+    errors = []
+    store = WriteBehindUserStore(inner, flush_interval=0.01, max_pending=1000, on_error=errors.append)
+    store.create("carol", {"password": "z", "bookings": []})
+    store.update("carol", {"premium": True})
+
+    deadline = time.monotonic() + 5
+    while not inner.batches and time.monotonic() < deadline:
+        time.sleep(0.01)
+    store.close()
+    assert len(errors) == 1 and isinstance(errors[0], OSError)
+    assert inner.get("carol")["premium"] is True
@@ -2,10 +2,3246 @@ import tkinter as tk
 from tkinter import ttk, messagebox, simpledialog
 from PIL import Image, ImageTk
 import random
+import re
+import argparse
+import bisect
+import gc
 import json
 import os
+import queue
 import hashlib
-from datetime import datetime, timedelta
+import heapq
+import hmac
+import io
+import itertools
+import math
+import operator
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import zlib
+from array import array
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+
+try:
+    import numpy as np
+except ImportError:  # Optional: columnar queries fall back to the array module
+    np = None
+
+
+USERS_FILE = "users.json"
+USERS_DB_FILE = "users.db"
+USERS_SHARD_DIR = "users.d"
+KDF_SETTINGS_FILE = "kdf.json"
+ANY_OPTION = "Any"
+SEARCH_RESULT_LIMIT = 50
+SEARCH_RADII_KM = (10, 25, 50, 100, 250)
+PAGE_SIZE = 20
+# Fixed row heights (pixels) of the virtualized result lists
+ACADEMY_ROW_HEIGHT = 150
+COURSE_ROW_HEIGHT = 210
+WEBINAR_ROW_HEIGHT = 110
+EQUIPMENT_ROW_HEIGHT = 170
+# Main page listing each kind of catalog record
+CATALOG_PAGES = {"academy": "academies", "course": "courses", "webinar": "webinars", "equipment": "equipment"}
+# Time one slice of list rendering may take before yielding to the event loop (about one frame)
+RENDER_BUDGET_MS = 16
+# Hidden pages are kept alive until the cached pages hold more widgets than this
+PAGE_CACHE_MAX_WIDGETS = 2500
+# Courses above this price are only listed for premium members
+FREE_TIER_MAX_COURSE_PRICE = 1000
+# Academy filter panel: monthly fee bands as [low, high), minimum ratings, facility tags and batches
+FEE_BANDS = ((None, 3000, "Under ₹3,000/month"), (3000, 5000, "₹3,000 - ₹5,000/month"),
+             (5000, None, "Over ₹5,000/month"))
+RATING_LEVELS = (4.5, 4.0, 3.5)
+FACILITY_FILTERS = (("hostel", "Hostel"), ("pool", "Swimming pool"), ("gym", "Gym"))
+BATCH_FILTERS = (("morning", "Morning batch"), ("evening", "Evening batch"))
+TYPEAHEAD_IGNORED_KEYS = ("Up", "Down", "Left", "Right", "Return", "Escape", "Tab", "Shift_L", "Shift_R")
+CATALOG_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "catalog")
+# Course, webinar and equipment pictures, and the resized copies shown on cards
+IMAGE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "images")
+THUMBNAIL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "thumbnails")
+THUMBNAIL_SIZE = (64, 64)
+THUMBNAIL_CACHE_SIZE = 256
+
+
+# Billing period -> months, for comparing fees quoted per month, quarter or year
+MONTHS_PER_PERIOD = {"month": 1, "quarter": 3, "half-year": 6, "year": 12, "annum": 12}
+# Other ways fees name their period -> the period's key in MONTHS_PER_PERIOD
+FEE_PERIOD_ALIASES = {"monthly": "month", "mo": "month", "quarterly": "quarter", "half-yearly": "half-year",
+                      "halfyearly": "half-year", "semi-annual": "half-year", "semi-annually": "half-year",
+                      "yearly": "year", "annual": "year", "annually": "year", "yr": "year", "annum": "year"}
+FEE_PATTERN = re.compile(r"([\d,]+(?:\.\d+)?)\s*(?:(?:per|an?)\s+|/\s*)?([a-z-]+)", re.IGNORECASE)
+TIME_RANGE_PATTERN = re.compile(r"(\d{1,2})(?::(\d{2}))?\s*([AP]M)\s*-\s*(\d{1,2})(?::(\d{2}))?\s*([AP]M)",
+                                re.IGNORECASE)
+# Facility tag -> words that mark it in the free-text facility list
+FACILITY_KEYWORDS = {
+    "hostel": ("hostel",),
+    "pool": ("pool",),
+    "gym": ("gym",),
+    "medical": ("medical", "physio"),
+    "cafeteria": ("cafeteria",),
+    "indoor": ("indoor", "air-conditioned"),
+}
+
+
+def parse_fee(text):
+    """``"₹15,000 per quarter"`` -> ``(15000, "quarter")``; ``(None, None)`` if unrecognised"""
+    match = FEE_PATTERN.search(text or "")
+    if not match:
+        return None, None
+    amount = float(match.group(1).replace(",", ""))
+    period = match.group(2).lower().rstrip("s")
+    period = FEE_PERIOD_ALIASES.get(period, period)
+    return (int(amount) if amount.is_integer() else amount), period
+
+
+def _minutes(hour, minute, meridiem):
+    return int(hour) % 12 * 60 + int(minute or 0) + (720 if meridiem.upper() == "PM" else 0)
+
+
+ORDINAL_SUFFIX_PATTERN = re.compile(r"(\d{1,2})(?:st|nd|rd|th)\b", re.IGNORECASE)
+
+
+def parse_date(text):
+    """``"Friday, 17th March 2023"`` -> ``date(2023, 3, 17)``; None if unrecognised"""
+    text = ORDINAL_SUFFIX_PATTERN.sub(r"\1", (text or "").strip())
+    for pattern in ("%A, %d %B %Y", "%d %B %Y", "%A, %d %b %Y", "%d %b %Y", "%Y-%m-%d"):
+        try:
+            return datetime.strptime(text, pattern).date()
+        except ValueError:
+            continue
+    return None
+
+
+def parse_timings(text):
+    """``"6:00 AM - 9:00 AM, 4:00 PM - 7:00 PM"`` -> ``((360, 540), (960, 1140))`` in minutes after midnight"""
+    return tuple((_minutes(*match[:3]), _minutes(*match[3:]))
+                 for match in TIME_RANGE_PATTERN.findall(text or ""))
+
+
+def batches(sessions):
+    """Names of the parts of the day covered by a list of ``(start, end)`` sessions"""
+    names = []
+    for name, start, end in (("morning", 0, 720), ("afternoon", 720, 960), ("evening", 960, 1440)):
+        if any(session_start < end and session_end > start for session_start, session_end in sessions):
+            names.append(name)
+    return names
+
+
+def discounted_price(item):
+    return item["price"] * (100 - item["discount"]) / 100
+
+
+def facility_tags(facilities):
+    words = " ".join(facilities).lower()
+    return frozenset(tag for tag, keywords in FACILITY_KEYWORDS.items() if any(word in words for word in keywords))
+
+
+def webinar_window(date_filter, now):
+    """``[start, end)`` of a webinar date filter; weeks run Monday to Sunday and nothing before ``now`` is included"""
+    week_start = datetime.combine(now.date() - timedelta(days=now.weekday()), datetime.min.time())
+    if date_filter == "This Week":
+        return now, week_start + timedelta(weeks=1)
+    if date_filter == "Next Week":
+        return max(now, week_start + timedelta(weeks=1)), week_start + timedelta(weeks=2)
+    if date_filter == "This Month":
+        month_start = datetime(now.year, now.month, 1)
+        next_month = datetime(now.year + now.month // 12, now.month % 12 + 1, 1)
+        return max(now, month_start), next_month
+    return now, None
+
+
+class Record:
+    """Base for compact account and catalog records.
+
+    Fields live in ``__slots__`` instead of a per-object dict, and values of
+    enum-like fields listed in ``INTERNED`` are interned so millions of
+    records share one string per distinct value. Item access
+    (``record["name"]``, ``record.get("name")``) is kept so records can stand
+    in for the dicts the UI code reads. Keys without a slot are kept in
+    ``extra`` so ``from_dict``/``to_dict`` round-trip losslessly.
+    """
+
+    __slots__ = ("extra",)
+    FIELDS = ()
+    INTERNED = ()
+
+    def __init__(self, **fields):
+        self.extra = None
+        for key, value in fields.items():
+            self[key] = value
+
+    @classmethod
+    def from_dict(cls, data):
+        record = cls()
+        record.update(data)
+        return record
+
+    def to_dict(self):
+        data = {}
+        for field in self.FIELDS:
+            try:
+                value = getattr(self, field)
+            except AttributeError:
+                continue
+            if isinstance(value, list):
+                value = [item.to_dict() if isinstance(item, Record) else item for item in value]
+            data[field] = value
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    def copy(self):
+        clone = type(self).__new__(type(self))
+        for field in self.__slots__ + Record.__slots__:
+            try:
+                setattr(clone, field, getattr(self, field))
+            except AttributeError:
+                pass
+        if clone.extra is not None:
+            clone.extra = dict(clone.extra)
+        return clone
+
+    def update(self, fields):
+        for key, value in fields.items():
+            self[key] = value
+
+    def __getitem__(self, key):
+        if key in self.FIELDS:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                pass
+        elif self.extra and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        if key in self.FIELDS:
+            if key in self.INTERNED and isinstance(value, str):
+                value = sys.intern(value)
+            setattr(self, key, value)
+        else:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[key] = value
+
+    def __contains__(self, key):
+        try:
+            self[key]
+        except KeyError:
+            return False
+        return True
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+
+class BookingRecord(Record):
+    FIELDS = ("type", "academy_id", "name", "sport", "date", "time", "price", "status")
+    INTERNED = ("type", "sport", "status")
+    __slots__ = FIELDS
+
+
+class UserRecord(Record):
+    FIELDS = ("password", "email", "full_name", "phone", "type", "premium", "joined", "last_login",
+              "premium_since", "premium_until", "premium_auto_renew", "bookings")
+    INTERNED = ("type",)
+    __slots__ = FIELDS
+
+    def __setitem__(self, key, value):
+        if key == "bookings":
+            value = [booking if isinstance(booking, BookingRecord) else BookingRecord.from_dict(booking)
+                     for booking in value]
+        super().__setitem__(key, value)
+
+
+class Academy(Record):
+    FIELDS = ("id", "name", "rating", "coach", "established", "facilities", "address", "city", "contact", "fees",
+              "timings", "lat", "lon")
+    INTERNED = ("city",)
+    # Typed values parsed from the free-text fields at load time
+    DERIVED = ("fee_amount", "fee_period", "monthly_fee", "sessions", "facility_tags")
+    __slots__ = FIELDS + DERIVED
+
+    def __setitem__(self, key, value):
+        if key == "facilities":
+            value = [sys.intern(facility) for facility in value]
+            self.facility_tags = facility_tags(value)
+        elif key == "fees":
+            amount, period = parse_fee(value)
+            months = MONTHS_PER_PERIOD.get(period)
+            self.fee_amount = amount
+            self.fee_period = sys.intern(period) if period else None
+            self.monthly_fee = round(amount / months, 2) if amount is not None and months else None
+        elif key == "timings":
+            self.sessions = parse_timings(value)
+        super().__setitem__(key, value)
+
+
+class Course(Record):
+    FIELDS = ("id", "title", "price", "duration", "instructor", "sport", "description", "modules", "image",
+              "students", "rating")
+    INTERNED = ("duration", "instructor", "sport")
+    __slots__ = FIELDS
+
+
+class Webinar(Record):
+    FIELDS = ("id", "title", "price", "date", "time", "duration", "instructor", "description", "image", "seats",
+              "registered")
+    INTERNED = ("date", "time", "duration", "instructor")
+    # Start and end parsed from ``date`` and ``time`` at load time
+    DERIVED = ("starts_at", "ends_at")
+    __slots__ = FIELDS + DERIVED
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        if key in ("date", "time"):
+            day = parse_date(getattr(self, "date", None))
+            sessions = parse_timings(getattr(self, "time", None))
+            if day is None or not sessions:
+                self.starts_at = self.ends_at = None
+            else:
+                midnight = datetime.combine(day, datetime.min.time())
+                start, end = sessions[0]
+                self.starts_at = midnight + timedelta(minutes=start)
+                self.ends_at = midnight + timedelta(minutes=end if end > start else end + 1440)
+
+
+class EquipmentItem(Record):
+    FIELDS = ("id", "name", "price", "category", "discount", "description", "image", "stock", "rating")
+    INTERNED = ("category",)
+    __slots__ = FIELDS
+
+
+class AcademyIndex:
+    """Academies filed under every combination of sport, state and city, plus a reverse index by ID.
+
+    Each academy is added under the (up to eight) keys formed by taking its
+    own value or the ``None`` wildcard for each field, so any mix of filters
+    is answered by a single dict lookup in O(result size). Buckets are
+    insertion-ordered dicts keyed by academy ID, so adding or removing an
+    academy is O(1), and ``resolve`` maps an ID straight back to its record.
+    """
+
+    def __init__(self):
+        self._buckets = {}
+        self._by_id = {}
+
+    @staticmethod
+    def _keys(sport, state, city):
+        # A field that is already None (an academy without a city) yields its wildcard key once
+        for use_sport in dict.fromkeys((sport, None)):
+            for use_state in dict.fromkeys((state, None)):
+                for use_city in dict.fromkeys((city, None)):
+                    yield use_sport, use_state, use_city
+
+    def add(self, academy, sport, state):
+        city = academy.get("city")
+        self._by_id[academy["id"]] = (sport, state, city, academy)
+        for key in self._keys(sport, state, city):
+            self._buckets.setdefault(key, {})[academy["id"]] = academy
+
+    def remove(self, academy):
+        sport, state, city, _ = self._by_id.pop(academy["id"])
+        for key in self._keys(sport, state, city):
+            bucket = self._buckets[key]
+            del bucket[academy["id"]]
+            if not bucket:
+                del self._buckets[key]
+
+    def resolve(self, academy_id):
+        """Return ``(sport, state, city, academy)`` for an ID, or None"""
+        return self._by_id.get(academy_id)
+
+    def location(self, academy):
+        """Return ``(sport, state, city)`` for an indexed academy"""
+        return self._by_id[academy["id"]][:3]
+
+    def next_id(self):
+        return max(self._by_id, default=0) + 1
+
+    def lookup(self, sport=None, state=None, city=None):
+        """Academies matching the given fields; ``None`` matches anything"""
+        return list(self._buckets.get((sport, state, city), {}).values())
+
+    def __len__(self):
+        return len(self._by_id)
+
+
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+
+
+def distance_km(lat1, lon1, lat2, lon2):
+    """Great-circle (haversine) distance between two points"""
+    lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+class GeoIndex:
+    """Uniform latitude/longitude grid for radius and nearest-neighbour queries.
+
+    Points live in square cells of ``cell_degrees``. A radius query only
+    visits the cells overlapping the circle's bounding box, and a k-nearest
+    query scans rings of cells outward from the query point, stopping once
+    the k-th best distance is closer than anything an unvisited ring could
+    hold. Both cost time proportional to the points near the query, not to
+    the size of the catalog, and points can be added or removed in O(1).
+    """
+
+    def __init__(self, cell_degrees=0.25):
+        self.cell_degrees = cell_degrees
+        self._cells = {}
+        self._points = {}
+        # Points per grid row and column, and the occupied (row_min, row_max, col_min, col_max) or None if stale
+        self._row_counts = {}
+        self._col_counts = {}
+        self._bounds = None
+
+    def _cell(self, lat, lon):
+        return int(math.floor(lat / self.cell_degrees)), int(math.floor(lon / self.cell_degrees))
+
+    def add(self, key, lat, lon, value=None):
+        if key in self._points:
+            self.remove(key)
+        entry = (lat, lon, key, value)
+        self._points[key] = entry
+        row, col = cell = self._cell(lat, lon)
+        self._cells.setdefault(cell, []).append(entry)
+        self._row_counts[row] = self._row_counts.get(row, 0) + 1
+        self._col_counts[col] = self._col_counts.get(col, 0) + 1
+        if self._bounds is not None:
+            row_min, row_max, col_min, col_max = self._bounds
+            self._bounds = min(row_min, row), max(row_max, row), min(col_min, col), max(col_max, col)
+
+    def remove(self, key):
+        entry = self._points.pop(key, None)
+        if entry is None:
+            return
+        row, col = cell = self._cell(entry[0], entry[1])
+        bucket = self._cells[cell]
+        bucket.remove(entry)
+        if not bucket:
+            del self._cells[cell]
+        for counts, line in ((self._row_counts, row), (self._col_counts, col)):
+            counts[line] -= 1
+            if not counts[line]:
+                del counts[line]
+                # An emptied edge row or column shrinks the bounds; recompute them on the next query
+                self._bounds = None
+
+    def _extent(self):
+        if self._bounds is None:
+            self._bounds = (min(self._row_counts), max(self._row_counts),
+                            min(self._col_counts), max(self._col_counts))
+        return self._bounds
+
+    def _lon_degrees(self, lat, km):
+        """Longitude span covering ``km`` at the widest latitude ``km`` away from ``lat``"""
+        widest = min(89.0, abs(lat) + km / KM_PER_DEGREE)
+        return km / (KM_PER_DEGREE * math.cos(math.radians(widest)))
+
+    def within(self, lat, lon, radius_km, accept=None):
+        """``(distance_km, value)`` pairs within ``radius_km``, nearest first"""
+        lat_span = radius_km / KM_PER_DEGREE
+        lon_span = self._lon_degrees(lat, radius_km)
+        row_min, col_min = self._cell(lat - lat_span, lon - lon_span)
+        row_max, col_max = self._cell(lat + lat_span, lon + lon_span)
+        found = []
+        for row in range(row_min, row_max + 1):
+            for col in range(col_min, col_max + 1):
+                for point_lat, point_lon, key, value in self._cells.get((row, col), ()):
+                    if accept is not None and not accept(value):
+                        continue
+                    distance = distance_km(lat, lon, point_lat, point_lon)
+                    if distance <= radius_km:
+                        found.append((distance, key, value))
+        found.sort(key=lambda item: (item[0], item[1]))
+        return [(distance, value) for distance, _, value in found]
+
+    def nearest(self, lat, lon, k=5, accept=None):
+        """The ``k`` closest ``(distance_km, value)`` pairs, nearest first"""
+        if not self._cells:
+            return []
+        centre_row, centre_col = self._cell(lat, lon)
+        row_min, row_max, col_min, col_max = self._extent()
+        max_ring = max(abs(centre_row - row_min), abs(centre_row - row_max),
+                       abs(centre_col - col_min), abs(centre_col - col_max))
+        best = []  # max-heap of (-distance, key, value)
+        for ring in range(max_ring + 1):
+            for row in range(centre_row - ring, centre_row + ring + 1):
+                on_edge = row in (centre_row - ring, centre_row + ring)
+                step = 1 if on_edge else 2 * ring
+                for col in range(centre_col - ring, centre_col + ring + 1, max(step, 1)):
+                    for point_lat, point_lon, key, value in self._cells.get((row, col), ()):
+                        if accept is not None and not accept(value):
+                            continue
+                        entry = (-distance_km(lat, lon, point_lat, point_lon), key, value)
+                        if len(best) < k:
+                            heapq.heappush(best, entry)
+                        elif entry[0] > best[0][0]:
+                            heapq.heapreplace(best, entry)
+            # Anything outside this ring is at least ``ring`` whole cells away
+            if len(best) == k:
+                reach = ring * self.cell_degrees
+                bound = min(reach * KM_PER_DEGREE,
+                            reach * KM_PER_DEGREE * math.cos(math.radians(min(89.0, abs(lat) + reach))))
+                if -best[0][0] <= bound:
+                    break
+        best.sort(key=lambda item: (-item[0], item[1]))
+        return [(-distance, value) for distance, _, value in best]
+
+    def __len__(self):
+        return len(self._points)
+
+
+class SearchIndex:
+    """In-memory inverted index with BM25 ranking and incremental add/remove.
+
+    Documents are keyed by any hashable (the catalog uses ``(kind, id)``).
+    Postings map each term to ``{doc_key: term frequency}``. For ranking,
+    each queried term's postings are turned into an impact list (BM25
+    contribution per document, best first) that is cached until the term's
+    postings change. Queries then run the threshold algorithm over those
+    lists and usually stop after a few entries, even for very common terms.
+    Collection statistics (document count, average length) are snapshotted
+    and only refreshed once they drift by more than ``stats_tolerance``, so
+    one added document does not invalidate every cached list.
+    """
+
+    TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+    STOPWORDS = frozenset(["a", "an", "and", "at", "for", "in", "of", "on", "or", "the", "to", "with"])
+
+    def __init__(self, k1=1.2, b=0.75, stats_tolerance=0.05):
+        self.k1 = k1
+        self.b = b
+        self.stats_tolerance = stats_tolerance
+        self._postings = {}
+        self._doc_terms = {}
+        self._lengths = {}
+        self._total_length = 0
+        self._stats = None
+        self._impacts = {}
+
+    @classmethod
+    def tokenize(cls, text):
+        tokens = []
+        for token in cls.TOKEN_PATTERN.findall(text.lower()):
+            if token in cls.STOPWORDS:
+                continue
+            # Fold simple plurals so "pools" matches "pool"
+            if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+                token = token[:-1]
+            tokens.append(token)
+        return tokens
+
+    def add(self, doc_key, *texts):
+        """Index (or re-index) a document from one or more text fields"""
+        if doc_key in self._doc_terms:
+            self.remove(doc_key)
+        counts = {}
+        for text in texts:
+            for token in self.tokenize(text):
+                counts[token] = counts.get(token, 0) + 1
+        self._doc_terms[doc_key] = counts
+        self._lengths[doc_key] = sum(counts.values())
+        self._total_length += self._lengths[doc_key]
+        for term, count in counts.items():
+            self._postings.setdefault(term, {})[doc_key] = count
+            self._impacts.pop(term, None)
+
+    def remove(self, doc_key):
+        counts = self._doc_terms.pop(doc_key, None)
+        if counts is None:
+            return
+        self._total_length -= self._lengths.pop(doc_key)
+        for term in counts:
+            postings = self._postings[term]
+            del postings[doc_key]
+            if not postings:
+                del self._postings[term]
+            self._impacts.pop(term, None)
+
+    def _current_stats(self):
+        """Snapshot of ``(doc_count, total_length)`` used for scoring"""
+        doc_count, total_length = len(self._doc_terms), self._total_length
+        if self._stats is not None:
+            old_count, old_length = self._stats
+            if abs(doc_count - old_count) <= old_count * self.stats_tolerance \
+                    and abs(total_length - old_length) <= old_length * self.stats_tolerance:
+                return self._stats
+        self._stats = (doc_count, total_length)
+        self._impacts.clear()
+        return self._stats
+
+    def _impact_list(self, term, doc_count, total_length):
+        """Return ``(impacts best first, {doc_key: impact})`` for a term"""
+        cached = self._impacts.get(term)
+        if cached is None:
+            postings = self._postings[term]
+            k1 = self.k1
+            # BM25 length normalisation k1 * (1 - b + b * length / average) as base + slope * length
+            base = k1 * (1 - self.b)
+            slope = k1 * self.b * doc_count / max(total_length, 1)
+            df = len(postings)
+            weight = math.log(1 + (doc_count - df + 0.5) / (df + 0.5)) * (k1 + 1)
+            lengths = self._lengths
+            scores = {doc_key: weight * tf / (tf + base + slope * lengths[doc_key])
+                      for doc_key, tf in postings.items()}
+            ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+            cached = self._impacts[term] = (ranked, scores)
+        return cached
+
+    def search(self, query, limit=20):
+        """Return up to ``limit`` ``(score, doc_key)`` pairs, best first"""
+        if not self._doc_terms:
+            return []
+        doc_count, total_length = self._current_stats()
+        lists = [self._impact_list(term, doc_count, total_length)
+                 for term in set(self.tokenize(query)) if term in self._postings]
+        if not lists:
+            return []
+        if len(lists) == 1:
+            return [(score, doc_key) for doc_key, score in lists[0][0][:limit]]
+
+        # Threshold algorithm: walk the lists in parallel, scoring each newly
+        # seen document fully, until the k-th best score beats the best score
+        # any unseen document could still reach.
+        best = []
+        seen = set()
+        depth = 0
+        while True:
+            frontier = 0.0
+            exhausted = True
+            for ranked, _ in lists:
+                if depth >= len(ranked):
+                    continue
+                exhausted = False
+                doc_key, score = ranked[depth]
+                frontier += score
+                if doc_key in seen:
+                    continue
+                seen.add(doc_key)
+                total = sum(scores.get(doc_key, 0.0) for _, scores in lists)
+                entry = (total, len(seen), doc_key)
+                if len(best) < limit:
+                    heapq.heappush(best, entry)
+                elif total > best[0][0]:
+                    heapq.heapreplace(best, entry)
+            if exhausted or (len(best) >= limit and best[0][0] >= frontier):
+                break
+            depth += 1
+
+        return [(total, doc_key) for total, _, doc_key in sorted(best, reverse=True)]
+
+    def __len__(self):
+        return len(self._doc_terms)
+
+
+class PrefixIndex:
+    """Prefix trie that returns the top-``k`` highest scoring completions for what has been typed.
+
+    Every node caches the best ``k`` entries in its subtree, so a lookup only
+    walks the typed prefix and returns that list without visiting the
+    subtree. Entries are reachable from the start of every word, so "cri"
+    completes to "Mumbai Cricket Club" as well as "Cricket".
+    """
+
+    class _Node:
+        __slots__ = ("children", "ends", "top")
+
+        def __init__(self):
+            self.children = {}
+            self.ends = []
+            self.top = []
+
+    DEFAULT_K = 10
+
+    def __init__(self, k=DEFAULT_K):
+        self.k = k
+        self._root = self._Node()
+        self._entries = {}
+
+    @staticmethod
+    def _word_starts(text):
+        return [i for i, char in enumerate(text) if char.isalnum() and (i == 0 or not text[i - 1].isalnum())]
+
+    def add(self, text, score=0.0, value=None):
+        """Add ``text`` ranked by ``score`` (higher first); completions return ``value`` (default ``text``)"""
+        value = text if value is None else value
+        if value in self._entries:
+            self.remove(value)
+        normalized = text.lower()
+        # Ties on score fall back to alphabetical order
+        entry = (-score, normalized, value)
+        self._entries[value] = (entry, normalized)
+        for start in self._word_starts(normalized):
+            node = self._root
+            self._offer(node, entry)
+            for char in normalized[start:]:
+                node = node.children.setdefault(char, self._Node())
+                self._offer(node, entry)
+            node.ends.append(entry)
+
+    def _offer(self, node, entry):
+        top = node.top
+        if len(top) >= self.k and not entry < top[-1]:
+            return
+        i = bisect.bisect_left(top, entry)
+        if i < len(top) and top[i] == entry:
+            return
+        top.insert(i, entry)
+        del top[self.k:]
+
+    def remove(self, value):
+        entry, normalized = self._entries.pop(value)
+        for start in self._word_starts(normalized):
+            path = [self._root]
+            for char in normalized[start:]:
+                path.append(path[-1].children[char])
+            path[-1].ends.remove(entry)
+            # Rebuild the cached top lists bottom-up from the children's lists
+            for depth in range(len(path) - 1, -1, -1):
+                node = path[depth]
+                if entry not in node.top:
+                    continue
+                candidates = set(node.ends)
+                for child in node.children.values():
+                    candidates.update(child.top)
+                node.top = sorted(candidates)[:self.k]
+                if depth and not node.top:
+                    del path[depth - 1].children[normalized[start + depth - 1]]
+
+    def complete(self, prefix, k=None):
+        """Values of the best completions of ``prefix``, best first"""
+        node = self._root
+        for char in prefix.strip().lower():
+            node = node.children.get(char)
+            if node is None:
+                return []
+        return [value for _, _, value in node.top[:k or self.k]]
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def levenshtein(a, b, limit=None):
+    """Edit distance between ``a`` and ``b``; stops early and returns ``limit + 1`` once it must exceed ``limit``"""
+    if len(a) < len(b):
+        a, b = b, a
+    if limit is not None and len(a) - len(b) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b)))
+        if limit is not None and min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+
+class FuzzyIndex:
+    """Typo-tolerant name lookup using a trigram index and bounded edit distance.
+
+    Every name is indexed whole and word by word, so "Bhaichung" finds
+    "Bhaichung Bhutia". A query only reads the posting lists of its own
+    trigrams; the q-gram count filter (strings within distance ``d`` share at
+    least ``max(len) + 2 - 3d`` padded trigrams) and a length filter prune
+    candidates before any edit distance is computed, and the distance itself
+    stops as soon as it exceeds the allowed bound.
+    """
+
+    MIN_TERM_LENGTH = 3
+
+    def __init__(self):
+        self._terms = []
+        self._term_ids = {}
+        self._term_docs = []
+        self._grams = {}
+        self._doc_terms = {}
+
+    @staticmethod
+    def normalize(text):
+        return " ".join(SearchIndex.TOKEN_PATTERN.findall(text.lower()))
+
+    @staticmethod
+    def trigrams(term):
+        padded = f"##{term}$$"
+        return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+    @staticmethod
+    def default_distance(term):
+        """Allowed typos: 1 for short words, 2 for names, 3 for long phrases"""
+        return 1 if len(term) <= 5 else 2 if len(term) <= 12 else 3
+
+    def _term_id(self, term):
+        term_id = self._term_ids.get(term)
+        if term_id is None:
+            term_id = self._term_ids[term] = len(self._terms)
+            self._terms.append(term)
+            self._term_docs.append(set())
+            for gram in self.trigrams(term):
+                self._grams.setdefault(gram, []).append(term_id)
+        return term_id
+
+    def add(self, doc_key, *names):
+        """Index (or re-index) a document under one or more names"""
+        if doc_key in self._doc_terms:
+            self.remove(doc_key)
+        term_ids = set()
+        for name in names:
+            name = self.normalize(name)
+            for term in {name, *name.split()}:
+                if len(term) >= self.MIN_TERM_LENGTH:
+                    term_ids.add(self._term_id(term))
+        for term_id in term_ids:
+            self._term_docs[term_id].add(doc_key)
+        self._doc_terms[doc_key] = term_ids
+
+    def remove(self, doc_key):
+        # Terms stay in the trigram lists; an emptied term simply matches no documents
+        for term_id in self._doc_terms.pop(doc_key, ()):
+            self._term_docs[term_id].discard(doc_key)
+
+    def search(self, query, limit=20, max_distance=None):
+        """Return up to ``limit`` ``(distance, doc_key)`` pairs, closest first"""
+        query = self.normalize(query)
+        if len(query) < self.MIN_TERM_LENGTH:
+            return []
+        distance = self.default_distance(query) if max_distance is None else max_distance
+        # Keep the count filter meaningful: every candidate must share at least one trigram
+        distance = min(distance, (len(query) + 1) // 3)
+
+        grams = self.trigrams(query)
+        shared = {}
+        for gram in grams:
+            for term_id in self._grams.get(gram, ()):
+                shared[term_id] = shared.get(term_id, 0) + 1
+        # The filter bounds shared trigram occurrences; distinct ones can fall short by the query's repeats
+        repeated = len(query) + 2 - len(grams)
+
+        best = {}
+        terms = self._terms
+        for term_id, count in shared.items():
+            term = terms[term_id]
+            if abs(len(term) - len(query)) > distance \
+                    or count < max(len(term), len(query)) + 2 - 3 * distance - repeated:
+                continue
+            docs = self._term_docs[term_id]
+            if not docs:
+                continue
+            found = levenshtein(query, term, distance)
+            if found > distance:
+                continue
+            for doc_key in docs:
+                if found < best.get(doc_key, distance + 1):
+                    best[doc_key] = found
+        return sorted(((found, doc_key) for doc_key, found in best.items()), key=lambda item: item[0])[:limit]
+
+    def __len__(self):
+        return len(self._doc_terms)
+
+
+# Bit offsets set in each byte value, for walking a bitmap a byte at a time
+_BYTE_BITS = tuple(tuple(bit for bit in range(8) if value >> bit & 1) for value in range(256))
+
+
+class FacetIndex:
+    """Bitmap facet engine for combined filters with per-value counts.
+
+    Every item gets a bit position, and each ``(facet, value)`` pair keeps a
+    Python int with the bits of the items that have it. A query ANDs the
+    facets together (ORing the chosen values of a facet, or ANDing them for
+    facets listed in ``conjunctive`` such as facilities), so filtering and
+    counting are a handful of big-int operations instead of a pass over the
+    records. Numeric fields are also kept sorted so ``range_mask`` answers
+    arbitrary ranges with two bisections. Removed items leave a gap in the
+    bit positions; once gaps outnumber live items the positions are
+    renumbered, so churn does not widen every bitmap. Masks taken before a
+    ``remove`` should not be used after it.
+    """
+
+    # Gaps below this never trigger renumbering
+    MIN_COMPACT_GAPS = 64
+
+    def __init__(self, conjunctive=()):
+        self.conjunctive = frozenset(conjunctive)
+        self._reset()
+
+    def _reset(self):
+        self._items = []
+        self._positions = {}
+        self._bitmaps = {}
+        self._values = {}
+        self._numbers = {}
+        self._all = 0
+
+    def add(self, key, item, facets, numbers=None):
+        """Index ``item`` under ``facets`` (facet -> iterable of values) and ``numbers`` (name -> number)"""
+        if key in self._positions:
+            self.remove(key)
+        position = len(self._items)
+        self._items.append((key, item, facets, numbers or {}))
+        self._positions[key] = position
+        bit = 1 << position
+        self._all |= bit
+        for facet, values in facets.items():
+            known = self._values.setdefault(facet, {})
+            for value in values:
+                known[value] = None
+                self._bitmaps[facet, value] = self._bitmaps.get((facet, value), 0) | bit
+        for name, number in (numbers or {}).items():
+            if number is not None:
+                bisect.insort(self._numbers.setdefault(name, []), (number, position))
+
+    def remove(self, key):
+        position = self._positions.pop(key, None)
+        if position is None:
+            return
+        _, _, facets, numbers = self._items[position]
+        self._items[position] = None
+        bit = 1 << position
+        self._all &= ~bit
+        for facet, values in facets.items():
+            for value in values:
+                self._bitmaps[facet, value] &= ~bit
+        for name, number in numbers.items():
+            if number is not None:
+                entries = self._numbers[name]
+                del entries[bisect.bisect_left(entries, (number, position))]
+        gaps = len(self._items) - len(self._positions)
+        if gaps >= self.MIN_COMPACT_GAPS and gaps > len(self._positions):
+            self._compact()
+
+    def _compact(self):
+        """Renumber the live items from bit 0 up, keeping their order"""
+        live = [entry for entry in self._items if entry is not None]
+        self._reset()
+        for key, item, facets, numbers in live:
+            self.add(key, item, facets, numbers)
+
+    def mask(self, keys=None):
+        """Bitmap of the given item keys, or of every item"""
+        if keys is None:
+            return self._all
+        positions = self._positions
+        return self._bitmap(positions[key] for key in keys if key in positions)
+
+    def range_mask(self, name, low=None, high=None):
+        """Bitmap of items whose ``name`` lies in ``[low, high]`` (None leaves that end open)"""
+        entries = self._numbers.get(name, [])
+        start = 0 if low is None else bisect.bisect_left(entries, (low, -1))
+        end = len(entries) if high is None else bisect.bisect_right(entries, (high, len(self._items)))
+        return self._bitmap(position for _, position in entries[start:end])
+
+    def _bitmap(self, positions):
+        # Set bits in a byte buffer and convert once; ORing shifted ints one at a time is quadratic
+        buffer = bytearray((len(self._items) + 7) // 8)
+        for position in positions:
+            buffer[position >> 3] |= 1 << (position & 7)
+        return int.from_bytes(buffer, "little")
+
+    def _facet_mask(self, facet, values):
+        if facet in self.conjunctive:
+            bits = self._all
+            for value in values:
+                bits &= self._bitmaps.get((facet, value), 0)
+            return bits
+        bits = 0
+        for value in values:
+            bits |= self._bitmaps.get((facet, value), 0)
+        return bits
+
+    def query(self, selected, base=None):
+        """Apply ``selected`` (facet -> chosen values) within ``base``.
+
+        Returns ``(items, counts)``: the matching items in insertion order,
+        and for every facet value the number of items that selecting it
+        would leave. A facet's own choices are ignored when counting its
+        alternatives, except for conjunctive facets whose choices narrow
+        each other.
+        """
+        base = self._all if base is None else base & self._all
+        masks = {facet: self._facet_mask(facet, values) for facet, values in selected.items() if values}
+        result = base
+        for bits in masks.values():
+            result &= bits
+
+        counts = {}
+        for facet, values in self._values.items():
+            if facet in self.conjunctive:
+                others = result
+            else:
+                others = base
+                for other, bits in masks.items():
+                    if other != facet:
+                        others &= bits
+            counts[facet] = {value: bin(self._bitmaps[facet, value] & others).count("1") for value in values}
+        return self.items(result), counts
+
+    def items(self, bits):
+        """Items whose bits are set, in insertion order, found with one pass over the bitmap's bytes"""
+        found = []
+        items = self._items
+        for index, byte in enumerate(bits.to_bytes((bits.bit_length() + 7) // 8, "little")):
+            if byte:
+                base = index << 3
+                for bit in _BYTE_BITS[byte]:
+                    found.append(items[base + bit][1])
+        return found
+
+    def __len__(self):
+        return len(self._positions)
+
+
+class SortedIndex:
+    """Records presorted by one key inside every group they belong to, read a page at a time.
+
+    ``groups(record)`` lists the group keys a record is filed under (for
+    example its sport and ``None`` for "all sports"), and each group keeps a
+    sorted list of ``(sort value, id)``. A page bisects to the cursor and
+    slices, so it costs O(log n + page size) however large the group is.
+    The cursor is the ``(sort value, id)`` of the last record shown, which
+    stays valid when records are added or removed between pages.
+    """
+
+    def __init__(self, sort_key, groups):
+        self.sort_key = sort_key
+        self.groups = groups
+        self._lists = {}
+        self._records = {}
+
+    def add(self, record):
+        self.remove(record)
+        entry = (self.sort_key(record), record["id"])
+        groups = tuple(self.groups(record))
+        # The entry and groups are kept because records may be changed in place before being re-added
+        self._records[record["id"]] = (record, entry, groups)
+        for group in groups:
+            bisect.insort(self._lists.setdefault(group, []), entry)
+
+    def remove(self, record):
+        stored = self._records.pop(record["id"], None)
+        if stored is None:
+            return
+        _, entry, groups = stored
+        for group in groups:
+            entries = self._lists[group]
+            del entries[bisect.bisect_left(entries, entry)]
+
+    def count(self, group):
+        return len(self._lists.get(group, ()))
+
+    def range(self, group, low=None, high=None):
+        """Records whose sort value is in ``[low, high)`` (None leaves that end open), in order"""
+        entries = self._lists.get(group, [])
+        start = 0 if low is None else bisect.bisect_left(entries, (low,))
+        end = len(entries) if high is None else bisect.bisect_left(entries, (high,))
+        return [self._records[record_id][0] for _, record_id in entries[start:end]]
+
+    def page(self, group, after=None, limit=20):
+        """Return ``(records, cursor)``; ``cursor`` fetches the next page and is None after the last one"""
+        entries = self._lists.get(group, [])
+        start = 0 if after is None else bisect.bisect_right(entries, after)
+        chunk = entries[start:start + limit]
+        cursor = chunk[-1] if start + limit < len(entries) else None
+        return [self._records[record_id][0] for _, record_id in chunk], cursor
+
+
+def offset_pages(items, limit=PAGE_SIZE):
+    """A ``VirtualList`` fetch function over an in-memory list; the cursor is an offset"""
+    def fetch(cursor):
+        start = cursor or 0
+        end = start + limit
+        return items[start:end], (end if end < len(items) else None)
+    return fetch
+
+
+def query_bookings(bookings, sort="date", descending=False, kind=None, text=""):
+    """Bookings of type ``kind`` (any if None) whose type, name or status contains ``text``, sorted by a column"""
+    text = text.strip().lower()
+    rows = [booking for booking in bookings
+            if (kind is None or booking.get("type") == kind)
+            and (not text or any(text in str(booking.get(field) or "").lower() for field in ("type", "name", "status")))]
+    if sort == "date":
+        # Bookings store dates as typed ("2024-03-15", "21st Oct 2026"); many share a day, so parse each once
+        parsed = {}
+
+        def sort_key(booking):
+            value = booking.get("date") or ""
+            if value not in parsed:
+                parsed[value] = parse_date(value) or date.min
+            return parsed[value]
+    else:
+        sort_key = lambda booking: str(booking.get(sort) or "").lower()
+    rows.sort(key=sort_key, reverse=descending)
+    return rows
+
+
+class BookingsTable:
+    """Sort, filter and paging state of the profile's bookings table, kept apart from its Treeview.
+
+    ``filter`` re-runs ``query_bookings`` and starts again from the first
+    page; ``next_page`` returns the following ``page_size`` rows, or an
+    empty list once every row has been handed out.
+    """
+
+    def __init__(self, bookings, page_size=PAGE_SIZE):
+        self.bookings = bookings
+        self.page_size = page_size
+        # Newest bookings first until a heading is clicked
+        self.column = "date"
+        self.descending = True
+        self.kind = None
+        self.text = ""
+        self._fetch = None
+        self._cursor = None
+
+    def sort_by(self, column):
+        """Sort by ``column``; choosing the current column again reverses it, and dates start newest first"""
+        self.descending = not self.descending if column == self.column else column == "date"
+        self.column = column
+        self.filter(self.kind, self.text)
+
+    def filter(self, kind=None, text=""):
+        self.kind, self.text = kind, text
+        rows = query_bookings(self.bookings, self.column, self.descending, kind=kind, text=text)
+        self._fetch, self._cursor = offset_pages(rows, self.page_size), 0
+
+    def next_page(self):
+        if self._cursor is None:
+            return []
+        page, self._cursor = self._fetch(self._cursor)
+        return page
+
+    @property
+    def exhausted(self):
+        return self._cursor is None
+
+    def heading(self, column, title):
+        """Column title with an arrow on the sorted column"""
+        if column != self.column:
+            return title
+        return title + (" ▼" if self.descending else " ▲")
+
+
+def sorted_pages(records, sort_key, limit=PAGE_SIZE):
+    """A ``VirtualList`` fetch function over an unindexed result list, sorted once by ``(sort_key, id)``.
+
+    Cursors are ``(value, id)`` pairs as in ``SortedIndex.page``; each page
+    bisects to its cursor and slices, so paging does not rescan the results.
+    """
+    entries = sorted((sort_key(record), record["id"], record) for record in records)
+    keys = [entry[:2] for entry in entries]
+
+    def fetch(after=None):
+        start = 0 if after is None else bisect.bisect_right(keys, after)
+        end = start + limit
+        cursor = keys[end - 1] if end < len(entries) else None
+        return [record for _, _, record in entries[start:end]], cursor
+    return fetch
+
+
+class QueryCache:
+    """Bounded LRU memo of query results with invalidation by tag.
+
+    Each entry is stored with the tags of the data it was computed from
+    (for example ``("course", "Cricket")`` or ``("course", None)`` for a
+    query over every sport). When a record changes, invalidating its tags
+    drops only the entries that could have included it; the rest of the
+    cache stays warm.
+    """
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._by_tag = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key, compute, tags=()):
+        """Return the cached result for ``key``, calling ``compute()`` on a miss"""
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+        self.misses += 1
+        value = compute()
+        self._entries[key] = (value, tuple(tags))
+        for tag in tags:
+            self._by_tag.setdefault(tag, set()).add(key)
+        while len(self._entries) > self.max_entries:
+            self._drop(next(iter(self._entries)))
+            self.evictions += 1
+        return value
+
+    def _drop(self, key):
+        _, tags = self._entries.pop(key)
+        for tag in tags:
+            keys = self._by_tag[tag]
+            keys.discard(key)
+            if not keys:
+                del self._by_tag[tag]
+
+    def invalidate(self, *tags):
+        for tag in tags:
+            for key in list(self._by_tag.get(tag, ())):
+                self._drop(key)
+                self.invalidations += 1
+
+    def clear(self):
+        self._entries.clear()
+        self._by_tag.clear()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0, "evictions": self.evictions,
+                "invalidations": self.invalidations}
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class ColumnarTable:
+    """Catalog records mirrored into typed columns so filters and sorts run over whole columns at once.
+
+    Numeric fields become float columns and categorical ones integer codes.
+    With NumPy each predicate is one vectorized comparison and the page is
+    picked with ``argpartition``; without it, ``array`` columns are scanned
+    with ``itertools.compress``/``map`` so the loops still run in C.
+    ``derived`` columns are computed from other columns in the same batched
+    way (``discounted_price`` for equipment) instead of per displayed card.
+    """
+
+    def __init__(self, records, numeric=(), categorical=(), derived=None):
+        records = list(records)
+        self.records = records
+        self._rows = {record["id"]: row for row, record in enumerate(records)}
+        self.derived = derived or {}
+        self._codes = {name: {} for name in categorical}
+        columns = {"id": [record["id"] for record in records]}
+        for name in numeric:
+            columns[name] = [record[name] for record in records]
+        for name in categorical:
+            columns[name] = [self._code(name, record[name]) for record in records]
+        self._load(columns)
+
+    @classmethod
+    def from_columns(cls, columns, categorical=(), derived=None, records=None):
+        """Build straight from column lists (categorical ones as raw values); rows are returned as ``records``"""
+        table = cls.__new__(cls)
+        table.records = records if records is not None else list(columns["id"])
+        table._rows = {record_id: row for row, record_id in enumerate(columns["id"])}
+        table.derived = derived or {}
+        table._codes = {name: {} for name in categorical}
+        columns = dict(columns)
+        for name in categorical:
+            columns[name] = [table._code(name, value) for value in columns[name]]
+        table._load(columns)
+        return table
+
+    def _code(self, name, value):
+        codes = self._codes[name]
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(codes)
+        return code
+
+    def _load(self, columns):
+        self.columns = {}
+        for name, values in columns.items():
+            typecode = "q" if name == "id" or name in self._codes else "d"
+            if np is not None:
+                self.columns[name] = np.array(values, dtype=np.int64 if typecode == "q" else np.float64)
+            else:
+                self.columns[name] = array(typecode, values)
+        for name, (inputs, formula) in self.derived.items():
+            self.columns[name] = self._compute(inputs, formula)
+
+    def _compute(self, inputs, formula):
+        if np is not None:
+            return formula(*(self.columns[name] for name in inputs))
+        return array("d", map(formula, *(self.columns[name] for name in inputs)))
+
+    def update(self, record):
+        """Copy a changed record's values into its row"""
+        row = self._rows.get(record["id"])
+        if row is None:
+            return
+        for name, column in self.columns.items():
+            if name in self._codes:
+                column[row] = self._code(name, record[name])
+            elif name != "id" and name not in self.derived:
+                column[row] = record[name]
+        for name, (inputs, formula) in self.derived.items():
+            self.columns[name][row] = formula(*(self.columns[column][row] for column in inputs))
+
+    def value(self, record_id, name):
+        return self.columns[name][self._rows[record_id]]
+
+    def _sort_column(self, sort, descending):
+        column = self.columns[sort]
+        if np is not None:
+            return -column if descending else column
+        return array("d", map(operator.neg, column)) if descending else column
+
+    def select(self, equals=None, ranges=None, sort="id", descending=False, after=None, limit=PAGE_SIZE):
+        """Return ``(records, cursor, total)`` for the rows matching every predicate.
+
+        ``equals`` maps categorical columns to a value and ``ranges`` maps
+        numeric columns to inclusive ``(low, high)`` bounds (None for open).
+        Rows are ordered by ``sort`` then id; the cursor is the
+        ``(sort value, id)`` of the last row returned, as in ``SortedIndex``.
+        """
+        key = self._sort_column(sort, descending)
+        ids = self.columns["id"]
+        predicates = []
+        for name, value in (equals or {}).items():
+            code = self._codes[name].get(value)
+            if code is None:
+                return [], None, 0
+            predicates.append((self.columns[name], operator.eq, code))
+        for name, (low, high) in (ranges or {}).items():
+            if low is not None:
+                predicates.append((self.columns[name], operator.ge, low))
+            if high is not None:
+                predicates.append((self.columns[name], operator.le, high))
+
+        if np is not None:
+            mask = np.ones(len(ids), dtype=bool)
+            for column, compare, value in predicates:
+                mask &= compare(column, value)
+            total = int(mask.sum())
+            if after is not None:
+                mask &= (key > after[0]) | ((key == after[0]) & (ids > after[1]))
+            rows = np.flatnonzero(mask)
+            if len(rows) > limit + 1:
+                # Keep the limit + 1 smallest keys, plus anything tied with the last of them
+                threshold = key[rows[np.argpartition(key[rows], limit)[limit]]]
+                rows = rows[key[rows] <= threshold]
+            rows = rows[np.lexsort((ids[rows], key[rows]))][:limit + 1].tolist()
+        else:
+            rows = range(len(ids))
+            for column, compare, value in predicates:
+                values = column if isinstance(rows, range) else map(column.__getitem__, rows)
+                rows = list(itertools.compress(rows, map(compare, values, itertools.repeat(value))))
+            total = len(rows)
+            if after is not None:
+                rows = [row for row in rows if (key[row], ids[row]) > after]
+            rows = heapq.nsmallest(limit + 1, rows, key=lambda row: (key[row], ids[row]))
+
+        cursor = None
+        if len(rows) > limit:
+            last = rows[limit - 1]
+            cursor = (float(key[last]), int(ids[last]))
+        return [self.records[row] for row in rows[:limit]], cursor, total
+
+    def __len__(self):
+        return len(self.records)
+
+
+class Catalog:
+    """Academies, courses, webinars, equipment, articles and testimonials read from JSON on first use.
+
+    Each section is a file in ``directory`` that is parsed into records the
+    first time ``section(name)`` is called, so the login screen does not wait
+    on catalog size and pages only pay for the sections they show.
+    """
+
+    SECTIONS = ("academies", "courses", "webinars", "equipment", "articles", "testimonials", "cities")
+
+    def __init__(self, directory=CATALOG_DIR):
+        self.directory = directory
+        self._sections = {}
+        self._academy_index = None
+        self._search_index = None
+        self._fuzzy_index = None
+        self._geo_index = None
+        self._facet_index = None
+        self._sorted = {}
+        self._columns = {}
+        # Called as listener(kind, groups) after records of ``kind`` in those groups change
+        self.listeners = []
+
+    def section(self, name):
+        data = self._sections.get(name)
+        if data is None:
+            with open(os.path.join(self.directory, f"{name}.json"), 'r', encoding='utf-8') as f:
+                data = self._sections[name] = getattr(self, f"_build_{name}")(json.load(f))
+        return data
+
+    def is_loaded(self, name):
+        return name in self._sections
+
+    @property
+    def academy_index(self):
+        """Sport/state/city index over the academies section, built on first use"""
+        if self._academy_index is None:
+            index = AcademyIndex()
+            for sport, by_state in self.section("academies").items():
+                for state, academies in by_state.items():
+                    for academy in academies:
+                        index.add(academy, sport, state)
+            self._academy_index = index
+        return self._academy_index
+
+    @property
+    def geo_index(self):
+        """Spatial grid over academy coordinates, built on first use"""
+        if self._geo_index is None:
+            index = GeoIndex()
+            for academy in self.academy_index.lookup():
+                if academy.get("lat") is not None:
+                    index.add(academy["id"], academy["lat"], academy["lon"], academy)
+            self._geo_index = index
+        return self._geo_index
+
+    # Sort options per section, best first; descending orders negate the value
+    SORTS = {
+        "academies": {
+            "Rating": lambda academy: -academy["rating"],
+            "Fee": lambda academy: academy.monthly_fee if academy.monthly_fee is not None else math.inf,
+            "Established": lambda academy: -academy["established"],
+        },
+        "courses": {
+            "Rating": lambda course: -course["rating"],
+            "Price": lambda course: course["price"],
+            "Students": lambda course: -course["students"],
+        },
+        "equipment": {
+            "Rating": lambda item: -item["rating"],
+            "Price": discounted_price,
+        },
+        "webinars": {
+            "Date": lambda webinar: webinar.starts_at,
+        },
+    }
+
+    @staticmethod
+    def _sort_groups(section, record):
+        """Groups a course, equipment item or webinar is listed under; None stands for "all" """
+        if section == "equipment":
+            return record["category"], None
+        if section == "webinars":
+            # Webinars without a readable date cannot be placed on the calendar
+            return (None,) if record.starts_at is not None else ()
+        tiers = (None, "standard") if record["price"] <= FREE_TIER_MAX_COURSE_PRICE else (None,)
+        return [(sport, tier) for sport in (record["sport"], None) for tier in tiers]
+
+    # Columnar mirrors: numeric and categorical columns, derived columns, and sort label -> (column, descending)
+    COLUMNS = {
+        "courses": {
+            "numeric": ("price", "rating", "students"),
+            "categorical": ("sport",),
+            "derived": {},
+            "sorts": {"Rating": ("rating", True), "Price": ("price", False), "Students": ("students", True)},
+        },
+        "equipment": {
+            "numeric": ("price", "discount", "rating", "stock"),
+            "categorical": ("category",),
+            "derived": {"discounted_price": (("price", "discount"), lambda price, discount:
+                                             price * (100 - discount) / 100)},
+            "sorts": {"Rating": ("rating", True), "Price": ("discounted_price", False)},
+        },
+    }
+
+    def columns(self, section):
+        """Columnar mirror of the courses or equipment section, built on first use"""
+        table = self._columns.get(section)
+        if table is None:
+            spec = self.COLUMNS[section]
+            table = self._columns[section] = ColumnarTable(
+                self.section(section).values(), spec["numeric"], spec["categorical"], spec["derived"])
+        return table
+
+    def webinars_between(self, start=None, end=None):
+        """Webinars starting in ``[start, end)``, soonest first, found by bisecting the date index"""
+        return self.sorted_index("webinars", "Date").range(None, start, end)
+
+    def page(self, section, sort, equals=None, ranges=None, after=None, limit=PAGE_SIZE):
+        """One sorted page of courses or equipment as ``(records, cursor, total)``.
+
+        A plain sport or category listing (with the non-premium price cap
+        for courses) is read from the presorted index; any other mix of
+        predicates is evaluated over the columnar mirror.
+        """
+        equals, ranges = equals or {}, ranges or {}
+        group_field = self.COLUMNS[section]["categorical"][0]
+        price_cap = {"price": (None, FREE_TIER_MAX_COURSE_PRICE)}
+        if set(equals) <= {group_field} and (not ranges or (section == "courses" and ranges == price_cap)):
+            group = equals.get(group_field)
+            if section == "courses":
+                group = (group, "standard" if ranges else None)
+            index = self.sorted_index(section, sort)
+            records, cursor = index.page(group, after=after, limit=limit)
+            return records, cursor, index.count(group)
+        column, descending = self.COLUMNS[section]["sorts"][sort]
+        return self.columns(section).select(equals, ranges, column, descending, after, limit)
+
+    def sorted_index(self, section, sort):
+        """Courses, equipment or webinars presorted by one of ``SORTS[section]``, built on first use"""
+        index = self._sorted.get((section, sort))
+        if index is None:
+            index = SortedIndex(self.SORTS[section][sort], lambda record: self._sort_groups(section, record))
+            for record in self.section(section).values():
+                index.add(record)
+            self._sorted[section, sort] = index
+        return index
+
+    @property
+    def facet_index(self):
+        """Bitmap facets over academies (sport, state, fee band, rating, facilities, batches), built on first use"""
+        if self._facet_index is None:
+            index = FacetIndex(conjunctive=("facility", "batch"))
+            for academy in self.academy_index.lookup():
+                index.add(academy["id"], academy, *self._academy_facets(academy))
+            self._facet_index = index
+        return self._facet_index
+
+    def _academy_facets(self, academy):
+        sport, state, _ = self.academy_index.location(academy)
+        monthly_fee = getattr(academy, "monthly_fee", None)
+        facets = {
+            "sport": [sport],
+            "state": [state],
+            "fee": [label for low, high, label in FEE_BANDS if monthly_fee is not None
+                    and (low is None or monthly_fee >= low) and (high is None or monthly_fee < high)],
+            "rating": [level for level in RATING_LEVELS if academy["rating"] >= level],
+            "facility": sorted(getattr(academy, "facility_tags", ())),
+            "batch": batches(getattr(academy, "sessions", ())),
+        }
+        return facets, {"monthly_fee": monthly_fee, "rating": academy["rating"]}
+
+    def city_location(self, city):
+        """``(lat, lon)`` of a city centre, or None if it is not known"""
+        return self.section("cities").get(city)
+
+    def academies_near(self, lat, lon, radius_km=None, sport=None, k=5):
+        """``(distance_km, academy)`` pairs for ``sport`` (None for all), nearest first.
+
+        With ``radius_km`` every academy inside the circle is returned,
+        otherwise the ``k`` closest ones.
+        """
+        index = self.academy_index
+        accept = None if sport is None else (lambda academy: index.location(academy)[0] == sport)
+        if radius_km is not None:
+            return self.geo_index.within(lat, lon, radius_km, accept)
+        return self.geo_index.nearest(lat, lon, k, accept)
+
+    @property
+    def search_index(self):
+        """Full-text index over academies, courses, webinars and equipment, built on first use"""
+        if self._search_index is None:
+            index = SearchIndex()
+            for academy in self.academy_index.lookup():
+                index.add(("academy", academy["id"]), *self._document_texts("academy", academy))
+            for kind, section in self.SEARCHABLE.items():
+                if kind == "academy":
+                    continue
+                for record in self.section(section).values():
+                    index.add((kind, record["id"]), *self._document_texts(kind, record))
+            self._search_index = index
+        return self._search_index
+
+    # Search result kind -> catalog section
+    SEARCHABLE = {"academy": "academies", "course": "courses", "webinar": "webinars", "equipment": "equipment"}
+
+    @property
+    def fuzzy_index(self):
+        """Typo-tolerant index over academy names, coaches and instructors, built on first use"""
+        if self._fuzzy_index is None:
+            index = FuzzyIndex()
+            for academy in self.academy_index.lookup():
+                index.add(("academy", academy["id"]), *self._fuzzy_names("academy", academy))
+            for kind in ("course", "webinar"):
+                for record in self.section(self.SEARCHABLE[kind]).values():
+                    index.add((kind, record["id"]), *self._fuzzy_names(kind, record))
+            self._fuzzy_index = index
+        return self._fuzzy_index
+
+    @staticmethod
+    def _fuzzy_names(kind, record):
+        if kind == "academy":
+            return record["name"], record["coach"]
+        if kind in ("course", "webinar"):
+            return (record["instructor"],)
+        return ()
+
+    def _document_texts(self, kind, record):
+        """Text fields indexed for a record; titles are repeated to weight them higher"""
+        if kind == "academy":
+            sport, state, city = self.academy_index.location(record)
+            return (record["name"], record["name"], record["coach"], " ".join(record["facilities"]),
+                    record["address"], city or "", sport, state)
+        if kind == "course":
+            return (record["title"], record["title"], record["description"], " ".join(record["modules"]),
+                    record["sport"], record["instructor"])
+        if kind == "webinar":
+            return record["title"], record["title"], record["description"], record["instructor"]
+        return record["name"], record["name"], record["description"], record["category"]
+
+    def document(self, kind, doc_id):
+        """Return the record behind a search result key"""
+        if kind == "academy":
+            return self.academy_index.resolve(doc_id)[3]
+        return self.section(self.SEARCHABLE[kind])[doc_id]
+
+    def _group(self, kind, record):
+        """The group query results over ``kind`` are partitioned by (sport or category)"""
+        if kind == "equipment":
+            return record["category"]
+        if kind == "course":
+            return record["sport"]
+        if kind == "academy":
+            return self.academy_index.location(record)[0]
+        return None
+
+    def _notify(self, kind, *groups):
+        for listener in self.listeners:
+            listener(kind, set(groups))
+
+    def update_record(self, kind, record, fields):
+        """Change a course, webinar or equipment record (e.g. seats or stock) and refresh everything built on it"""
+        old_group = self._group(kind, record)
+        record.update(fields)
+        self.reindex(kind, record)
+        self._notify(kind, old_group, self._group(kind, record))
+
+    def reindex(self, kind, record):
+        """Refresh a record's search entry after it changed"""
+        if self._search_index is not None:
+            self._search_index.add((kind, record["id"]), *self._document_texts(kind, record))
+        if self._fuzzy_index is not None:
+            self._fuzzy_index.add((kind, record["id"]), *self._fuzzy_names(kind, record))
+        for (section, _), index in self._sorted.items():
+            if section == self.SEARCHABLE[kind]:
+                index.add(record)
+        if self.SEARCHABLE[kind] in self._columns:
+            self._columns[self.SEARCHABLE[kind]].update(record)
+
+    def add_academy(self, academy, sport, state):
+        if "id" not in academy:
+            academy["id"] = self.academy_index.next_id()
+        self.section("academies").setdefault(sport, {}).setdefault(state, []).append(academy)
+        self.academy_index.add(academy, sport, state)
+        self.reindex("academy", academy)
+        if self._geo_index is not None and academy.get("lat") is not None:
+            self._geo_index.add(academy["id"], academy["lat"], academy["lon"], academy)
+        if self._facet_index is not None:
+            self._facet_index.add(academy["id"], academy, *self._academy_facets(academy))
+        self._notify("academy", sport)
+
+    def remove_academy(self, academy):
+        sport, state, _ = self.academy_index.location(academy)
+        self.section("academies")[sport][state].remove(academy)
+        self._academy_index.remove(academy)
+        if self._search_index is not None:
+            self._search_index.remove(("academy", academy["id"]))
+        if self._fuzzy_index is not None:
+            self._fuzzy_index.remove(("academy", academy["id"]))
+        if self._geo_index is not None:
+            self._geo_index.remove(academy["id"])
+        if self._facet_index is not None:
+            self._facet_index.remove(academy["id"])
+        self._notify("academy", sport)
+
+    @staticmethod
+    def _build_academies(data):
+        return {sport: {state: [Academy.from_dict(academy) for academy in academies]
+                        for state, academies in by_state.items()}
+                for sport, by_state in data.items()}
+
+    @staticmethod
+    def _build_courses(data):
+        return {course["id"]: Course.from_dict(course) for course in data}
+
+    @staticmethod
+    def _build_webinars(data):
+        return {webinar["id"]: Webinar.from_dict(webinar) for webinar in data}
+
+    @staticmethod
+    def _build_equipment(data):
+        return {item["id"]: EquipmentItem.from_dict(item) for item in data}
+
+    @staticmethod
+    def _build_articles(data):
+        return data
+
+    @staticmethod
+    def _build_cities(data):
+        return {city: (point["lat"], point["lon"]) for city, point in data.items()}
+
+    @staticmethod
+    def _build_testimonials(data):
+        return data
+
+
+class JournaledUserStore:
+    """User accounts kept in memory as ``UserRecord``s, persisted as a JSON snapshot plus an append-only journal.
+
+    Every mutation is appended to the journal as one small JSON line, so the
+    cost of a write tracks the size of the change. Once the journal grows past
+    ``compact_after`` records it is folded into a fresh snapshot on a
+    background thread.
+    """
+
+    def __init__(self, snapshot_path=USERS_FILE, journal_path=None, compact_after=5000):
+        self.snapshot_path = snapshot_path
+        self.journal_path = journal_path or os.path.splitext(snapshot_path)[0] + ".journal"
+        self.compacting_path = self.journal_path + ".compacting"
+        self.compact_after = compact_after
+
+        self._lock = threading.Lock()
+        self._users = {}
+        self._emails = {}
+        self._journal_records = 0
+        self._compactor = None
+
+        self._load()
+        if os.path.exists(self.compacting_path):
+            # Finish the interrupted compaction before the journal is rotated again
+            self._write_snapshot(dict(self._users))
+        self._journal = open(self.journal_path, 'a', encoding='utf-8')
+
+    @staticmethod
+    def exists(snapshot_path=USERS_FILE):
+        """Whether a snapshot or journal has been written at ``snapshot_path``"""
+        journal_path = os.path.splitext(snapshot_path)[0] + ".journal"
+        return os.path.exists(snapshot_path) or os.path.exists(journal_path)
+
+    def _load(self):
+        """Read the snapshot and replay any journals written after it"""
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, 'r', encoding='utf-8') as f:
+                self._users = {username: UserRecord.from_dict(record) for username, record in json.load(f).items()}
+        for username, record in self._users.items():
+            if "bookings" not in record:
+                record.bookings = []
+            if record.get("email"):
+                self._emails[record["email"]] = username
+
+        # A leftover .compacting file means the process stopped mid-compaction.
+        # Replaying it is safe because every journal operation is idempotent.
+        for path in (self.compacting_path, self.journal_path):
+            if not os.path.exists(path):
+                continue
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # Torn final line from an interrupted append
+                        break
+                    self._apply_entry(entry)
+                    if path == self.journal_path:
+                        self._journal_records += 1
+
+    def _apply_entry(self, entry):
+        """Apply one journal entry to the in-memory state.
+
+        Records are replaced rather than mutated so that a shallow copy of
+        ``self._users`` is a consistent point-in-time view for compaction.
+        """
+        op = entry["op"]
+        username = entry["user"]
+        old = self._users.get(username)
+        if op == "create":
+            record = UserRecord.from_dict(entry["data"])
+            if "bookings" not in record:
+                record.bookings = []
+        elif op == "update":
+            record = old.copy()
+            record.update(entry["data"])
+        elif op == "booking":
+            if len(old.bookings) != entry["index"]:
+                # Already applied (replay after an interrupted compaction)
+                return
+            record = old.copy()
+            record.bookings = old.bookings + [BookingRecord.from_dict(entry["data"])]
+        else:
+            raise ValueError(f"Unknown journal operation: {op}")
+
+        old_email = old.get("email") if old is not None else None
+        if old_email and old_email != record.get("email"):
+            self._emails.pop(old_email, None)
+        if record.get("email"):
+            self._emails[record["email"]] = username
+        self._users[username] = record
+
+    def apply(self, ops):
+        """Apply a batch of ``(op, username, data)`` operations with a single fsync"""
+        ops = list(ops)
+        with self._lock:
+            # Check the whole batch first so a bad operation leaves memory and journal untouched
+            created = set()
+            for op, username, _ in ops:
+                if op == "create":
+                    created.add(username)
+                elif op in ("update", "booking") and username not in self._users and username not in created:
+                    raise KeyError(username)
+            lines = []
+            for op, username, data in ops:
+                entry = {"op": op, "user": username, "data": data}
+                if op == "booking":
+                    entry["index"] = len(self._users[username].bookings)
+                self._apply_entry(entry)
+                lines.append(json.dumps(entry, ensure_ascii=False) + "\n")
+
+            self._journal.write("".join(lines))
+            self._journal.flush()
+            os.fsync(self._journal.fileno())
+            self._journal_records += len(lines)
+
+            if self._journal_records >= self.compact_after and self._compactor is None:
+                self._start_compaction()
+
+    def _start_compaction(self):
+        """Rotate the journal and write a new snapshot in the background (lock held)"""
+        self._journal.close()
+        os.replace(self.journal_path, self.compacting_path)
+        self._journal = open(self.journal_path, 'a', encoding='utf-8')
+        self._journal_records = 0
+
+        users = dict(self._users)
+        self._compactor = threading.Thread(target=self._write_snapshot, args=(users,), daemon=True)
+        self._compactor.start()
+
+    def _write_snapshot(self, users):
+        # If this fails the compactor stays set, so the .compacting journal is
+        # never overwritten by a later rotation and is replayed on next start.
+        tmp_path = self.snapshot_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            # Written one user at a time to avoid a second full copy in memory
+            f.write("{")
+            for i, (username, record) in enumerate(users.items()):
+                f.write(",\n" if i else "\n")
+                f.write(json.dumps(username, ensure_ascii=False) + ": ")
+                f.write(json.dumps(record.to_dict(), ensure_ascii=False))
+            f.write("\n}\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.snapshot_path)
+        os.remove(self.compacting_path)
+        with self._lock:
+            self._compactor = None
+
+    def compact(self):
+        """Fold the journal into the snapshot and wait for it to finish"""
+        with self._lock:
+            if self._compactor is None and self._journal_records:
+                self._start_compaction()
+            compactor = self._compactor
+        if compactor is not None:
+            compactor.join()
+
+    def close(self):
+        compactor = self._compactor
+        if compactor is not None:
+            compactor.join()
+        with self._lock:
+            self._journal.close()
+
+    def is_empty(self):
+        return not self._users
+
+    def __contains__(self, username):
+        return username in self._users
+
+    def get(self, username):
+        """Return a copy of the user's record, or None"""
+        record = self._users.get(username)
+        if record is None:
+            return None
+        return record.to_dict()
+
+    def find_by_email(self, email):
+        """Return the username registered with ``email``, or None"""
+        return self._emails.get(email)
+
+    def iter_users(self):
+        """Yield ``(username, record)`` for every account"""
+        for username in list(self._users):
+            yield username, self.get(username)
+
+    def create(self, username, record):
+        self.apply([("create", username, record)])
+
+    def update(self, username, fields):
+        self.apply([("update", username, fields)])
+
+    def add_booking(self, username, booking):
+        self.apply([("booking", username, booking)])
+
+
+class SQLiteUserStore:
+    """User accounts and bookings stored in SQLite with indexed username and email lookups.
+
+    Frequently queried fields get their own columns; anything else on the
+    record is kept in a JSON ``extra`` column so new fields need no migration.
+    """
+
+    USER_COLUMNS = ("email", "password", "full_name", "phone", "type", "premium", "joined", "last_login")
+    BOOKING_COLUMNS = ("type", "name", "sport", "date", "status")
+    # Columns are nullable so a field the record never had reads back as absent
+    USERS_TABLE = """
+        CREATE TABLE IF NOT EXISTS {name} (
+            username TEXT PRIMARY KEY,
+            email TEXT,
+            password TEXT,
+            full_name TEXT,
+            phone TEXT,
+            type TEXT,
+            premium INTEGER,
+            joined TEXT,
+            last_login TEXT,
+            extra TEXT NOT NULL DEFAULT '{{}}'
+        );
+    """
+
+    def __init__(self, path=USERS_DB_FILE, legacy_path=USERS_FILE):
+        self.path = path
+        is_new = not os.path.exists(path)
+
+        # The write-behind layer flushes from a worker thread, so the
+        # connection is shared and serialised with a lock.
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(self.USERS_TABLE.format(name="users") + """
+            CREATE INDEX IF NOT EXISTS users_email ON users (email);
+            CREATE TABLE IF NOT EXISTS bookings (
+                id INTEGER PRIMARY KEY,
+                username TEXT NOT NULL REFERENCES users (username),
+                position INTEGER NOT NULL,
+                type TEXT,
+                name TEXT,
+                sport TEXT,
+                date TEXT,
+                status TEXT,
+                extra TEXT NOT NULL DEFAULT '{}'
+            );
+            CREATE UNIQUE INDEX IF NOT EXISTS bookings_user_position ON bookings (username, position);
+        """)
+        premium = self._conn.execute("SELECT \"notnull\" FROM pragma_table_info('users') WHERE name = 'premium'")
+        if premium.fetchone()[0]:
+            self._make_premium_nullable()
+
+        if is_new and legacy_path and JournaledUserStore.exists(legacy_path):
+            self.migrate_from(JournaledUserStore(legacy_path))
+
+    def _make_premium_nullable(self):
+        """Rebuild a users table created when ``premium`` was NOT NULL DEFAULT 0"""
+        self._conn.executescript(self.USERS_TABLE.format(name="users_new") + """
+            BEGIN;
+            INSERT INTO users_new SELECT username, email, password, full_name, phone, type, premium, joined,
+                last_login, extra FROM users;
+            DROP TABLE users;
+            ALTER TABLE users_new RENAME TO users;
+            CREATE INDEX users_email ON users (email);
+            COMMIT;
+        """)
+
+    def migrate_from(self, store):
+        """One-time import of every account from another store"""
+        self.apply(("create", username, record) for username, record in store.iter_users())
+        store.close()
+
+    @staticmethod
+    def _split(record, columns):
+        values = [record.get(column) for column in columns]
+        extra = {key: value for key, value in record.items() if key not in columns and key != "bookings"}
+        return values, json.dumps(extra, ensure_ascii=False)
+
+    def _insert_booking(self, username, position, booking):
+        values, extra = self._split(booking, self.BOOKING_COLUMNS)
+        self._conn.execute(
+            "INSERT INTO bookings (username, position, type, name, sport, date, status, extra) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)", [username, position, *values, extra])
+
+    def apply(self, ops):
+        """Apply a batch of ``(op, username, data)`` operations in one transaction"""
+        with self._lock, self._conn:
+            for op, username, data in ops:
+                if op == "create":
+                    values, extra = self._split(data, self.USER_COLUMNS)
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO users (username, email, password, full_name, phone, type, premium, "
+                        "joined, last_login, extra) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        [username, *values, extra])
+                    self._conn.execute("DELETE FROM bookings WHERE username = ?", (username,))
+                    for position, booking in enumerate(data.get("bookings", [])):
+                        self._insert_booking(username, position, booking)
+                elif op == "update":
+                    row = self._conn.execute("SELECT extra FROM users WHERE username = ?", (username,)).fetchone()
+                    if row is None:
+                        raise KeyError(username)
+                    columns = [key for key in data if key in self.USER_COLUMNS]
+                    if columns:
+                        assignments = ", ".join(f"{column} = ?" for column in columns)
+                        self._conn.execute(f"UPDATE users SET {assignments} WHERE username = ?",
+                                           [data[column] for column in columns] + [username])
+                    extra = {key: value for key, value in data.items() if key not in self.USER_COLUMNS}
+                    if extra:
+                        merged = {**json.loads(row[0]), **extra}
+                        self._conn.execute("UPDATE users SET extra = ? WHERE username = ?",
+                                           (json.dumps(merged, ensure_ascii=False), username))
+                elif op == "booking":
+                    if self._conn.execute("SELECT 1 FROM users WHERE username = ?", (username,)).fetchone() is None:
+                        raise KeyError(username)
+                    row = self._conn.execute("SELECT COALESCE(MAX(position) + 1, 0) FROM bookings WHERE username = ?",
+                                             (username,)).fetchone()
+                    self._insert_booking(username, row[0], data)
+                else:
+                    raise ValueError(f"Unknown store operation: {op}")
+
+    def compact(self):
+        with self._lock:
+            self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def is_empty(self):
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM users LIMIT 1").fetchone() is None
+
+    def __contains__(self, username):
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM users WHERE username = ?", (username,)).fetchone() is not None
+
+    def _row_to_record(self, row, columns):
+        record = dict(zip(columns, row[:len(columns)]))
+        record.update(json.loads(row[len(columns)]))
+        return record
+
+    def get(self, username):
+        """Return the user's record with its bookings, or None"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT email, password, full_name, phone, type, premium, joined, last_login, extra "
+                "FROM users WHERE username = ?", (username,)).fetchone()
+            if row is None:
+                return None
+            bookings = self._conn.execute(
+                "SELECT type, name, sport, date, status, extra FROM bookings WHERE username = ? ORDER BY position",
+                (username,)).fetchall()
+
+        record = self._row_to_record(row, self.USER_COLUMNS)
+        if record["premium"] is not None:
+            record["premium"] = bool(record["premium"])
+        record["bookings"] = [self._strip_none(self._row_to_record(b, self.BOOKING_COLUMNS)) for b in bookings]
+        return self._strip_none(record)
+
+    @staticmethod
+    def _strip_none(record):
+        # Columns the original record never had come back as NULL
+        return {key: value for key, value in record.items() if value is not None}
+
+    def find_by_email(self, email):
+        """Return the username registered with ``email``, or None"""
+        with self._lock:
+            row = self._conn.execute("SELECT username FROM users WHERE email = ? LIMIT 1", (email,)).fetchone()
+        return row[0] if row else None
+
+    def iter_users(self, page_size=1000):
+        """Yield ``(username, record)`` for every account, reading usernames a page at a time"""
+        last = ""
+        while True:
+            with self._lock:
+                usernames = [row[0] for row in self._conn.execute(
+                    "SELECT username FROM users WHERE username > ? ORDER BY username LIMIT ?", (last, page_size))]
+            for username in usernames:
+                yield username, self.get(username)
+            if len(usernames) < page_size:
+                return
+            last = usernames[-1]
+
+    def create(self, username, record):
+        self.apply([("create", username, record)])
+
+    def update(self, username, fields):
+        self.apply([("update", username, fields)])
+
+    def add_booking(self, username, booking):
+        self.apply([("booking", username, booking)])
+
+
+class ShardedUserStore:
+    """User accounts spread over hash-bucketed JSON files that are read on demand.
+
+    ``index.json`` holds only the shard count and number of accounts, so
+    opening the store costs the same however many accounts exist. Each
+    account lives in the ``users-NNNN.json`` shard picked by a hash of its
+    username, and each email in an ``emails-NNNN.json`` shard mapping it back
+    to the username. Recently used shards are kept in a small LRU cache.
+    A batch writes every shard it touched to a temporary file before
+    renaming any of them into place, so a failed write leaves the store as
+    it was.
+    """
+
+    def __init__(self, directory=USERS_SHARD_DIR, shards=1024, cache_size=64):
+        self.directory = directory
+        self.cache_size = cache_size
+        self._lock = threading.Lock()
+        self._cache = OrderedDict()
+
+        self.index_path = os.path.join(directory, "index.json")
+        if os.path.exists(self.index_path):
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                self._index = json.load(f)
+        else:
+            os.makedirs(directory, exist_ok=True)
+            self._index = {"shards": shards, "count": 0}
+            self._migrate_legacy()
+            self._write_json(self.index_path, self._index)
+
+    def _migrate_legacy(self):
+        """One-time import from the SQLite database or users.json beside the shard directory, whichever exists"""
+        base = os.path.dirname(os.path.abspath(self.directory))
+        db_path, users_path = os.path.join(base, USERS_DB_FILE), os.path.join(base, USERS_FILE)
+        if os.path.exists(db_path):
+            legacy = SQLiteUserStore(db_path, legacy_path=None)
+        elif JournaledUserStore.exists(users_path):
+            legacy = JournaledUserStore(users_path)
+        else:
+            return
+        batch = []
+        for username, record in legacy.iter_users():
+            batch.append(("create", username, record))
+            if len(batch) >= 10000:
+                self.apply(batch)
+                batch = []
+        self.apply(batch)
+        legacy.close()
+
+    @staticmethod
+    def _stage_json(path, data):
+        """Write ``data`` durably next to ``path`` and return the temporary file's path"""
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        return tmp_path
+
+    @classmethod
+    def _write_json(cls, path, data):
+        os.replace(cls._stage_json(path, data), path)
+
+    def _shard_path(self, kind, key):
+        number = zlib.crc32(key.encode('utf-8')) % self._index["shards"]
+        return os.path.join(self.directory, f"{kind}-{number:04d}.json")
+
+    def _load_shard(self, path):
+        """Return the shard dict at ``path``, reading it on a cache miss (lock held)"""
+        shard = self._cache.get(path)
+        if shard is not None:
+            self._cache.move_to_end(path)
+            return shard
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                shard = json.load(f)
+        else:
+            shard = {}
+        self._cache[path] = shard
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return shard
+
+    def apply(self, ops):
+        """Apply a batch of ``(op, username, data)`` operations, writing each touched shard once"""
+        with self._lock:
+            touched = {}
+            created = 0
+            try:
+                for op, username, data in ops:
+                    path = self._shard_path("users", username)
+                    shard = self._touch(touched, path)
+                    old = shard.get(username)
+                    if op in ("update", "booking") and old is None:
+                        raise KeyError(username)
+                    if op == "create":
+                        record = dict(data)
+                        record.setdefault("bookings", [])
+                        created += old is None
+                    elif op == "update":
+                        record = {**old, **data}
+                    elif op == "booking":
+                        record = {**old, "bookings": old["bookings"] + [data]}
+                    else:
+                        raise ValueError(f"Unknown store operation: {op}")
+                    shard[username] = record
+
+                    old_email = old.get("email") if old else None
+                    if old_email and old_email != record.get("email"):
+                        email_path = self._shard_path("emails", old_email)
+                        self._touch(touched, email_path).pop(old_email, None)
+                    if record.get("email") and record["email"] != old_email:
+                        email_path = self._shard_path("emails", record["email"])
+                        self._touch(touched, email_path)[record["email"]] = username
+
+                files = dict(touched)
+                if created:
+                    files[self.index_path] = {**self._index, "count": self._index["count"] + created}
+                staged = []
+                try:
+                    for path, data in files.items():
+                        staged.append((self._stage_json(path, data), path))
+                except Exception:
+                    for tmp_path, _ in staged:
+                        os.remove(tmp_path)
+                    raise
+            except Exception:
+                # Cached shards may now differ from disk; reread them next time
+                for path in touched:
+                    self._cache.pop(path, None)
+                raise
+            for tmp_path, path in staged:
+                os.replace(tmp_path, path)
+            if created:
+                self._index = files[self.index_path]
+
+    def _touch(self, touched, path):
+        """Shard to modify in this batch; held here even if the LRU evicts it"""
+        shard = touched.get(path)
+        if shard is None:
+            shard = touched[path] = self._load_shard(path)
+        return shard
+
+    def compact(self):
+        pass
+
+    def close(self):
+        with self._lock:
+            self._cache.clear()
+
+    def is_empty(self):
+        return self._index["count"] == 0
+
+    def __contains__(self, username):
+        with self._lock:
+            return username in self._load_shard(self._shard_path("users", username))
+
+    def get(self, username):
+        """Return a copy of the user's record, or None"""
+        with self._lock:
+            record = self._load_shard(self._shard_path("users", username)).get(username)
+        if record is None:
+            return None
+        record = dict(record)
+        record["bookings"] = list(record["bookings"])
+        return record
+
+    def find_by_email(self, email):
+        """Return the username registered with ``email``, or None"""
+        with self._lock:
+            return self._load_shard(self._shard_path("emails", email)).get(email)
+
+    def iter_users(self):
+        """Yield ``(username, record)`` for every account, one shard at a time"""
+        for number in range(self._index["shards"]):
+            path = os.path.join(self.directory, f"users-{number:04d}.json")
+            if not os.path.exists(path):
+                continue
+            with open(path, 'r', encoding='utf-8') as f:
+                shard = json.load(f)
+            yield from sorted(shard.items())
+
+    def create(self, username, record):
+        self.apply([("create", username, record)])
+
+    def update(self, username, fields):
+        self.apply([("update", username, fields)])
+
+    def add_booking(self, username, booking):
+        self.apply([("booking", username, booking)])
+
+
+USER_STORE_BACKENDS = {
+    "journal": JournaledUserStore,
+    "sqlite": SQLiteUserStore,
+    "sharded": ShardedUserStore,
+}
+
+
+def open_user_store(backend=None):
+    """Open the user store selected by ``backend`` or the ACADINFO_USER_STORE environment variable"""
+    backend = backend or os.environ.get("ACADINFO_USER_STORE", "sharded")
+    if backend not in USER_STORE_BACKENDS:
+        raise ValueError(f"Unknown user store backend: {backend}")
+    return USER_STORE_BACKENDS[backend]()
+
+
+class WriteBehindUserStore:
+    """Buffers writes to another user store and flushes them in batches on a background thread.
+
+    Operations are queued and coalesced (repeated field updates to one user
+    collapse into a single update), then handed to the wrapped store's
+    ``apply`` as one batch every ``flush_interval`` seconds or as soon as
+    ``max_pending`` operations are waiting. Reads see queued writes.
+    """
+
+    def __init__(self, store, flush_interval=2.0, max_pending=50, on_error=None):
+        self.store = store
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.on_error = on_error
+
+        self._cond = threading.Condition()
+        self._pending = []
+        self._pending_updates = {}
+        self._first_pending_at = 0.0
+        self._inflight = []
+        self._flush_requested = False
+        self._failing = False
+        self._closed = False
+        # Held while a batch is written so reads never see it half applied
+        self._flush_lock = threading.Lock()
+
+        self._worker = threading.Thread(target=self._run, name="user-store-flush", daemon=True)
+        self._worker.start()
+
+    def apply(self, ops):
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("User store is closed")
+            if not self._pending:
+                self._first_pending_at = time.monotonic()
+                self._cond.notify_all()
+            for op, username, data in ops:
+                if op == "update" and username in self._pending_updates:
+                    self._pending_updates[username].update(data)
+                    continue
+                if op == "update":
+                    data = dict(data)
+                    self._pending_updates[username] = data
+                elif op == "create":
+                    self._pending_updates.pop(username, None)
+                self._pending.append((op, username, data))
+            if len(self._pending) >= self.max_pending:
+                self._cond.notify_all()
+
+    def _next_batch(self):
+        """Block until a batch is due; returns None once closed and drained (lock held)"""
+        while True:
+            if self._closed or self._flush_requested or len(self._pending) >= self.max_pending:
+                break
+            if self._pending:
+                # Give a burst of clicks time to accumulate into one batch
+                remaining = self._first_pending_at + self.flush_interval - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            else:
+                self._cond.wait()
+
+        if not self._pending:
+            self._flush_requested = False
+            self._cond.notify_all()
+            return None if self._closed else []
+
+        batch = self._inflight = self._pending
+        self._pending = []
+        self._pending_updates = {}
+        return batch
+
+    def _run(self):
+        while True:
+            with self._cond:
+                batch = self._next_batch()
+            if batch is None:
+                return
+            if not batch:
+                continue
+
+            with self._flush_lock:
+                try:
+                    self.store.apply(batch)
+                    error = None
+                except Exception as exc:
+                    error = exc
+                with self._cond:
+                    self._inflight = []
+                    if error is not None:
+                        # Keep the batch and retry it after another interval
+                        self._pending[:0] = batch
+                        for op, username, data in batch:
+                            if op == "update":
+                                self._pending_updates.setdefault(username, data)
+                        self._first_pending_at = time.monotonic()
+                    was_failing, self._failing = self._failing, error is not None
+                    self._flush_requested = False
+                    self._cond.notify_all()
+
+            # Report a failure once rather than on every retry
+            if error is not None and not was_failing and self.on_error is not None:
+                self.on_error(error)
+            if error is not None and self._closed:
+                return
+
+    def flush(self):
+        """Write everything queued so far and wait for it (gives up while writes are failing)"""
+        with self._cond:
+            self._flush_requested = True
+            self._cond.notify_all()
+            while (self._pending or self._inflight) and self._worker.is_alive() and not self._failing:
+                self._cond.wait(0.1)
+
+    def close(self):
+        """Flush outstanding writes, stop the worker and close the wrapped store"""
+        if self._closed:
+            return
+        self.flush()
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._worker.join()
+        self.store.close()
+
+    def compact(self):
+        self.flush()
+        self.store.compact()
+
+    def _queued_ops(self, username):
+        with self._cond:
+            return [op for op in self._inflight + self._pending if op[1] == username]
+
+    def get(self, username):
+        """Return the user's record with any queued writes applied, or None"""
+        with self._flush_lock:
+            record = self.store.get(username)
+            ops = self._queued_ops(username)
+        for op, _, data in ops:
+            if op == "create":
+                record = dict(data)
+                record["bookings"] = list(data.get("bookings", []))
+            elif op == "update" and record is not None:
+                record.update(data)
+            elif op == "booking" and record is not None:
+                record["bookings"].append(data)
+        return record
+
+    def __contains__(self, username):
+        return any(op == "create" for op, _, _ in self._queued_ops(username)) or username in self.store
+
+    def is_empty(self):
+        with self._cond:
+            if any(op == "create" for op, _, _ in self._inflight + self._pending):
+                return False
+        return self.store.is_empty()
+
+    def find_by_email(self, email):
+        with self._cond:
+            for op, username, data in reversed(self._inflight + self._pending):
+                if op in ("create", "update") and data.get("email") == email:
+                    return username
+        return self.store.find_by_email(email)
+
+    def iter_users(self):
+        self.flush()
+        return self.store.iter_users()
+
+    def create(self, username, record):
+        self.apply([("create", username, record)])
+
+    def update(self, username, fields):
+        self.apply([("update", username, fields)])
+
+    def add_booking(self, username, booking):
+        self.apply([("booking", username, booking)])
+
+
+class TkDispatcher:
+    """Runs callbacks posted from worker threads on the Tk main loop via ``root.after``"""
+
+    def __init__(self, root, poll_ms=50):
+        self.root = root
+        self.poll_ms = poll_ms
+        self._queue = queue.Queue()
+        self.root.after(self.poll_ms, self._poll)
+
+    def post(self, callback, *args):
+        """Queue ``callback(*args)`` to run on the Tk thread (safe from any thread)"""
+        self._queue.put((callback, args))
+
+    def _poll(self):
+        self.root.after(self.poll_ms, self._poll)
+        while True:
+            try:
+                callback, args = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            callback(*args)
+
+
+class ImageLoader:
+    """Card thumbnails decoded and resized on worker threads, cached on disk and as PhotoImages.
+
+    ``get(name, callback)`` runs on the Tk thread and returns a PhotoImage
+    straight away: the cached thumbnail, or a grey placeholder while the
+    image is read. Workers hash the source file's bytes, reuse the PNG
+    thumbnail saved under that hash in ``cache_dir`` or decode and shrink
+    the original to ``size``, and ``callback(name, photo)`` is then called
+    on the Tk thread. Missing or unreadable files keep the placeholder.
+    At most ``max_photos`` PhotoImages are kept, least recently used first
+    out; cards hold on to the ones they show.
+    """
+
+    def __init__(self, dispatcher, image_dir=IMAGE_DIR, cache_dir=THUMBNAIL_DIR, size=THUMBNAIL_SIZE,
+                 max_photos=THUMBNAIL_CACHE_SIZE, workers=2):
+        self.dispatcher = dispatcher
+        self.image_dir = image_dir
+        self.cache_dir = cache_dir
+        self.size = size
+        self.max_photos = max_photos
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="images")
+        self._photos = OrderedDict()
+        # name -> callbacks waiting for an image being read
+        self._waiting = {}
+        self._exists = {}
+        self._placeholder = None
+
+    @property
+    def placeholder(self):
+        if self._placeholder is None:
+            width, height = self.size
+            self._placeholder = tk.PhotoImage(width=width, height=height)
+            self._placeholder.put("#dddddd", to=(0, 0, width, height))
+        return self._placeholder
+
+    def exists(self, name):
+        """Whether ``name`` has a source file; each name is only checked once"""
+        if not name:
+            return False
+        found = self._exists.get(name)
+        if found is None:
+            found = self._exists[name] = os.path.isfile(os.path.join(self.image_dir, name))
+        return found
+
+    def get(self, name, callback):
+        if not name:
+            return self.placeholder
+        photo = self._photos.get(name)
+        if photo is not None:
+            self._photos.move_to_end(name)
+            return photo
+        if name not in self._waiting:
+            self._waiting[name] = []
+            future = self._pool.submit(self.thumbnail, name)
+            future.add_done_callback(lambda f: self.dispatcher.post(self._loaded, name, f))
+        self._waiting[name].append(callback)
+        return self.placeholder
+
+    def thumbnail(self, name):
+        """The thumbnail for ``name`` as a decoded PIL image, or None if there is no readable file (worker thread)"""
+        try:
+            with open(os.path.join(self.image_dir, name), 'rb') as f:
+                data = f.read()
+        except OSError:
+            return None
+        width, height = self.size
+        cache_path = os.path.join(self.cache_dir, f"{hashlib.sha256(data).hexdigest()}-{width}x{height}.png")
+        try:
+            image = Image.open(cache_path)
+            image.load()
+            return image
+        except OSError:
+            pass
+        try:
+            image = Image.open(io.BytesIO(data))
+            image.draft("RGB", self.size)  # Lets JPEG decode at a reduced scale
+            image = image.convert("RGBA")
+        except OSError:
+            return None
+        image.thumbnail(self.size)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = f"{cache_path}.{threading.get_ident()}.tmp"
+            image.save(tmp_path, "PNG")
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            pass  # The cache is an optimisation; the image is still shown
+        return image
+
+    def _loaded(self, name, future):
+        # A file PIL cannot handle shows the placeholder like a missing one
+        image = future.result() if future.exception() is None else None
+        photo = ImageTk.PhotoImage(image) if image is not None else self.placeholder
+        self._photos[name] = photo
+        while len(self._photos) > self.max_photos:
+            self._photos.popitem(last=False)
+        for callback in self._waiting.pop(name, []):
+            callback(name, photo)
+
+    def close(self):
+        self._pool.shutdown(wait=False)
+
+
+class WidgetPool:
+    """Recycles widgets made by ``factory`` instead of destroying and rebuilding them.
+
+    ``created`` and ``reused`` count how often ``acquire`` had to build a
+    new widget versus handing back a released one.
+    """
+
+    def __init__(self, factory):
+        self.factory = factory
+        self._free = []
+        self.created = 0
+        self.reused = 0
+
+    def acquire(self):
+        if self._free:
+            self.reused += 1
+            return self._free.pop()
+        self.created += 1
+        return self.factory()
+
+    def release(self, widget):
+        self._free.append(widget)
+
+    def stats(self):
+        return {"created": self.created, "reused": self.reused, "free": len(self._free)}
+
+
+class AcademyCard:
+    """Academy search result card; widgets are built once and ``bind`` points them at a record"""
+
+    PACK = {"fill": tk.X, "pady": 5}
+
+    def __init__(self, parent, app):
+        self.app = app
+        self.record = None
+        self.frame = ttk.Frame(parent, style='Card.TFrame', padding=10)
+
+        # Academy info
+        info_frame = ttk.Frame(self.frame)
+        info_frame.pack(side=tk.LEFT, fill=tk.X, expand=True)
+
+        self.name = ttk.Label(info_frame, font=('Arial', 12, 'bold'))
+        self.name.pack(anchor=tk.W)
+        self.where = ttk.Label(info_frame)
+        self.where.pack(anchor=tk.W)
+        self.coach = ttk.Label(info_frame)
+        self.coach.pack(anchor=tk.W)
+        self.facilities = ttk.Label(info_frame, wraplength=400)
+        self.facilities.pack(anchor=tk.W)
+
+        # Rating and actions
+        action_frame = ttk.Frame(self.frame)
+        action_frame.pack(side=tk.RIGHT)
+
+        self.rating = ttk.Label(action_frame)
+        self.rating.pack(pady=5)
+
+        btn_frame = ttk.Frame(action_frame)
+        btn_frame.pack()
+
+        ttk.Button(btn_frame, text="View Details",
+                   command=lambda: app.view_academy_details(self.record)).pack(side=tk.LEFT, padx=5)
+        ttk.Button(btn_frame, text="Register", style='Accent.TButton',
+                   command=lambda: app.register_for_academy(self.record)).pack(side=tk.LEFT, padx=5)
+
+    def bind(self, academy):
+        self.record = academy
+        sport, state, city = self.app.catalog.academy_index.location(academy)
+        where = f"{sport} | {city}, {state}"
+        distances = self.app.academy_results[1]
+        if academy["id"] in distances:
+            where += f" | {distances[academy['id']]:.1f} km away"
+        self.name.config(text=academy["name"])
+        self.where.config(text=where)
+        self.coach.config(text=f"Coach: {academy['coach']} | Established: {academy['established']}")
+        self.facilities.config(text=f"Facilities: {', '.join(academy['facilities'])}")
+        self.rating.config(text=f"⭐ {academy['rating']}/5.0")
+
+
+class ThumbnailCard:
+    """Base for cards that show their record's picture from ``app.images``.
+
+    ``self.image`` is an unpacked label; it is packed first, at the card's
+    left, only while the bound record has a picture on disk.
+    """
+
+    def bind_image(self, record):
+        images = getattr(self.app, "images", None)
+        name = record.get("image")
+        if images is None or not images.exists(name):
+            self.photo = None
+            self.image.pack_forget()
+            return
+        # Keep a reference: the loader may evict the PhotoImage while the card still shows it
+        self.photo = images.get(name, self.show_image)
+        self.image.config(image=self.photo)
+        if not self.image.winfo_manager():
+            slaves = self.frame.pack_slaves()
+            self.image.pack(side=tk.LEFT, anchor=tk.N, padx=(0, 8), **({"before": slaves[0]} if slaves else {}))
+
+    def show_image(self, name, photo):
+        # The card may have been rebound to another record while the picture loaded
+        if self.record is not None and self.record.get("image") == name:
+            self.photo = photo
+            self.image.config(image=photo)
+
+
+class CourseCard(ThumbnailCard):
+    """Course grid card; the price and enroll button follow the member's premium status on every ``bind``"""
+
+    PACK = {"side": tk.LEFT, "padx": 5, "fill": tk.BOTH, "expand": True}
+
+    def __init__(self, parent, app):
+        self.app = app
+        self.record = None
+        self.frame = ttk.Frame(parent, style='Card.TFrame', padding=10)
+
+        self.image = ttk.Label(self.frame)
+        self.title = ttk.Label(self.frame, font=('Arial', 12, 'bold'), wraplength=200)
+        self.title.pack(anchor=tk.W)
+        self.sport = ttk.Label(self.frame)
+        self.sport.pack(anchor=tk.W)
+        self.duration = ttk.Label(self.frame)
+        self.duration.pack(anchor=tk.W)
+        self.instructor = ttk.Label(self.frame)
+        self.instructor.pack(anchor=tk.W)
+        self.rating = ttk.Label(self.frame)
+        self.rating.pack(anchor=tk.W, pady=5)
+
+        # Price and buttons
+        price_frame = ttk.Frame(self.frame)
+        price_frame.pack(fill=tk.X, pady=5)
+
+        self.price = ttk.Label(price_frame, font=('Arial', 12, 'bold'))
+        self.price.pack(side=tk.LEFT)
+
+        btn_frame = ttk.Frame(price_frame)
+        btn_frame.pack(side=tk.RIGHT)
+
+        ttk.Button(btn_frame, text="Details",
+                   command=lambda: app.show_course_details(self.record)).pack(side=tk.LEFT, padx=2)
+        self.enroll = ttk.Button(btn_frame, style='Accent.TButton',
+                                 command=lambda: app.enroll_in_course(self.record))
+        self.enroll.pack(side=tk.LEFT, padx=2)
+
+    def bind(self, course):
+        self.record = course
+        self.bind_image(course)
+        premium = self.app.user_data.get("premium", False)
+        self.title.config(text=course["title"])
+        self.sport.config(text=f"Sport: {course['sport']}")
+        self.duration.config(text=f"Duration: {course['duration']}")
+        self.instructor.config(text=f"Instructor: {course['instructor']}")
+        self.rating.config(text=f"⭐ {course['rating']} ({course['students']} students)")
+        self.price.config(text="FREE (Premium)" if premium else f"₹{course['price']}")
+        self.enroll.config(text="Enroll" if premium else "Enroll Now")
+
+
+class WebinarCard(ThumbnailCard):
+    PACK = {"fill": tk.X, "pady": 5}
+
+    def __init__(self, parent, app):
+        self.app = app
+        self.record = None
+        self.frame = ttk.Frame(parent, style='Card.TFrame', padding=10)
+
+        self.image = ttk.Label(self.frame)
+
+        # Webinar info
+        info_frame = ttk.Frame(self.frame)
+        info_frame.pack(side=tk.LEFT, fill=tk.X, expand=True)
+
+        self.title = ttk.Label(info_frame, font=('Arial', 12, 'bold'))
+        self.title.pack(anchor=tk.W)
+        self.when = ttk.Label(info_frame)
+        self.when.pack(anchor=tk.W)
+        self.instructor = ttk.Label(info_frame)
+        self.instructor.pack(anchor=tk.W)
+        self.seats = ttk.Label(info_frame)
+        self.seats.pack(anchor=tk.W)
+
+        # Price and buttons
+        price_frame = ttk.Frame(self.frame)
+        price_frame.pack(side=tk.RIGHT)
+
+        self.price = ttk.Label(price_frame, font=('Arial', 12, 'bold'))
+        self.price.pack()
+
+        btn_frame = ttk.Frame(price_frame)
+        btn_frame.pack(pady=5)
+
+        ttk.Button(btn_frame, text="Details",
+                   command=lambda: app.show_webinar_details(self.record)).pack(side=tk.LEFT, padx=2)
+        ttk.Button(btn_frame, text="Book Now", style='Accent.TButton',
+                   command=lambda: app.book_webinar(self.record)).pack(side=tk.LEFT, padx=2)
+
+    def bind(self, webinar):
+        self.record = webinar
+        self.bind_image(webinar)
+        self.title.config(text=webinar["title"])
+        self.when.config(text=f"Date: {webinar['date']} | Time: {webinar['time']}")
+        self.instructor.config(text=f"Instructor: {webinar['instructor']}")
+        self.seats.config(text=f"Seats available: {webinar['seats'] - webinar['registered']}/{webinar['seats']}")
+        self.price.config(text=f"₹{webinar['price']}")
+
+
+class EquipmentCard(ThumbnailCard):
+    PACK = {"side": tk.LEFT, "padx": 5, "fill": tk.BOTH, "expand": True}
+
+    def __init__(self, parent, app):
+        self.app = app
+        self.record = None
+        self.frame = ttk.Frame(parent, style='Card.TFrame', padding=10)
+
+        self.image = ttk.Label(self.frame)
+        self.name = ttk.Label(self.frame, font=('Arial', 11, 'bold'), wraplength=200)
+        self.name.pack(anchor=tk.W)
+        self.category = ttk.Label(self.frame)
+        self.category.pack(anchor=tk.W)
+        self.rating = ttk.Label(self.frame)
+        self.rating.pack(anchor=tk.W)
+
+        # Price
+        price_frame = ttk.Frame(self.frame)
+        price_frame.pack(fill=tk.X, pady=5)
+
+        self.original_price = ttk.Label(price_frame, font=('Arial', 9), foreground='gray')
+        self.original_price.pack(side=tk.LEFT)
+        self.discount_price = ttk.Label(price_frame, font=('Arial', 12, 'bold'))
+        self.discount_price.pack(side=tk.LEFT, padx=5)
+        self.discount = ttk.Label(price_frame, font=('Arial', 9, 'bold'), foreground='green')
+        self.discount.pack(side=tk.LEFT)
+
+        # Buttons
+        btn_frame = ttk.Frame(self.frame)
+        btn_frame.pack(fill=tk.X)
+
+        ttk.Button(btn_frame, text="Details",
+                   command=lambda: app.show_equipment_details(self.record)).pack(side=tk.LEFT, padx=2)
+        ttk.Button(btn_frame, text="Add to Cart", style='Accent.TButton',
+                   command=lambda: app.add_to_cart(self.record)).pack(side=tk.LEFT, padx=2)
+
+    def bind(self, item):
+        self.record = item
+        self.bind_image(item)
+        discount_price = self.app.catalog.columns("equipment").value(item["id"], "discounted_price")
+        self.name.config(text=item["name"])
+        self.category.config(text=f"Category: {item['category']}")
+        self.rating.config(text=f"⭐ {item['rating']}")
+        self.original_price.config(text=f"₹{item['price']}")
+        self.discount_price.config(text=f"₹{discount_price:.0f}")
+        self.discount.config(text=f"{item['discount']}% OFF")
+
+
+class VirtualList(ttk.Frame):
+    """Scrollable list or grid that only keeps widgets for the rows in view.
+
+    Items arrive a page at a time from ``fetch(cursor) -> (items, next
+    cursor)``, and a page is only requested once scrolling nears the end of
+    what has been loaded. Rows have a fixed height, so the scroll region
+    covers every result up front and row ``i`` sits at ``i * row_height`` on
+    a canvas. Only rows overlapping the viewport plus ``overscan`` rows
+    either side are shown, so the widget count depends on the window height,
+    not on the number of results.
+
+    A row holds ``columns`` cards from ``make_card(parent)``; each card has a
+    ``frame``, a ``PACK`` dict of pack options and ``bind(record)``. Rows
+    that scroll away, or are dropped by ``load``, go back to ``pool`` and are
+    rebound to other records later instead of being destroyed, unless
+    ``recycle`` is False.
+
+    Rows are shown a slice at a time: each slice stops once it has used
+    ``RENDER_BUDGET_MS`` and the rest follow from ``after`` callbacks, rows
+    in the viewport first, so the window stays responsive while a fresh
+    list fills in. ``load`` cancels whatever a previous load left pending.
+    """
+
+    def __init__(self, parent, make_card, row_height, columns=1, overscan=2, recycle=True):
+        super().__init__(parent)
+        self.make_card = make_card
+        self.row_height = row_height
+        self.columns = columns
+        self.overscan = overscan
+        self.recycle = recycle
+        self.pool = WidgetPool(self._new_row)
+        # Wall time of the latest refresh's first slice, for benchmarks
+        self.last_refresh_ms = 0.0
+        self._pending = []
+        self._job = None
+
+        self.canvas = tk.Canvas(self, highlightthickness=0, yscrollincrement=max(1, row_height // 4))
+        self.scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self.canvas.yview)
+        self.canvas.configure(yscrollcommand=self._on_scroll)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.canvas.bind("<Configure>", self._on_resize)
+        # Only the list under the pointer reacts to the mouse wheel
+        self.canvas.bind("<Enter>", lambda event: self._bind_wheel(True))
+        self.canvas.bind("<Leave>", lambda event: self._bind_wheel(False))
+
+        self._rows = {}
+        self._range = (0, 0)
+        self._items = []
+        self._fetch = None
+        self._cursor = None
+        self._exhausted = True
+        self._total = 0
+
+    def load(self, fetch, total):
+        """Show ``total`` results read through ``fetch``, starting from the top"""
+        self.cancel()
+        for index in list(self._rows):
+            self._release(index)
+        self._items = []
+        self._fetch = fetch
+        self._cursor = None
+        self._exhausted = False
+        self._total = total
+        self._update_region()
+        self.canvas.yview_moveto(0)
+        self.refresh()
+
+    def _row_count(self):
+        return -(-self._total // self.columns)
+
+    def _update_region(self):
+        self.canvas.configure(scrollregion=(0, 0, self.canvas.winfo_width(), self._row_count() * self.row_height))
+
+    def _ensure_loaded(self, count):
+        while len(self._items) < count and not self._exhausted:
+            items, self._cursor = self._fetch(self._cursor)
+            self._items.extend(items)
+            if self._cursor is None or not items:
+                self._exhausted = True
+        if self._exhausted and len(self._items) != self._total:
+            # The results changed under us; trust what was actually read
+            self._total = len(self._items)
+            self._update_region()
+
+    def refresh(self):
+        """Release the rows that scrolled away and start showing the ones now in view"""
+        started = time.perf_counter()
+        top = self.canvas.canvasy(0)
+        height = max(self.canvas.winfo_height(), self.row_height)
+        visible = int(top // self.row_height)
+        first = max(0, visible - self.overscan)
+        last = int((top + height) // self.row_height) + 1 + self.overscan
+        self._ensure_loaded(min(last, self._row_count()) * self.columns)
+        last = min(last, self._row_count())
+
+        for index in [index for index in self._rows if not first <= index < last]:
+            self._release(index)
+        self._range = (first, last)
+        # Viewport rows first, then the overscan below and above it
+        order = sorted(range(first, last), key=lambda index: (index < visible, abs(index - visible)))
+        self.cancel()
+        self._pending = [index for index in order if index not in self._rows]
+        self._render_slice(started)
+        self.last_refresh_ms = (time.perf_counter() - started) * 1000
+
+    def _render_slice(self, started=None):
+        self._job = None
+        started = started or time.perf_counter()
+        first, last = self._range
+        while self._pending:
+            index = self._pending.pop(0)
+            if first <= index < last and index not in self._rows:
+                self._rows[index] = self._show_row(index)
+            if (time.perf_counter() - started) * 1000 >= RENDER_BUDGET_MS:
+                break
+        if self._pending:
+            self._job = self.after(1, self._render_slice)
+
+    def cancel(self):
+        """Drop rows still waiting to be shown, e.g. because the results are about to change"""
+        self._pending = []
+        if self._job is not None:
+            self.after_cancel(self._job)
+            self._job = None
+
+    @property
+    def rendering(self):
+        """True while rows in view are still waiting to be shown"""
+        return bool(self._pending)
+
+    def destroy(self):
+        self.cancel()
+        super().destroy()
+
+    def _new_row(self):
+        frame = ttk.Frame(self.canvas)
+        cards = [self.make_card(frame) for _ in range(self.columns)]
+        item = self.canvas.create_window(0, 0, anchor=tk.NW, window=frame, height=self.row_height,
+                                         state=tk.HIDDEN)
+        return frame, cards, item
+
+    def _show_row(self, index):
+        row = self.pool.acquire()
+        frame, cards, item = row
+        records = self._items[index * self.columns:(index + 1) * self.columns]
+        for position, card in enumerate(cards):
+            if position < len(records):
+                card.bind(records[position])
+                if not card.frame.winfo_manager():
+                    card.frame.pack(**card.PACK)
+            elif card.frame.winfo_manager():
+                # Only the last row of a grid is short, so unused cards are always trailing
+                card.frame.pack_forget()
+        self.canvas.coords(item, 0, index * self.row_height)
+        self.canvas.itemconfigure(item, width=self.canvas.winfo_width(), state=tk.NORMAL)
+        return row
+
+    def _release(self, index):
+        frame, cards, item = row = self._rows.pop(index)
+        if self.recycle:
+            self.canvas.itemconfigure(item, state=tk.HIDDEN)
+            self.pool.release(row)
+        else:
+            self.canvas.delete(item)
+            frame.destroy()
+
+    def _on_scroll(self, first, last):
+        self.scrollbar.set(first, last)
+        self.refresh()
+
+    def _on_resize(self, event):
+        for _, _, item in self._rows.values():
+            self.canvas.itemconfigure(item, width=event.width)
+        self._update_region()
+        self.refresh()
+
+    def _bind_wheel(self, active):
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            if active:
+                self.canvas.bind_all(sequence, self._on_wheel)
+            else:
+                self.canvas.unbind_all(sequence)
+
+    def _on_wheel(self, event):
+        up = event.num == 4 or getattr(event, "delta", 0) > 0
+        self.canvas.yview_scroll(-4 if up else 4, "units")
+
+    @property
+    def widget_rows(self):
+        """Number of rows currently shown"""
+        return len(self._rows)
+
+    def stats(self):
+        """Rows built and reused so far, cards built, and the latest refresh time"""
+        stats = self.pool.stats()
+        stats["cards_created"] = stats["created"] * self.columns
+        stats["refresh_ms"] = self.last_refresh_ms
+        return stats
+
+
+class PageManager:
+    """Builds each main page once and swaps cached pages in and out of ``parent``.
+
+    ``show(name, build, refresh)`` packs the page called ``name``, calling
+    ``build(frame)`` the first time. Pages marked stale with ``invalidate``
+    run their ``refresh()`` before they are next shown (straight away if
+    they are on screen). Hidden pages are destroyed, least recently shown
+    first, while all cached pages together hold more than ``max_widgets``
+    widgets.
+    """
+
+    def __init__(self, parent, max_widgets=PAGE_CACHE_MAX_WIDGETS):
+        self.parent = parent
+        self.max_widgets = max_widgets
+        # name -> [frame, refresh, stale, widget count when last hidden]
+        self._pages = OrderedDict()
+        self.current = None
+        self.builds = 0
+        self.hits = 0
+
+    def show(self, name, build, refresh=None):
+        previous, self.current = self.current, name
+        if previous is not None and previous != name:
+            self._hide(previous)
+        page = self._pages.get(name)
+        if page is None:
+            frame = ttk.Frame(self.parent)
+            page = self._pages[name] = [frame, refresh, False, 0]
+            build(frame)
+            self.builds += 1
+        else:
+            self._pages.move_to_end(name)
+            self.hits += 1
+            if page[2]:
+                page[2] = False
+                if page[1] is not None:
+                    page[1]()
+        page[0].pack(fill=tk.BOTH, expand=True)
+        return page[0]
+
+    def invalidate(self, *names):
+        """Mark pages (all of them if no names are given) as needing a refresh"""
+        for name in names or list(self._pages):
+            page = self._pages.get(name)
+            if page is None:
+                continue
+            if name == self.current and page[1] is not None:
+                page[1]()
+            else:
+                page[2] = True
+
+    def drop(self, name):
+        """Destroy a cached page so the next ``show`` builds it again"""
+        page = self._pages.pop(name, None)
+        if page is not None:
+            page[0].destroy()
+            if name == self.current:
+                self.current = None
+
+    def _hide(self, name):
+        page = self._pages.get(name)
+        if page is None:
+            return
+        page[0].pack_forget()
+        page[3] = self._count_widgets(page[0])
+        total = sum(page[3] for page in self._pages.values())
+        for idle in list(self._pages):
+            if total <= self.max_widgets:
+                break
+            if idle != self.current:
+                total -= self._pages[idle][3]
+                self.drop(idle)
+
+    @staticmethod
+    def _count_widgets(widget):
+        count, pending = 0, [widget]
+        while pending:
+            count += 1
+            pending.extend(pending.pop().winfo_children())
+        return count
+
+    def stats(self):
+        return {"pages": len(self._pages), "builds": self.builds, "hits": self.hits,
+                "widgets": sum(page[3] for page in self._pages.values())}
+
+
+class PasswordHasher:
+    """Salted, tunable password hashing (PBKDF2-SHA256 or scrypt) run on a worker pool.
+
+    Stored hashes carry their algorithm and cost, e.g.
+    ``pbkdf2_sha256$600000$<salt>$<hash>``, so the cost can be raised later
+    and older hashes upgraded at login. Bare hex digests from the old
+    unsalted SHA-256 scheme still verify and are always flagged for rehash.
+    """
+
+    DEFAULT_SETTINGS = {"algorithm": "pbkdf2_sha256", "iterations": 600000}
+
+    def __init__(self, settings=None, workers=2):
+        self.settings = settings or self.load_settings()
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hash")
+
+    @classmethod
+    def load_settings(cls, path=KDF_SETTINGS_FILE):
+        """Cost parameters saved by ``benchmark kdf --save``, or the defaults"""
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        return dict(cls.DEFAULT_SETTINGS)
+
+    @staticmethod
+    def save_settings(settings, path=KDF_SETTINGS_FILE):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(settings, f, indent=2)
+
+    @staticmethod
+    def _derive(password, salt, settings):
+        if settings["algorithm"] == "pbkdf2_sha256":
+            return hashlib.pbkdf2_hmac("sha256", password.encode(), salt, settings["iterations"])
+        if settings["algorithm"] == "scrypt":
+            n, r, p = settings["n"], settings["r"], settings["p"]
+            return hashlib.scrypt(password.encode(), salt=salt, n=n, r=r, p=p,
+                                  maxmem=256 * n * r * p + 2 ** 20, dklen=32)
+        raise ValueError(f"Unknown password hashing algorithm: {settings['algorithm']}")
+
+    @staticmethod
+    def _encode(settings, salt, digest):
+        if settings["algorithm"] == "scrypt":
+            cost = f"{settings['n']}${settings['r']}${settings['p']}"
+        else:
+            cost = str(settings["iterations"])
+        return f"{settings['algorithm']}${cost}${salt.hex()}${digest.hex()}"
+
+    @staticmethod
+    def _decode(stored):
+        algorithm, *cost, salt, digest = stored.split("$")
+        if algorithm == "scrypt":
+            n, r, p = (int(value) for value in cost)
+            settings = {"algorithm": algorithm, "n": n, "r": r, "p": p}
+        else:
+            settings = {"algorithm": algorithm, "iterations": int(cost[0])}
+        return settings, bytes.fromhex(salt), bytes.fromhex(digest)
+
+    @staticmethod
+    def is_legacy(stored):
+        return "$" not in stored
+
+    def hash(self, password):
+        salt = os.urandom(16)
+        return self._encode(self.settings, salt, self._derive(password, salt, self.settings))
+
+    def verify(self, password, stored):
+        if self.is_legacy(stored):
+            legacy = hashlib.sha256(password.encode()).hexdigest()
+            return hmac.compare_digest(legacy, stored)
+        settings, salt, digest = self._decode(stored)
+        return hmac.compare_digest(self._derive(password, salt, settings), digest)
+
+    def needs_rehash(self, stored):
+        """Whether ``stored`` uses the legacy scheme or different cost parameters"""
+        return self.is_legacy(stored) or self._decode(stored)[0] != self.settings
+
+    def hash_async(self, password):
+        return self._pool.submit(self.hash, password)
+
+    def verify_async(self, password, stored):
+        return self._pool.submit(self.verify, password, stored)
+
+    def close(self):
+        self._pool.shutdown(wait=False)
+
+    @classmethod
+    def calibrate(cls, algorithm, target_ms):
+        """Pick cost parameters so one hash takes about ``target_ms`` on this host"""
+        def time_hash(settings):
+            started = time.perf_counter()
+            cls._derive("calibration", b"0" * 16, settings)
+            return (time.perf_counter() - started) * 1000
+
+        if algorithm == "scrypt":
+            settings = {"algorithm": "scrypt", "n": 2 ** 10, "r": 8, "p": 1}
+            # n must be a power of two; stop at 128 MB of memory per hash
+            while settings["n"] < 2 ** 17 and time_hash(settings) * 2 <= target_ms:
+                settings["n"] *= 2
+            return settings
+
+        settings = {"algorithm": "pbkdf2_sha256", "iterations": 10000}
+        elapsed = min(time_hash(settings) for _ in range(3))
+        settings["iterations"] = max(10000, int(settings["iterations"] * target_ms / elapsed) // 1000 * 1000)
+        return settings
 
 
 class AcadInfoApp:
@@ -14,6 +3250,10 @@ class AcadInfoApp:
         self.root.title("ACADINFO - Enlightens Your Dream")
         self.root.geometry("1200x800")
         self.root.configure(bg="#f0f0f0")
+        self.root.protocol("WM_DELETE_WINDOW", self.exit_app)
+
+        # Delivers results and errors from worker threads to the Tk thread
+        self.dispatcher = TkDispatcher(self.root)
 
         # Load data
         self.load_data()
@@ -22,6 +3262,9 @@ class AcadInfoApp:
         self.current_user = None
         self.user_data = {}
 
+        # Typeahead prefix indexes, built when a search field is first used
+        self._typeahead = {}
+
         # Style configuration
         self.configure_styles()
 
@@ -67,7 +3310,7 @@ class AcadInfoApp:
         self.style.configure('TCombobox', padding=5)
 
     def load_data(self):
-        """Load all hardcoded data for the application"""
+        """Load lookup data, the lazy catalog and the user store"""
         # Sports data
         self.sports = ["Cricket", "Football", "Basketball", "Chess", "Hockey", "Tennis", "Badminton", "Table Tennis",
                        "Volleyball", "Swimming"]
@@ -86,401 +3329,108 @@ class AcadInfoApp:
             "Punjab": ["Chandigarh", "Ludhiana", "Amritsar"]
         }
 
-        # Academies data with detailed information
-        self.academies = {
-            "Cricket": {
-                "Delhi": [
-                    {"name": "Delhi Cricket Academy", "rating": 4.7, "coach": "Rahul Sharma", "established": 2005,
-                     "facilities": ["3 grounds", "Indoor nets", "Gym", "Swimming pool"],
-                     "address": "123 Sports Complex, New Delhi",
-                     "contact": "011-23456789",
-                     "fees": "₹15,000 per quarter",
-                     "timings": "6:00 AM - 9:00 AM, 4:00 PM - 7:00 PM"},
-                    {"name": "National Cricket Center", "rating": 4.9, "coach": "Vikram Rathore", "established": 1998,
-                     "facilities": ["5 grounds", "Swimming pool", "Hostel", "Cafeteria", "Physiotherapy center"],
-                     "address": "National Stadium Road, Delhi",
-                     "contact": "011-34567890",
-                     "fees": "₹25,000 per quarter",
-                     "timings": "5:30 AM - 8:30 AM, 3:30 PM - 6:30 PM"}
-                ],
-                "Maharashtra": [
-                    {"name": "Mumbai Cricket Club", "rating": 4.8, "coach": "Sanjay Bangar", "established": 2001,
-                     "facilities": ["2 grounds", "Indoor nets", "Gym"],
-                     "address": "Marine Drive, Mumbai",
-                     "contact": "022-45678901",
-                     "fees": "₹18,000 per quarter",
-                     "timings": "6:00 AM - 9:00 AM, 4:00 PM - 7:00 PM"},
-                    {"name": "Pune Sports Academy", "rating": 4.5, "coach": "Hrishikesh Kanitkar", "established": 2010,
-                     "facilities": ["3 grounds", "Gym", "Swimming pool"],
-                     "address": "University Road, Pune",
-                     "contact": "020-56789012",
-                     "fees": "₹12,000 per quarter",
-                     "timings": "6:30 AM - 9:30 AM, 4:30 PM - 7:30 PM"}
-                ],
-                "Karnataka": [
-                    {"name": "Bangalore Cricket Institute", "rating": 4.6, "coach": "Venkatesh Prasad",
-                     "established": 2003,
-                     "facilities": ["4 grounds", "Hostel", "Gym", "Cafeteria"],
-                     "address": "MG Road, Bangalore",
-                     "contact": "080-67890123",
-                     "fees": "₹20,000 per quarter",
-                     "timings": "6:00 AM - 9:00 AM, 4:00 PM - 7:00 PM"}
-                ]
-            },
-            "Football": {
-                "Delhi": [
-                    {"name": "Delhi Football School", "rating": 4.3, "coach": "Clifford Miranda", "established": 2007,
-                     "facilities": ["Full-size pitch", "Gym", "Changing rooms"],
-                     "address": "Dwarka Sports Complex, Delhi",
-                     "contact": "011-78901234",
-                     "fees": "₹10,000 per quarter",
-                     "timings": "5:00 AM - 8:00 AM, 3:00 PM - 6:00 PM"},
-                    {"name": "Soccer Excellence", "rating": 4.4, "coach": "Bhaichung Bhutia", "established": 2012,
-                     "facilities": ["2 pitches", "Hostel", "Gym", "Cafeteria"],
-                     "address": "Greater Kailash, Delhi",
-                     "contact": "011-89012345",
-                     "fees": "₹15,000 per quarter",
-                     "timings": "5:30 AM - 8:30 AM, 3:30 PM - 6:30 PM"}
-                ],
-                "Maharashtra": [
-                    {"name": "Mumbai Football Academy", "rating": 4.5, "coach": "Derrick Pereira", "established": 2005,
-                     "facilities": ["Full-size pitch", "Swimming pool", "Gym"],
-                     "address": "Andheri Sports Complex, Mumbai",
-                     "contact": "022-90123456",
-                     "fees": "₹12,000 per quarter",
-                     "timings": "5:00 AM - 8:00 AM, 4:00 PM - 7:00 PM"}
-                ],
-                "West Bengal": [
-                    {"name": "Kolkata Football Club", "rating": 4.7, "coach": "Subrata Bhattacharya",
-                     "established": 1995,
-                     "facilities": ["3 pitches", "Hostel", "Gym", "Medical center"],
-                     "address": "Salt Lake Stadium, Kolkata",
-                     "contact": "033-01234567",
-                     "fees": "₹8,000 per quarter",
-                     "timings": "5:30 AM - 8:30 AM, 3:30 PM - 6:30 PM"}
-                ]
-            },
-            "Basketball": {
-                "Delhi": [
-                    {"name": "Delhi Basketball Academy", "rating": 4.2, "coach": "Ajmer Singh", "established": 2008,
-                     "facilities": ["3 courts", "Gym", "Changing rooms"],
-                     "address": "Thyagaraj Stadium, Delhi",
-                     "contact": "011-12345678",
-                     "fees": "₹9,000 per quarter",
-                     "timings": "6:00 AM - 9:00 AM, 4:00 PM - 7:00 PM"}
-                ],
-                "Karnataka": [
-                    {"name": "Bangalore Basketball Center", "rating": 4.4, "coach": "Prashanti Singh",
-                     "established": 2011,
-                     "facilities": ["4 courts", "Gym", "Hostel"],
-                     "address": "Koramangala, Bangalore",
-                     "contact": "080-23456789",
-                     "fees": "₹11,000 per quarter",
-                     "timings": "6:30 AM - 9:30 AM, 4:30 PM - 7:30 PM"}
-                ]
-            },
-            "Chess": {
-                "Delhi": [
-                    {"name": "Delhi Chess Club", "rating": 4.8, "coach": "RB Ramesh", "established": 2000,
-                     "facilities": ["Air-conditioned halls", "Library", "Analysis rooms"],
-                     "address": "Connaught Place, Delhi",
-                     "contact": "011-34567890",
-                     "fees": "₹6,000 per quarter",
-                     "timings": "9:00 AM - 9:00 PM"}
-                ],
-                "Tamil Nadu": [
-                    {"name": "Chennai Chess Academy", "rating": 4.7, "coach": "Viswanathan Anand", "established": 2005,
-                     "facilities": ["Air-conditioned halls", "Digital analysis boards", "Library"],
-                     "address": "Nungambakkam, Chennai",
-                     "contact": "044-45678901",
-                     "fees": "₹7,500 per quarter",
-                     "timings": "10:00 AM - 8:00 PM"}
-                ]
-            },
-            "Hockey": {
-                "Delhi": [
-                    {"name": "Delhi Hockey Academy", "rating": 4.5, "coach": "Dhanraj Pillay", "established": 2003,
-                     "facilities": ["2 astroturf pitches", "Gym", "Hostel"],
-                     "address": "National Stadium, Delhi",
-                     "contact": "011-56789012",
-                     "fees": "₹12,000 per quarter",
-                     "timings": "5:30 AM - 8:30 AM, 4:30 PM - 7:30 PM"}
-                ],
-                "Maharashtra": [
-                    {"name": "Mumbai Hockey Club", "rating": 4.3, "coach": "Viren Rasquinha", "established": 2007,
-                     "facilities": ["Astroturf pitch", "Gym", "Changing rooms"],
-                     "address": "Mahalaxmi, Mumbai",
-                     "contact": "022-67890123",
-                     "fees": "₹10,000 per quarter",
-                     "timings": "6:00 AM - 9:00 AM, 4:00 PM - 7:00 PM"}
-                ]
-            }
-        }
-
-        # Courses data with detailed information
-        self.courses = {
-            1: {
-                "id": 1,
-                "title": "Fundamentals of Sports Training",
-                "price": 799,
-                "duration": "4 weeks",
-                "instructor": "Professional Coach",
-                "sport": "General",
-                "description": "Learn the basic principles of sports training, nutrition, and injury prevention. This course is perfect for beginners who want to understand the fundamentals of athletic training.",
-                "modules": ["Introduction to Sports Science", "Basic Training Principles", "Nutrition Basics",
-                            "Injury Prevention", "Recovery Techniques"],
-                "image": "course1.jpg",
-                "students": 1245,
-                "rating": 4.5
-            },
-            2: {
-                "id": 2,
-                "title": "Advanced Cricket Techniques",
-                "price": 1299,
-                "duration": "8 weeks",
-                "instructor": "International Player",
-                "sport": "Cricket",
-                "description": "Master advanced batting, bowling and fielding techniques with professional guidance from former international players. Includes video analysis of your technique.",
-                "modules": ["Advanced Batting", "Fast Bowling Techniques", "Spin Bowling Variations", "Fielding Drills",
-                            "Match Situations", "Mental Toughness"],
-                "image": "course2.jpg",
-                "students": 876,
-                "rating": 4.7
-            },
-            3: {
-                "id": 3,
-                "title": "Football Strategy Masterclass",
-                "price": 999,
-                "duration": "6 weeks",
-                "instructor": "Pro Football Coach",
-                "sport": "Football",
-                "description": "Learn advanced tactics and strategies from professional football coaches. Includes video analysis of professional matches.",
-                "modules": ["Formations and Systems", "Set Piece Strategies", "Pressing Techniques", "Counter Attacks",
-                            "Defensive Organization"],
-                "image": "course3.jpg",
-                "students": 654,
-                "rating": 4.6
-            },
-            4: {
-                "id": 4,
-                "title": "Basketball Skills Development",
-                "price": 899,
-                "duration": "5 weeks",
-                "instructor": "NBA Trainer",
-                "sport": "Basketball",
-                "description": "Develop your basketball skills with training methods used by professional players. Includes personalized feedback on your game.",
-                "modules": ["Shooting Techniques", "Ball Handling", "Defensive Moves", "Rebounding", "Game IQ"],
-                "image": "course4.jpg",
-                "students": 432,
-                "rating": 4.4
-            },
-            5: {
-                "id": 5,
-                "title": "Chess Grandmaster Training",
-                "price": 1499,
-                "duration": "10 weeks",
-                "instructor": "Grandmaster",
-                "sport": "Chess",
-                "description": "Learn advanced chess strategies from a grandmaster. Includes analysis of your games and personalized training plan.",
-                "modules": ["Opening Repertoire", "Middle Game Strategies", "Endgame Techniques", "Tactical Patterns",
-                            "Time Management"],
-                "image": "course5.jpg",
-                "students": 765,
-                "rating": 4.8
-            }
-        }
-
-        # Webinars data
-        self.webinars = {
-            1: {
-                "id": 1,
-                "title": "Sports Nutrition for Peak Performance",
-                "price": 399,
-                "date": "Wednesday, 15th March 2023",
-                "time": "6:00 PM - 7:00 PM",
-                "duration": "1 hour",
-                "instructor": "Dr. Anjali Sharma (Sports Dietician)",
-                "description": "Learn about optimal nutrition for athletes and how to fuel your performance. Includes Q&A session with the dietician.",
-                "image": "webinar1.jpg",
-                "seats": 100,
-                "registered": 78
-            },
-            2: {
-                "id": 2,
-                "title": "Mental Toughness in Sports",
-                "price": 349,
-                "date": "Friday, 17th March 2023",
-                "time": "7:00 PM - 8:00 PM",
-                "duration": "1 hour",
-                "instructor": "Sports Psychologist",
-                "description": "Develop mental resilience and learn techniques to handle pressure in competitive situations.",
-                "image": "webinar2.jpg",
-                "seats": 100,
-                "registered": 65
-            },
-            3: {
-                "id": 3,
-                "title": "Injury Prevention and Recovery",
-                "price": 349,
-                "date": "Saturday, 18th March 2023",
-                "time": "5:00 PM - 6:00 PM",
-                "duration": "1 hour",
-                "instructor": "Physiotherapist",
-                "description": "Learn how to prevent common sports injuries and proper recovery techniques.",
-                "image": "webinar3.jpg",
-                "seats": 100,
-                "registered": 53
-            },
-            4: {
-                "id": 4,
-                "title": "Strength and Conditioning for Athletes",
-                "price": 449,
-                "date": "Tuesday, 21st March 2023",
-                "time": "6:30 PM - 7:30 PM",
-                "duration": "1 hour",
-                "instructor": "Strength Coach",
-                "description": "Learn proper strength training techniques tailored for your sport.",
-                "image": "webinar4.jpg",
-                "seats": 100,
-                "registered": 42
-            }
-        }
-
-        # Equipment store items
-        self.equipment = {
-            1: {
-                "id": 1,
-                "name": "Cricket Bat (MRF Genius Grand Edition)",
-                "price": 3499,
-                "category": "Cricket",
-                "discount": 15,
-                "description": "Premium English willow cricket bat with perfect weight balance",
-                "image": "bat1.jpg",
-                "stock": 25,
-                "rating": 4.7
-            },
-            2: {
-                "id": 2,
-                "name": "Football (Nike Premier League)",
-                "price": 1999,
-                "category": "Football",
-                "discount": 10,
-                "description": "Official match ball with high-performance texture",
-                "image": "football1.jpg",
-                "stock": 40,
-                "rating": 4.5
-            },
-            3: {
-                "id": 3,
-                "name": "Basketball (Spalding NBA Official)",
-                "price": 2499,
-                "category": "Basketball",
-                "discount": 12,
-                "description": "Official NBA game ball with premium composite leather",
-                "image": "basketball1.jpg",
-                "stock": 30,
-                "rating": 4.6
-            },
-            4: {
-                "id": 4,
-                "name": "Chess Set (Staunton Tournament)",
-                "price": 1299,
-                "category": "Chess",
-                "discount": 5,
-                "description": "Professional tournament chess set with 3.75\" king",
-                "image": "chess1.jpg",
-                "stock": 50,
-                "rating": 4.8
-            },
-            5: {
-                "id": 5,
-                "name": "Hockey Stick (Adidas X Series)",
-                "price": 2799,
-                "category": "Hockey",
-                "discount": 8,
-                "description": "Carbon fiber hockey stick with optimal bow for power and control",
-                "image": "hockey1.jpg",
-                "stock": 20,
-                "rating": 4.4
-            }
-        }
-
-        # News and articles
-        self.articles = [
-            {
-                "title": "How to Choose the Right Sports Academy for Your Child",
-                "date": "March 10, 2023",
-                "author": "Sports Education Expert",
-                "summary": "A comprehensive guide to selecting the best sports academy based on your child's interests and goals.",
-                "image": "article1.jpg"
-            },
-            {
-                "title": "The Importance of Mental Training in Sports",
-                "date": "March 5, 2023",
-                "author": "Sports Psychologist",
-                "summary": "Exploring how mental conditioning can improve athletic performance as much as physical training.",
-                "image": "article2.jpg"
-            },
-            {
-                "title": "Balancing Academics and Sports: A Parent's Guide",
-                "date": "February 28, 2023",
-                "author": "Education Counselor",
-                "summary": "Tips for helping young athletes maintain academic excellence while pursuing sports.",
-                "image": "article3.jpg"
-            }
-        ]
-
-        # Testimonials
-        self.testimonials = [
-            {
-                "name": "Rahul Sharma",
-                "role": "Cricket Player",
-                "text": "ACADINFO helped me find the perfect academy to take my cricket to the next level. The coaches are excellent!",
-                "image": "testimonial1.jpg"
-            },
-            {
-                "name": "Priya Patel",
-                "role": "Parent",
-                "text": "As a parent, I was confused about which academy to choose for my daughter. ACADINFO made the process so easy!",
-                "image": "testimonial2.jpg"
-            },
-            {
-                "name": "Coach Arjun",
-                "role": "Football Coach",
-                "text": "Our academy has seen a 40% increase in registrations since joining ACADINFO. Great platform!",
-                "image": "testimonial3.jpg"
-            }
-        ]
-
-        # Load users from file or create default
-        self.users_file = "users.json"
-        if os.path.exists(self.users_file):
-            with open(self.users_file, 'r') as f:
-                self.users = json.load(f)
+        # Catalog sections are read from data/catalog/ the first time a page uses them
+        self.catalog = Catalog()
+
+        # Page queries are memoized until the catalog records they cover change
+        self.query_cache = QueryCache()
+        self.catalog.listeners.append(self.catalog_changed)
+
+        # Card pictures are decoded and resized off the Tk thread
+        self.images = ImageLoader(self.dispatcher)
+
+        # Password hashing runs on a worker pool so the KDF never blocks Tk
+        self.password_hasher = PasswordHasher()
+
+        # Open the user store (migrating users.json on first run) or create default.
+        # Writes are buffered and flushed in batches off the Tk thread.
+        self.user_store = WriteBehindUserStore(
+            open_user_store(),
+            on_error=lambda error: self.dispatcher.post(self.show_store_error, error))
+        # Default admin account, stored once its password is hashed on the pool so startup never waits on the
+        # KDF; logins made before then wait for it (see authenticate)
+        self.admin_seed = None
+        if self.user_store.is_empty():
+            self.admin_seed = self.password_hasher.hash_async("admin123")
+            self.admin_seed.add_done_callback(lambda f: self.dispatcher.post(self.create_default_admin, f))
+
+    def create_default_admin(self, future):
+        self.admin_seed = None
+        if future.exception() is not None:
+            messagebox.showerror("Error", f"Could not create the default admin account: {future.exception()}")
+            return
+        if self.user_store.get("admin") is not None:
+            return
+        self.user_store.create("admin", {
+            "password": future.result(),
+            "email": "admin@acadinfo.com",
+            "full_name": "Administrator",
+            "phone": "9162960922",
+            "premium": True,
+            "joined": datetime.now().strftime("%Y-%m-%d"),
+            "last_login": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "bookings": []
+        })
+
+    @property
+    def academies(self):
+        return self.catalog.section("academies")
+
+    @property
+    def courses(self):
+        return self.catalog.section("courses")
+
+    @property
+    def webinars(self):
+        return self.catalog.section("webinars")
+
+    @property
+    def equipment(self):
+        return self.catalog.section("equipment")
+
+    @property
+    def articles(self):
+        return self.catalog.section("articles")
+
+    @property
+    def testimonials(self):
+        return self.catalog.section("testimonials")
+
+    def show_store_error(self, error):
+        messagebox.showerror("Save Failed",
+                             f"Your latest changes could not be saved:\n\n{error}\n\n"
+                             "They will be retried automatically.")
+
+    def exit_app(self):
+        """Flush pending writes before leaving the main loop"""
+        self.password_hasher.close()
+        self.images.close()
+        self.user_store.close()
+        self.root.quit()
+
+    def update_user(self, fields):
+        """Apply field changes to the logged-in user and persist them"""
+        self.user_data.update(fields)
+        self.user_store.update(self.current_user, fields)
+        if "premium" in fields:
+            self.premium_changed()
+
+    def show_member_status(self):
+        if self.user_data.get("premium", False):
+            self.member_label.config(text="Premium Member", style='Success.TLabel')
         else:
-            # Default admin account
-            self.users = {
-                "admin": {
-                    "password": self.hash_password("admin123"),
-                    "email": "admin@acadinfo.com",
-                    "full_name": "Administrator",
-                    "phone": "9162960922",
-                    "premium": True,
-                    "joined": datetime.now().strftime("%Y-%m-%d"),
-                    "last_login": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                    "bookings": []
-                }
-            }
-            self.save_users()
+            self.member_label.config(text="Standard Member", style='TLabel')
 
-    def hash_password(self, password):
-        """Hash password using SHA-256"""
-        return hashlib.sha256(password.encode()).hexdigest()
+    def premium_changed(self):
+        # Prices, course listings and the upgrade offer all depend on membership
+        self.show_member_status()
+        self.pages.drop("upgrade")
+        self.pages.invalidate("academies", "courses", "webinars", "equipment")
 
-    def save_users(self):
-        """Save users to file"""
-        with open(self.users_file, 'w') as f:
-            json.dump(self.users, f, indent=2)
+    def add_booking(self, booking):
+        """Append a booking to the logged-in user and persist it"""
+        self.user_data.setdefault("bookings", []).append(booking)
+        self.user_store.add_booking(self.current_user, booking)
 
     def create_menu(self):
         menubar = tk.Menu(self.root)
@@ -489,7 +3439,7 @@ class AcadInfoApp:
         file_menu = tk.Menu(menubar, tearoff=0)
         file_menu.add_command(label="My Profile", command=self.show_profile)
         file_menu.add_separator()
-        file_menu.add_command(label="Exit", command=self.root.quit)
+        file_menu.add_command(label="Exit", command=self.exit_app)
         menubar.add_cascade(label="File", menu=file_menu)
 
         # Help menu
@@ -554,8 +3504,8 @@ class AcadInfoApp:
         buttons_frame = ttk.Frame(login_card)
         buttons_frame.pack(fill=tk.X, pady=20)
 
-        login_btn = ttk.Button(buttons_frame, text="Login", style='Accent.TButton', command=self.authenticate)
-        login_btn.pack(side=tk.LEFT, padx=10)
+        self.login_btn = ttk.Button(buttons_frame, text="Login", style='Accent.TButton', command=self.authenticate)
+        self.login_btn.pack(side=tk.LEFT, padx=10)
 
         register_btn = ttk.Button(buttons_frame, text="Register", command=self.show_register_dialog)
         register_btn.pack(side=tk.LEFT, padx=10)
@@ -577,21 +3527,62 @@ class AcadInfoApp:
             messagebox.showerror("Error", "Please enter both username and password")
             return
 
-        if username in self.users:
-            hashed_password = self.hash_password(password)
-            if self.users[username]["password"] == hashed_password:
-                self.current_user = username
-                self.user_data = self.users[username]
+        if str(self.login_btn['state']) == 'disabled':
+            # A verification is already running
+            return
 
-                # Update last login
-                self.users[username]["last_login"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                self.save_users()
+        if self.admin_seed is not None:
+            # The default admin is still being created; try again right after it is stored
+            self.login_btn.config(state='disabled', text="Checking...")
+            self.admin_seed.add_done_callback(lambda f: self.dispatcher.post(self.retry_authentication))
+            return
 
-                self.show_main_app()
-            else:
-                messagebox.showerror("Login Failed", "Invalid password")
-        else:
+        user = self.user_store.get(username)
+        if user is None:
             messagebox.showerror("Login Failed", "Username not found")
+            return
+
+        # Verify on the hashing pool and finish on the Tk thread
+        self.login_btn.config(state='disabled', text="Checking...")
+        future = self.password_hasher.verify_async(password, user["password"])
+        future.add_done_callback(
+            lambda f: self.dispatcher.post(self.finish_authentication, username, password, user, f))
+
+    def retry_authentication(self):
+        if self.login_btn.winfo_exists():
+            self.login_btn.config(state='normal', text="Login")
+            self.authenticate()
+
+    def finish_authentication(self, username, password, user, future):
+        if not self.login_btn.winfo_exists():
+            return
+        self.login_btn.config(state='normal', text="Login")
+
+        if future.exception() is not None:
+            messagebox.showerror("Login Failed", f"Could not verify password: {future.exception()}")
+            return
+        if not future.result():
+            messagebox.showerror("Login Failed", "Invalid password")
+            return
+
+        self.current_user = username
+        self.user_data = user
+
+        # Update last login
+        self.update_user({"last_login": datetime.now().strftime("%Y-%m-%d %H:%M:%S")})
+
+        # Transparently upgrade legacy SHA-256 or outdated-cost hashes
+        if self.password_hasher.needs_rehash(user["password"]):
+            future = self.password_hasher.hash_async(password)
+            future.add_done_callback(lambda f: self.dispatcher.post(self.finish_rehash, username, f))
+
+        self.show_main_app()
+
+    def finish_rehash(self, username, future):
+        if future.exception() is None:
+            self.user_store.update(username, {"password": future.result()})
+            if self.current_user == username:
+                self.user_data["password"] = future.result()
 
     def show_register_dialog(self):
         register_window = tk.Toplevel(self.root)
@@ -645,9 +3636,9 @@ class AcadInfoApp:
                         variable=self.terms_var).grid(row=len(fields) + 2, columnspan=2, pady=10)
 
         # Register button
-        register_btn = ttk.Button(form_frame, text="Register", style='Accent.TButton',
-                                  command=lambda: self.register_user(register_window))
-        register_btn.grid(row=len(fields) + 3, columnspan=2, pady=10)
+        self.register_btn = ttk.Button(form_frame, text="Register", style='Accent.TButton',
+                                       command=lambda: self.register_user(register_window))
+        self.register_btn.grid(row=len(fields) + 3, columnspan=2, pady=10)
 
     def register_user(self, window):
         username = self.register_entries["username"].get().strip()
@@ -683,19 +3674,20 @@ class AcadInfoApp:
             messagebox.showerror("Error", "Password must contain at least one uppercase letter")
             return
 
-        if username in self.users:
+        if username in self.user_store:
             messagebox.showerror("Error", "Username already exists")
             return
 
         # Check if email is already registered
-        for user in self.users.values():
-            if user.get("email") == email:
-                messagebox.showerror("Error", "Email already registered")
-                return
+        if self.user_store.find_by_email(email) is not None:
+            messagebox.showerror("Error", "Email already registered")
+            return
+
+        if str(self.register_btn['state']) == 'disabled':
+            return
 
-        # Create new user
-        self.users[username] = {
-            "password": self.hash_password(password),
+        # Create new user once the password hash comes back from the pool
+        record = {
             "email": email,
             "full_name": full_name,
             "phone": phone,
@@ -705,8 +3697,29 @@ class AcadInfoApp:
             "last_login": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
             "bookings": []
         }
+        self.register_btn.config(state='disabled', text="Registering...")
+        future = self.password_hasher.hash_async(password)
+        future.add_done_callback(
+            lambda f: self.dispatcher.post(self.finish_registration, window, username, record, f))
 
-        self.save_users()
+    def finish_registration(self, window, username, record, future):
+        if not window.winfo_exists():
+            return
+        self.register_btn.config(state='normal', text="Register")
+
+        if future.exception() is not None:
+            messagebox.showerror("Error", f"Could not secure password: {future.exception()}")
+            return
+
+        # The same username or email may have been taken while hashing
+        if username in self.user_store:
+            messagebox.showerror("Error", "Username already exists")
+            return
+        if self.user_store.find_by_email(record["email"]) is not None:
+            messagebox.showerror("Error", "Email already registered")
+            return
+
+        self.user_store.create(username, {"password": future.result(), **record})
 
         messagebox.showinfo("Success", "Registration successful! You can now login.")
         window.destroy()
@@ -734,11 +3747,7 @@ class AcadInfoApp:
                 return
 
             # Find user with this email
-            found_user = None
-            for username, data in self.users.items():
-                if data.get("email") == email:
-                    found_user = username
-                    break
+            found_user = self.user_store.find_by_email(email)
 
             if found_user:
                 # In a real app, you would send an email with a reset link
@@ -780,14 +3789,27 @@ class AcadInfoApp:
         ttk.Label(user_frame, text=f"Welcome, {self.user_data.get('full_name', self.current_user)}",
                   font=('Arial', 10, 'bold')).pack(anchor=tk.E)
 
-        if self.user_data.get("premium", False):
-            ttk.Label(user_frame, text="Premium Member", style='Success.TLabel').pack(anchor=tk.E)
-        else:
-            ttk.Label(user_frame, text="Standard Member").pack(anchor=tk.E)
+        self.member_label = ttk.Label(user_frame)
+        self.member_label.pack(anchor=tk.E)
+        self.show_member_status()
 
         logout_btn = ttk.Button(user_frame, text="Logout", command=self.show_login_screen)
         logout_btn.pack(anchor=tk.E, pady=5)
 
+        # Global search across academies, courses, webinars and equipment
+        search_frame = ttk.Frame(header_frame)
+        search_frame.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=20)
+
+        self.global_search_var = tk.StringVar()
+        search_entry = ttk.Entry(search_frame, textvariable=self.global_search_var)
+        search_entry.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        search_entry.bind('<Return>', lambda event: self.show_search_results())
+
+        ttk.Button(search_frame, text="🔍 Search", command=self.show_search_results).pack(side=tk.LEFT, padx=5)
+
+        # Enter no longer means "log in"
+        self.root.unbind('<Return>')
+
         # Navigation Bar
         nav_frame = ttk.Frame(self.main_container)
         nav_frame.pack(fill=tk.X, padx=10, pady=5)
@@ -805,18 +3827,20 @@ class AcadInfoApp:
             btn = ttk.Button(nav_frame, text=btn_text, command=cmd)
             btn.pack(side=tk.LEFT, padx=5)
 
-        # Main Content Frame
+        # Main Content Frame; pages are built on first visit and kept for later ones
         self.content_frame = ttk.Frame(self.main_container)
         self.content_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        self.pages = PageManager(self.content_frame)
 
         # Show home page by default
         self.show_home_page()
 
     def show_home_page(self):
-        self.clear_content_frame()
+        self.pages.show("home", self.build_home_page)
 
+    def build_home_page(self, page):
         # Welcome Section
-        welcome_frame = ttk.Frame(self.content_frame, style='Card.TFrame', padding=20)
+        welcome_frame = ttk.Frame(page, style='Card.TFrame', padding=20)
         welcome_frame.pack(fill=tk.X, pady=10)
 
         welcome_label = ttk.Label(welcome_frame,
@@ -829,7 +3853,7 @@ class AcadInfoApp:
         welcome_label.pack()
 
         # Quick Actions
-        actions_frame = ttk.Frame(self.content_frame)
+        actions_frame = ttk.Frame(page)
         actions_frame.pack(fill=tk.X, pady=10)
 
         actions = [
@@ -849,7 +3873,7 @@ class AcadInfoApp:
             actions_frame.columnconfigure(i, weight=1)
 
         # Target Sports Section
-        sports_frame = ttk.LabelFrame(self.content_frame, text="Popular Sports", padding=10)
+        sports_frame = ttk.LabelFrame(page, text="Popular Sports", padding=10)
         sports_frame.pack(fill=tk.X, pady=10)
 
         sports_to_show = random.sample(self.sports, 5)  # Show 5 random sports
@@ -860,7 +3884,7 @@ class AcadInfoApp:
             sport_btn.pack(side=tk.LEFT, padx=5, pady=5)
 
         # Features Section
-        features_frame = ttk.LabelFrame(self.content_frame, text="Why Choose ACADINFO?", padding=10)
+        features_frame = ttk.LabelFrame(page, text="Why Choose ACADINFO?", padding=10)
         features_frame.pack(fill=tk.X, pady=10)
 
         features = [
@@ -877,7 +3901,7 @@ class AcadInfoApp:
             ttk.Label(features_frame, text=feature).pack(anchor=tk.W, pady=2)
 
         # Testimonials Section
-        testimonials_frame = ttk.LabelFrame(self.content_frame, text="What Our Users Say", padding=10)
+        testimonials_frame = ttk.LabelFrame(page, text="What Our Users Say", padding=10)
         testimonials_frame.pack(fill=tk.X, pady=10)
 
         testimonials_to_show = random.sample(self.testimonials, 2)  # Show 2 random testimonials
@@ -886,23 +3910,107 @@ class AcadInfoApp:
             card = ttk.Frame(testimonials_frame, style='Card.TFrame', padding=10)
             card.pack(side=tk.LEFT, padx=5, fill=tk.X, expand=True)
 
+            self.add_thumbnail(card, testimonial.get("image"), side=tk.LEFT, anchor=tk.N, padx=(0, 8))
             ttk.Label(card, text=f"\"{testimonial['text']}\"", font=('Arial', 10, 'italic'), wraplength=300).pack()
             ttk.Label(card, text=f"- {testimonial['name']}, {testimonial['role']}",
                       font=('Arial', 9, 'bold')).pack(anchor=tk.E, pady=(5, 0))
 
+    def add_thumbnail(self, parent, name, **pack):
+        """Pack a label showing the picture ``name`` into ``parent``; nothing is added if there is no such file"""
+        if not self.images.exists(name):
+            return None
+        label = ttk.Label(parent)
+
+        def show(name, photo):
+            if label.winfo_exists():
+                label.photo = photo  # Tk only holds the image by name
+                label.config(image=photo)
+
+        show(name, self.images.get(name, show))
+        label.pack(**pack)
+        return label
+
+    def show_search_results(self):
+        query = self.global_search_var.get().strip()
+        if not query:
+            return
+
+        # Results belong to one query, so this page is never reused
+        self.pages.drop("search")
+        self.pages.show("search", lambda page: self.build_search_results(page, query))
+
+    def build_search_results(self, page, query):
+        ttk.Label(page, text=f"Search results for \"{query}\"", style='Header.TLabel').pack(pady=10)
+
+        show_all = self.user_data.get("premium", False)
+        hits = self.catalog.search_index.search(query, limit=SEARCH_RESULT_LIMIT)
+        if not hits:
+            # Nothing matched exactly; try names within a few typos
+            hits = self.catalog.fuzzy_index.search(query, limit=SEARCH_RESULT_LIMIT)
+            if hits:
+                ttk.Label(page, text="No exact matches. Showing close spellings instead.").pack()
+        results = []
+        for score, (kind, doc_id) in hits:
+            record = self.catalog.document(kind, doc_id)
+            if kind == "course" and not show_all and record["price"] > FREE_TIER_MAX_COURSE_PRICE:
+                continue  # Same premium rule as the courses page
+            results.append((kind, record))
+
+        if not results:
+            no_results_frame = ttk.Frame(page, style='Card.TFrame', padding=20)
+            no_results_frame.pack(fill=tk.BOTH, expand=True, pady=20)
+
+            ttk.Label(no_results_frame, text="Nothing matched your search", font=('Arial', 12)).pack()
+            return
+
+        results_frame = ttk.Frame(page)
+        results_frame.pack(fill=tk.BOTH, expand=True)
+
+        for kind, record in results:
+            self.display_search_result_card(results_frame, kind, record)
+
+    def display_search_result_card(self, parent, kind, record):
+        card = ttk.Frame(parent, style='Card.TFrame', padding=10)
+        card.pack(fill=tk.X, pady=3)
+
+        info_frame = ttk.Frame(card)
+        info_frame.pack(side=tk.LEFT, fill=tk.X, expand=True)
+
+        if kind == "academy":
+            sport, state, city = self.catalog.academy_index.location(record)
+            title, details = record["name"], f"Academy | {sport} | {city}, {state} | Coach: {record['coach']}"
+            open_details = self.view_academy_details
+        elif kind == "course":
+            title, details = record["title"], f"Course | {record['sport']} | {record['duration']}"
+            open_details = self.show_course_details
+        elif kind == "webinar":
+            title, details = record["title"], f"Webinar | {record['date']} | {record['time']}"
+            open_details = self.show_webinar_details
+        else:
+            title, details = record["name"], f"Equipment | {record['category']} | ₹{record['price']}"
+            open_details = self.show_equipment_details
+
+        ttk.Label(info_frame, text=title, font=('Arial', 11, 'bold')).pack(anchor=tk.W)
+        ttk.Label(info_frame, text=details).pack(anchor=tk.W)
+
+        ttk.Button(card, text="View", style='Accent.TButton',
+                   command=lambda: open_details(record)).pack(side=tk.RIGHT)
+
     def show_find_academies_page(self):
-        self.clear_content_frame()
+        self.pages.show("academies", self.build_find_academies_page, refresh=self.apply_academy_filters)
 
-        ttk.Label(self.content_frame, text="Find Sports Academies", style='Header.TLabel').pack(pady=10)
+    def build_find_academies_page(self, page):
+        ttk.Label(page, text="Find Sports Academies", style='Header.TLabel').pack(pady=10)
 
         # Search Form
-        form_frame = ttk.Frame(self.content_frame, style='Card.TFrame', padding=15)
+        form_frame = ttk.Frame(page, style='Card.TFrame', padding=15)
         form_frame.pack(pady=10, fill=tk.X)
 
         # State Selection
         ttk.Label(form_frame, text="Select State:").grid(row=0, column=0, padx=5, pady=5, sticky=tk.E)
         self.state_var = tk.StringVar()
-        state_dropdown = ttk.Combobox(form_frame, textvariable=self.state_var, values=list(self.states.keys()))
+        state_dropdown = ttk.Combobox(form_frame, textvariable=self.state_var,
+                                      values=[ANY_OPTION] + list(self.states.keys()))
         state_dropdown.grid(row=0, column=1, padx=5, pady=5, sticky=tk.EW)
         state_dropdown.set("Select state")
 
@@ -915,38 +4023,233 @@ class AcadInfoApp:
         # Sport Selection
         ttk.Label(form_frame, text="Select Sport:").grid(row=2, column=0, padx=5, pady=5, sticky=tk.E)
         self.sport_var = tk.StringVar()
-        sport_dropdown = ttk.Combobox(form_frame, textvariable=self.sport_var, values=self.sports)
+        sport_dropdown = ttk.Combobox(form_frame, textvariable=self.sport_var, values=[ANY_OPTION] + self.sports)
         sport_dropdown.grid(row=2, column=1, padx=5, pady=5, sticky=tk.EW)
         sport_dropdown.set("Select sport")
 
+        # Distance from the selected city, across state borders
+        ttk.Label(form_frame, text="Within:").grid(row=3, column=0, padx=5, pady=5, sticky=tk.E)
+        self.radius_var = tk.StringVar()
+        radius_dropdown = ttk.Combobox(form_frame, textvariable=self.radius_var, state='readonly',
+                                       values=[ANY_OPTION] + [f"{km} km" for km in SEARCH_RADII_KM])
+        radius_dropdown.grid(row=3, column=1, padx=5, pady=5, sticky=tk.EW)
+        radius_dropdown.set(ANY_OPTION)
+
+        # Result order; distance needs a city to measure from and otherwise falls back to rating
+        ttk.Label(form_frame, text="Sort by:").grid(row=4, column=0, padx=5, pady=5, sticky=tk.E)
+        self.academy_sort_var = tk.StringVar(value="Distance")
+        sort_dropdown = ttk.Combobox(form_frame, textvariable=self.academy_sort_var, state='readonly',
+                                     values=["Distance"] + list(Catalog.SORTS["academies"]))
+        sort_dropdown.grid(row=4, column=1, padx=5, pady=5, sticky=tk.EW)
+        sort_dropdown.bind("<<ComboboxSelected>>", lambda event: self.apply_academy_filters())
+
+        # Academy name lookup
+        ttk.Label(form_frame, text="Academy Name:").grid(row=5, column=0, padx=5, pady=5, sticky=tk.E)
+        self.academy_name_var = tk.StringVar()
+        academy_dropdown = ttk.Combobox(form_frame, textvariable=self.academy_name_var)
+        academy_dropdown.grid(row=5, column=1, padx=5, pady=5, sticky=tk.EW)
+
         # Configure grid weights
         form_frame.columnconfigure(1, weight=1)
 
         # Bind state selection to update cities
         state_dropdown.bind("<<ComboboxSelected>>", self.update_cities)
+        academy_dropdown.bind("<<ComboboxSelected>>", lambda event: self.open_academy_by_name(academy_dropdown.get()))
+
+        # Typing narrows each list to its best-ranked completions
+        self.bind_typeahead(state_dropdown, lambda typed: self.typeahead("state").complete(typed),
+                            lambda: [ANY_OPTION] + list(self.states.keys()),
+                            on_choose=lambda value: self.update_cities(None))
+        self.bind_typeahead(self.city_dropdown,
+                            lambda typed: self.typeahead("city", self.state_var.get()).complete(typed),
+                            lambda: [ANY_OPTION] + self.states.get(self.state_var.get(), []))
+        self.bind_typeahead(sport_dropdown, lambda typed: self.typeahead("sport").complete(typed),
+                            lambda: [ANY_OPTION] + self.sports)
+        self.bind_typeahead(academy_dropdown, self.complete_academy_names,
+                            lambda: self.complete_academy_names(""),
+                            on_choose=self.open_academy_by_name)
 
         # Search Button
-        search_btn = ttk.Button(self.content_frame, text="Search Academies",
+        search_btn = ttk.Button(page, text="Search Academies",
                                 style='Accent.TButton', command=self.search_academies)
         search_btn.pack(pady=10)
 
-        # Results Frame
-        self.results_frame = ttk.Frame(self.content_frame)
+        self.build_academy_filters(page)
+
+        # Results Frame; the summary, list and no-results panel are reused by every search
+        self.results_frame = ttk.Frame(page)
         self.results_frame.pack(fill=tk.BOTH, expand=True, pady=10)
+        self.academy_summary = ttk.Label(self.results_frame, font=('Arial', 12, 'bold'))
+        self.academy_list = VirtualList(self.results_frame, lambda parent: AcademyCard(parent, self),
+                                        ACADEMY_ROW_HEIGHT)
+        self.academy_empty = ttk.Frame(self.results_frame, style='Card.TFrame', padding=20)
+
+    def catalog_changed(self, kind, groups):
+        # Queries over a single sport or category, plus the ones spanning all of them
+        self.query_cache.invalidate(*[(kind, group) for group in groups | {None}])
+        self.pages.invalidate(CATALOG_PAGES[kind])
+        if kind == "academy":
+            self._typeahead.clear()
+
+    def build_academy_filters(self, page):
+        """Filter panel whose options show how many of the current results each would keep"""
+        filter_frame = ttk.LabelFrame(page, text="Filters", padding=10)
+        filter_frame.pack(fill=tk.X, pady=5)
+
+        self.facet_vars = {}
+        self.facet_widgets = {}
+        self.rating_filter_var = tk.StringVar(value=ANY_OPTION)
+
+        def checkbox_row(row, title, facet, options):
+            ttk.Label(filter_frame, text=title).grid(row=row, column=0, padx=5, pady=2, sticky=tk.W)
+            for column, (value, label) in enumerate(options, 1):
+                var = tk.BooleanVar()
+                widget = ttk.Checkbutton(filter_frame, text=label, variable=var, command=self.apply_academy_filters)
+                widget.grid(row=row, column=column, padx=5, pady=2, sticky=tk.W)
+                self.facet_vars[facet, value] = var
+                self.facet_widgets[facet, value] = (widget, label)
+
+        checkbox_row(0, "Fees:", "fee", [(label, label) for _, _, label in FEE_BANDS])
+        checkbox_row(1, "Facilities:", "facility", FACILITY_FILTERS)
+        checkbox_row(2, "Timings:", "batch", BATCH_FILTERS)
+
+        ttk.Label(filter_frame, text="Rating:").grid(row=3, column=0, padx=5, pady=2, sticky=tk.W)
+        for column, value in enumerate((ANY_OPTION,) + RATING_LEVELS, 1):
+            label = value if value == ANY_OPTION else f"{value}+"
+            widget = ttk.Radiobutton(filter_frame, text=label, value=str(value), variable=self.rating_filter_var,
+                                     command=self.apply_academy_filters)
+            widget.grid(row=3, column=column, padx=5, pady=2, sticky=tk.W)
+            if value != ANY_OPTION:
+                self.facet_widgets["rating", value] = (widget, label)
+
+    def apply_academy_filters(self):
+        # Filters refine an existing search; before one has run there is nothing to narrow
+        if "Select" not in (self.state_var.get() + self.city_var.get() + self.sport_var.get()):
+            self.search_academies()
+
+    def selected_academy_facets(self):
+        selected = {}
+        for (facet, value), var in self.facet_vars.items():
+            if var.get():
+                selected.setdefault(facet, []).append(value)
+        if self.rating_filter_var.get() != ANY_OPTION:
+            selected["rating"] = [float(self.rating_filter_var.get())]
+        return selected
+
+    def find_academies(self, sport, state, city, origin, radius_km, selected):
+        """Return ``(academies, distances, facet counts)`` for a search; ``None`` fields match anything"""
+        if radius_km is not None:
+            academies = [academy for _, academy in
+                         self.catalog.academies_near(*origin, radius_km=radius_km, sport=sport)]
+        else:
+            academies = self.catalog.academy_index.lookup(sport, state, city)
+
+        # Apply the filter panel, keeping the order
+        facets = self.catalog.facet_index
+        matches, counts = facets.query(selected, base=facets.mask(academy["id"] for academy in academies))
+        kept = {academy["id"] for academy in matches}
+        academies = [academy for academy in academies if academy["id"] in kept]
+
+        distances = {}
+        if origin is not None:
+            distances = {academy["id"]: distance_km(*origin, academy["lat"], academy["lon"])
+                         for academy in academies if academy.get("lat") is not None}
+        return academies, distances, counts
+
+    def typeahead(self, kind, state=None):
+        """Prefix index for a search field; places and sports rank by academy count, academies by rating"""
+        key = (kind, state)
+        index = self._typeahead.get(key)
+        if index is None:
+            index = PrefixIndex()
+            academies = self.catalog.academy_index
+            if kind == "state":
+                for name in self.states:
+                    index.add(name, len(academies.lookup(state=name)))
+            elif kind == "city":
+                for city in self.states.get(state, []):
+                    index.add(city, len(academies.lookup(state=state, city=city)))
+            elif kind == "sport":
+                for sport in self.sports:
+                    index.add(sport, len(academies.lookup(sport=sport)))
+            else:
+                for academy in academies.lookup():
+                    index.add(academy["name"], academy["rating"], academy["id"])
+            self._typeahead[key] = index
+        return index
+
+    def bind_typeahead(self, combobox, complete, all_values, on_choose=None):
+        """Replace a combobox's choices with ranked completions as the user types.
+
+        Enter accepts the best completion.
+        """
+        def refresh(event):
+            if event.keysym in TYPEAHEAD_IGNORED_KEYS:
+                return
+            typed = combobox.get()
+            combobox['values'] = complete(typed) if typed.strip() else all_values()
+
+        def accept(event):
+            typed = combobox.get()
+            if typed not in all_values():
+                completions = complete(typed)
+                if completions:
+                    combobox.set(completions[0])
+            if on_choose is not None:
+                on_choose(combobox.get())
+            return "break"
+
+        combobox.bind('<KeyRelease>', refresh)
+        combobox.bind('<Return>', accept)
+
+    def complete_academy_names(self, typed):
+        index = self.catalog.academy_index
+        if not typed.strip():
+            # Best rated first before anything is typed
+            ranked = sorted(index.lookup(), key=lambda academy: academy["rating"], reverse=True)
+            return [academy["name"] for academy in ranked[:PrefixIndex.DEFAULT_K]]
+        names = [index.resolve(academy_id)[3]["name"] for academy_id in self.typeahead("academy").complete(typed)]
+        if not names:
+            # Fall back to close spellings of the academy name or its coach
+            names = [index.resolve(doc_id)[3]["name"]
+                     for _, (kind, doc_id) in self.catalog.fuzzy_index.search(typed, limit=PrefixIndex.DEFAULT_K)
+                     if kind == "academy"]
+        return names
+
+    def open_academy_by_name(self, name):
+        ids = self.typeahead("academy").complete(name)
+        index = self.catalog.academy_index
+        for academy_id in ids:
+            academy = index.resolve(academy_id)[3]
+            if academy["name"] == name:
+                self.view_academy_details(academy)
+                return
 
     def update_cities(self, event):
         state = self.state_var.get()
         if state in self.states:
-            self.city_dropdown['values'] = self.states[state]
+            self.city_dropdown['values'] = [ANY_OPTION] + self.states[state]
             self.city_dropdown['state'] = 'readonly'
             self.city_dropdown.set("Select city")
         else:
             self.city_dropdown['values'] = []
+            self.city_dropdown.set(ANY_OPTION if state == ANY_OPTION else "")
             self.city_dropdown['state'] = 'disabled'
 
+    def show_sport_academies(self, sport):
+        """Open Find Academies listing every academy for ``sport``"""
+        self.show_find_academies_page()
+        self.state_var.set(ANY_OPTION)
+        self.update_cities(None)
+        self.sport_var.set(sport)
+        self.search_academies()
+
     def search_academies(self):
-        # Clear previous results
+        # Hide previous results
+        self.academy_list.cancel()
         for widget in self.results_frame.winfo_children():
+            widget.pack_forget()
+        for widget in self.academy_empty.winfo_children():
             widget.destroy()
 
         state = self.state_var.get()
@@ -954,19 +4257,44 @@ class AcadInfoApp:
         sport = self.sport_var.get()
 
         if state == "Select state" or city == "Select city" or sport == "Select sport":
-            messagebox.showerror("Error", "Please select state, city and sport")
+            messagebox.showerror("Error", f"Please select state, city and sport (or {ANY_OPTION})")
             return
 
-        # Find academies (in a real app this would query a database)
-        academies = []
-        if sport in self.academies and state in self.academies[sport]:
-            academies = self.academies[sport][state]
+        # "Any" (or a city left blank) matches everything for that field
+        def wildcard(value):
+            return None if value in (ANY_OPTION, "") else value
+
+        # Distances are measured from the selected city's centre when we know where it is
+        origin = self.catalog.city_location(city) if wildcard(city) else None
+        radius = self.radius_var.get()
+        if radius != ANY_OPTION:
+            if origin is None:
+                messagebox.showerror("Error", "Select a city to search around")
+                return
+        radius_km = float(radius.split()[0]) if radius != ANY_OPTION else None
+        sport_filter = wildcard(sport)
+
+        selected = self.selected_academy_facets()
+        key = ("academies", sport_filter, wildcard(state), wildcard(city), radius_km,
+               tuple(sorted((facet, tuple(values)) for facet, values in selected.items())),
+               self.user_data.get("premium", False))
+        academies, distances, counts = self.query_cache.get(
+            key, lambda: self.find_academies(sport_filter, wildcard(state), wildcard(city), origin, radius_km,
+                                             selected),
+            tags=[("academy", sport_filter)])
+        for (facet, value), (widget, label) in self.facet_widgets.items():
+            widget.config(text=f"{label} ({counts.get(facet, {}).get(value, 0)})")
+        sport = sport if wildcard(sport) else "all sports"
+        if radius != ANY_OPTION:
+            place = f"{radius} of {city}"
+        else:
+            place = ", ".join(value for value in (wildcard(city), wildcard(state)) if value) or "all locations"
 
         if not academies:
-            no_results_frame = ttk.Frame(self.results_frame, style='Card.TFrame', padding=20)
+            no_results_frame = self.academy_empty
             no_results_frame.pack(fill=tk.BOTH, expand=True, pady=20)
 
-            ttk.Label(no_results_frame, text=f"No academies found for {sport} in {city}, {state}",
+            ttk.Label(no_results_frame, text=f"No academies found for {sport} in {place}",
                       font=('Arial', 12)).pack()
 
             suggest_label = ttk.Label(no_results_frame,
@@ -977,48 +4305,36 @@ class AcadInfoApp:
             notify_btn = ttk.Button(no_results_frame, text="Notify Me", style='Accent.TButton',
                                     command=lambda: self.request_notification(sport, city, state))
             notify_btn.pack()
-            return
-
-        results_label = ttk.Label(self.results_frame,
-                                  text=f"Found {len(academies)} academies for {sport} in {city}, {state}:",
-                                  font=('Arial', 12, 'bold'))
-        results_label.pack(pady=10, anchor=tk.W)
-
-        for academy in academies:
-            academy_frame = ttk.Frame(self.results_frame, style='Card.TFrame', padding=10)
-            academy_frame.pack(fill=tk.X, pady=5)
-
-            # Academy info
-            info_frame = ttk.Frame(academy_frame)
-            info_frame.pack(side=tk.LEFT, fill=tk.X, expand=True)
 
-            ttk.Label(info_frame, text=academy["name"], font=('Arial', 12, 'bold')).pack(anchor=tk.W)
-            ttk.Label(info_frame, text=f"Coach: {academy['coach']} | Established: {academy['established']}").pack(
-                anchor=tk.W)
-            ttk.Label(info_frame, text=f"Facilities: {', '.join(academy['facilities'])}", wraplength=400).pack(
-                anchor=tk.W)
-
-            # Rating and actions
-            action_frame = ttk.Frame(academy_frame)
-            action_frame.pack(side=tk.RIGHT)
-
-            # Rating (random for demo)
-            rating_frame = ttk.Frame(action_frame)
-            rating_frame.pack(pady=5)
-
-            ttk.Label(rating_frame, text=f"⭐ {academy['rating']}/5.0").pack(side=tk.LEFT)
+            if origin is not None:
+                nearest = self.catalog.academies_near(*origin, sport=sport_filter, k=3)
+                if nearest:
+                    ttk.Label(no_results_frame, text=f"Closest academies for {sport}:",
+                              font=('Arial', 10, 'bold')).pack(pady=(15, 5))
+                for distance, academy in nearest:
+                    row = ttk.Frame(no_results_frame)
+                    row.pack(fill=tk.X, pady=2)
+                    ttk.Label(row, text=f"{academy['name']} ({distance:.0f} km)").pack(side=tk.LEFT)
+                    ttk.Button(row, text="View Details",
+                               command=lambda a=academy: self.view_academy_details(a)).pack(side=tk.RIGHT)
+            return
 
-            # Buttons
-            btn_frame = ttk.Frame(action_frame)
-            btn_frame.pack()
+        self.academy_results = (academies, distances, f"Found {len(academies)} academies for {sport} in {place}:")
+        self.show_academy_results()
 
-            view_btn = ttk.Button(btn_frame, text="View Details",
-                                  command=lambda a=academy: self.view_academy_details(a))
-            view_btn.pack(side=tk.LEFT, padx=5)
+    def show_academy_results(self):
+        academies, distances, summary = self.academy_results
+        sort = self.academy_sort_var.get()
+        if sort == "Distance" and distances:
+            sort_key = lambda academy: distances.get(academy["id"], math.inf)
+        else:
+            sort_key = Catalog.SORTS["academies"].get(sort, Catalog.SORTS["academies"]["Rating"])
 
-            register_btn = ttk.Button(btn_frame, text="Register", style='Accent.TButton',
-                                      command=lambda a=academy: self.register_for_academy(a))
-            register_btn.pack(side=tk.LEFT, padx=5)
+        self.academy_empty.pack_forget()
+        self.academy_summary.config(text=summary)
+        self.academy_summary.pack(pady=10, anchor=tk.W)
+        self.academy_list.pack(fill=tk.BOTH, expand=True)
+        self.academy_list.load(sorted_pages(academies, sort_key), len(academies))
 
     def request_notification(self, sport, city, state):
         messagebox.showinfo("Notification Request",
@@ -1171,33 +4487,34 @@ class AcadInfoApp:
                                        f"Fees: {academy['fees']}\n\n"
                                        "You will receive contact information to complete your registration.")
         if response:
-            # Add to user's bookings
+            # Add to user's bookings; the ID resolves back to the academy in O(1)
+            sport, _, _ = self.catalog.academy_index.location(academy)
             booking = {
                 "type": "academy",
+                "academy_id": academy["id"],
                 "name": academy["name"],
-                "sport": next((sport for sport, academies in self.academies.items()
-                               if academy in academies.get(self.state_var.get(), [])), "Unknown"),
+                "sport": sport,
                 "date": datetime.now().strftime("%Y-%m-%d"),
                 "status": "Pending"
             }
 
-            self.users[self.current_user]["bookings"].append(booking)
-            self.save_users()
+            self.add_booking(booking)
 
             messagebox.showinfo("Success",
                                 f"Registration request sent for {academy['name']}!\n\n"
                                 "The academy will contact you shortly with further details.")
 
     def show_courses_page(self):
-        self.clear_content_frame()
+        self.pages.show("courses", self.build_courses_page, refresh=self.filter_courses)
 
-        ttk.Label(self.content_frame, text="Available Courses", style='Header.TLabel').pack(pady=10)
+    def build_courses_page(self, page):
+        ttk.Label(page, text="Available Courses", style='Header.TLabel').pack(pady=10)
 
         # Filter for premium users
         show_all = self.user_data.get("premium", False)
 
         # Search and filter frame
-        filter_frame = ttk.Frame(self.content_frame)
+        filter_frame = ttk.Frame(page)
         filter_frame.pack(fill=tk.X, pady=10)
 
         ttk.Label(filter_frame, text="Filter by Sport:").pack(side=tk.LEFT, padx=5)
@@ -1209,93 +4526,66 @@ class AcadInfoApp:
         sport_filter.pack(side=tk.LEFT, padx=5)
         sport_filter.set("All")
 
+        ttk.Label(filter_frame, text="Max price ₹:").pack(side=tk.LEFT, padx=5)
+        self.course_max_price = tk.StringVar()
+        ttk.Entry(filter_frame, textvariable=self.course_max_price, width=8).pack(side=tk.LEFT, padx=5)
+
+        ttk.Label(filter_frame, text="Sort by:").pack(side=tk.LEFT, padx=5)
+        self.course_sort = tk.StringVar(value="Rating")
+        ttk.Combobox(filter_frame, textvariable=self.course_sort, state='readonly', width=10,
+                     values=list(Catalog.SORTS["courses"])).pack(side=tk.LEFT, padx=5)
+
         ttk.Button(filter_frame, text="Apply Filter", style='Accent.TButton',
                    command=self.filter_courses).pack(side=tk.LEFT, padx=10)
 
-        # Courses container
-        self.courses_container = ttk.Frame(self.content_frame)
+        # Courses container, with a grid of cards (3 per row) that every filter refresh rebinds
+        self.courses_container = ttk.Frame(page)
         self.courses_container.pack(fill=tk.BOTH, expand=True)
+        self.course_list = VirtualList(self.courses_container, lambda parent: CourseCard(parent, self),
+                                       COURSE_ROW_HEIGHT, columns=3)
+        self.courses_empty = ttk.Frame(self.courses_container, style='Card.TFrame', padding=20)
+        ttk.Label(self.courses_empty, text="No courses found matching your criteria", font=('Arial', 12)).pack()
 
         # Show all courses initially
         self.filter_courses()
 
     def filter_courses(self):
-        # Clear previous courses
-        for widget in self.courses_container.winfo_children():
-            widget.destroy()
-
         sport_filter = self.course_sport_filter.get()
         show_all = self.user_data.get("premium", False)
 
-        filtered_courses = []
-        for course in self.courses.values():
-            if sport_filter == "All" or course["sport"] == sport_filter:
-                if show_all or course["price"] <= 1000:  # Hide expensive courses for non-premium
-                    filtered_courses.append(course)
-
-        if not filtered_courses:
-            no_results_frame = ttk.Frame(self.courses_container, style='Card.TFrame', padding=20)
-            no_results_frame.pack(fill=tk.BOTH, expand=True, pady=20)
-
-            ttk.Label(no_results_frame, text="No courses found matching your criteria",
-                      font=('Arial', 12)).pack()
-            return
-
-        # Display courses in a grid
-        rows = (len(filtered_courses) + 2) // 3  # 3 columns
-        for i in range(rows):
-            row_frame = ttk.Frame(self.courses_container)
-            row_frame.pack(fill=tk.X, pady=5)
-
-            for j in range(3):
-                idx = i * 3 + j
-                if idx >= len(filtered_courses):
-                    break
-
-                course = filtered_courses[idx]
-                self.display_course_card(row_frame, course)
-
-    def display_course_card(self, parent, course):
-        card = ttk.Frame(parent, style='Card.TFrame', padding=10)
-        card.pack(side=tk.LEFT, padx=5, fill=tk.BOTH, expand=True)
+        sport = None if sport_filter == "All" else sport_filter
+        equals = {"sport": sport} if sport else {}
+        # Expensive courses are hidden for non-premium members
+        price_cap = None if show_all else FREE_TIER_MAX_COURSE_PRICE
+        max_price = self.price_limit(self.course_max_price)
+        if max_price is not None:
+            price_cap = max_price if price_cap is None else min(price_cap, max_price)
+        ranges = {} if price_cap is None else {"price": (None, price_cap)}
 
-        # Course title
-        ttk.Label(card, text=course["title"], font=('Arial', 12, 'bold'), wraplength=200).pack(anchor=tk.W)
+        sort = self.course_sort.get()
 
-        # Course info
-        ttk.Label(card, text=f"Sport: {course['sport']}").pack(anchor=tk.W)
-        ttk.Label(card, text=f"Duration: {course['duration']}").pack(anchor=tk.W)
-        ttk.Label(card, text=f"Instructor: {course['instructor']}").pack(anchor=tk.W)
+        def query(cursor):
+            return self.query_cache.get(
+                ("courses", sport, price_cap, sort, cursor, show_all),
+                lambda: self.catalog.page("courses", sort, equals, ranges, after=cursor), tags=[("course", sport)])
 
-        # Rating
-        ttk.Label(card, text=f"⭐ {course['rating']} ({course['students']} students)").pack(anchor=tk.W, pady=5)
-
-        # Price and button
-        price_frame = ttk.Frame(card)
-        price_frame.pack(fill=tk.X, pady=5)
-
-        if self.user_data.get("premium", False):
-            price_text = "FREE (Premium)"
-        else:
-            price_text = f"₹{course['price']}"
-
-        ttk.Label(price_frame, text=price_text, font=('Arial', 12, 'bold')).pack(side=tk.LEFT)
-
-        btn_frame = ttk.Frame(price_frame)
-        btn_frame.pack(side=tk.RIGHT)
+        total = query(None)[2]
 
-        details_btn = ttk.Button(btn_frame, text="Details",
-                                 command=lambda c=course: self.show_course_details(c))
-        details_btn.pack(side=tk.LEFT, padx=2)
+        if not total:
+            self.course_list.cancel()
+            self.course_list.pack_forget()
+            self.courses_empty.pack(fill=tk.BOTH, expand=True, pady=20)
+            return
 
-        if self.user_data.get("premium", False):
-            enroll_text = "Enroll"
-        else:
-            enroll_text = "Enroll Now"
+        self.courses_empty.pack_forget()
+        self.course_list.pack(fill=tk.BOTH, expand=True)
+        self.course_list.load(lambda cursor: query(cursor)[:2], total)
 
-        enroll_btn = ttk.Button(btn_frame, text=enroll_text, style='Accent.TButton',
-                                command=lambda c=course: self.enroll_in_course(c))
-        enroll_btn.pack(side=tk.LEFT, padx=2)
+    @staticmethod
+    def price_limit(var):
+        """Whole rupee amount typed into a price filter, or None when it is blank or not a number"""
+        text = var.get().replace(",", "").replace("₹", "").strip()
+        return int(text) if text.isdigit() else None
 
     def show_course_details(self, course):
         details_window = tk.Toplevel(self.root)
@@ -1366,8 +4656,7 @@ class AcadInfoApp:
                     "status": "Enrolled"
                 }
 
-                self.users[self.current_user]["bookings"].append(booking)
-                self.save_users()
+                self.add_booking(booking)
 
                 messagebox.showinfo("Enrolled",
                                     f"You have been enrolled in '{course['title']}'\n\n"
@@ -1387,8 +4676,7 @@ class AcadInfoApp:
                     "status": "Payment Pending"
                 }
 
-                self.users[self.current_user]["bookings"].append(booking)
-                self.save_users()
+                self.add_booking(booking)
 
                 messagebox.showinfo("Payment",
                                     "Redirecting to payment gateway...\n\n"
@@ -1397,12 +4685,13 @@ class AcadInfoApp:
                     window.destroy()
 
     def show_webinars_page(self):
-        self.clear_content_frame()
+        self.pages.show("webinars", self.build_webinars_page, refresh=self.filter_webinars)
 
-        ttk.Label(self.content_frame, text="Upcoming Webinars", style='Header.TLabel').pack(pady=10)
+    def build_webinars_page(self, page):
+        ttk.Label(page, text="Upcoming Webinars", style='Header.TLabel').pack(pady=10)
 
         # Search and filter frame
-        filter_frame = ttk.Frame(self.content_frame)
+        filter_frame = ttk.Frame(page)
         filter_frame.pack(fill=tk.X, pady=10)
 
         ttk.Label(filter_frame, text="Filter by Date:").pack(side=tk.LEFT, padx=5)
@@ -1416,66 +4705,38 @@ class AcadInfoApp:
         ttk.Button(filter_frame, text="Apply Filter", style='Accent.TButton',
                    command=self.filter_webinars).pack(side=tk.LEFT, padx=10)
 
-        # Webinars container
-        self.webinars_container = ttk.Frame(self.content_frame)
+        # Webinars container, with a list of cards that every filter refresh rebinds
+        self.webinars_container = ttk.Frame(page)
         self.webinars_container.pack(fill=tk.BOTH, expand=True)
+        self.webinar_list = VirtualList(self.webinars_container, lambda parent: WebinarCard(parent, self),
+                                        WEBINAR_ROW_HEIGHT)
+        self.webinars_empty = ttk.Frame(self.webinars_container, style='Card.TFrame', padding=20)
+        ttk.Label(self.webinars_empty, text="No webinars found matching your criteria", font=('Arial', 12)).pack()
 
         # Show all webinars initially
         self.filter_webinars()
 
     def filter_webinars(self):
-        # Clear previous webinars
-        for widget in self.webinars_container.winfo_children():
-            widget.destroy()
-
         date_filter = self.webinar_date_filter.get()
 
-        # In a real app, we would filter by actual dates
-        filtered_webinars = list(self.webinars.values())
+        # The window is cached per filter and day; sessions that have started since are dropped on each refresh
+        now = datetime.now()
+        today = datetime.combine(now.date(), datetime.min.time())
+        start, end = webinar_window(date_filter, today)
+        scheduled = self.query_cache.get(("webinars", date_filter, today),
+                                         lambda: self.catalog.webinars_between(start, end), tags=[("webinar", None)])
+        # Webinars that have already started are never listed
+        filtered_webinars = list(itertools.dropwhile(lambda webinar: webinar.starts_at <= now, scheduled))
 
         if not filtered_webinars:
-            no_results_frame = ttk.Frame(self.webinars_container, style='Card.TFrame', padding=20)
-            no_results_frame.pack(fill=tk.BOTH, expand=True, pady=20)
-
-            ttk.Label(no_results_frame, text="No webinars found matching your criteria",
-                      font=('Arial', 12)).pack()
+            self.webinar_list.cancel()
+            self.webinar_list.pack_forget()
+            self.webinars_empty.pack(fill=tk.BOTH, expand=True, pady=20)
             return
 
-        # Display webinars
-        for webinar in filtered_webinars:
-            self.display_webinar_card(webinar)
-
-    def display_webinar_card(self, webinar):
-        card = ttk.Frame(self.webinars_container, style='Card.TFrame', padding=10)
-        card.pack(fill=tk.X, pady=5)
-
-        # Webinar info
-        info_frame = ttk.Frame(card)
-        info_frame.pack(side=tk.LEFT, fill=tk.X, expand=True)
-
-        ttk.Label(info_frame, text=webinar["title"], font=('Arial', 12, 'bold')).pack(anchor=tk.W)
-        ttk.Label(info_frame, text=f"Date: {webinar['date']} | Time: {webinar['time']}").pack(anchor=tk.W)
-        ttk.Label(info_frame, text=f"Instructor: {webinar['instructor']}").pack(anchor=tk.W)
-        ttk.Label(info_frame,
-                  text=f"Seats available: {webinar['seats'] - webinar['registered']}/{webinar['seats']}").pack(
-            anchor=tk.W)
-
-        # Price and button
-        price_frame = ttk.Frame(card)
-        price_frame.pack(side=tk.RIGHT)
-
-        ttk.Label(price_frame, text=f"₹{webinar['price']}", font=('Arial', 12, 'bold')).pack()
-
-        btn_frame = ttk.Frame(price_frame)
-        btn_frame.pack(pady=5)
-
-        details_btn = ttk.Button(btn_frame, text="Details",
-                                 command=lambda w=webinar: self.show_webinar_details(w))
-        details_btn.pack(side=tk.LEFT, padx=2)
-
-        book_btn = ttk.Button(btn_frame, text="Book Now", style='Accent.TButton',
-                              command=lambda w=webinar: self.book_webinar(w))
-        book_btn.pack(side=tk.LEFT, padx=2)
+        self.webinars_empty.pack_forget()
+        self.webinar_list.pack(fill=tk.BOTH, expand=True)
+        self.webinar_list.load(offset_pages(filtered_webinars), len(filtered_webinars))
 
     def show_webinar_details(self, webinar):
         details_window = tk.Toplevel(self.root)
@@ -1523,6 +4784,10 @@ class AcadInfoApp:
             messagebox.showerror("Error", "Please login to book webinars")
             return
 
+        if webinar.starts_at is not None and webinar.starts_at <= datetime.now():
+            messagebox.showerror("Error", "This webinar has already started")
+            return
+
         seats_available = webinar["seats"] - webinar["registered"]
         if seats_available <= 0:
             messagebox.showerror("Error", "This webinar is fully booked")
@@ -1543,11 +4808,10 @@ class AcadInfoApp:
                 "status": "Confirmed"
             }
 
-            self.users[self.current_user]["bookings"].append(booking)
-            self.save_users()
+            self.add_booking(booking)
 
             # Update webinar registration count (in a real app, this would be in a database)
-            webinar["registered"] += 1
+            self.catalog.update_record("webinar", webinar, {"registered": webinar["registered"] + 1})
 
             messagebox.showinfo("Booking Confirmed",
                                 f"You have successfully booked '{webinar['title']}'\n\n"
@@ -1556,12 +4820,13 @@ class AcadInfoApp:
                 window.destroy()
 
     def show_equipment_page(self):
-        self.clear_content_frame()
+        self.pages.show("equipment", self.build_equipment_page, refresh=self.filter_equipment)
 
-        ttk.Label(self.content_frame, text="Sports Equipment Store", style='Header.TLabel').pack(pady=10)
+    def build_equipment_page(self, page):
+        ttk.Label(page, text="Sports Equipment Store", style='Header.TLabel').pack(pady=10)
 
         # Search and filter frame
-        filter_frame = ttk.Frame(self.content_frame)
+        filter_frame = ttk.Frame(page)
         filter_frame.pack(fill=tk.X, pady=10)
 
         ttk.Label(filter_frame, text="Filter by Category:").pack(side=tk.LEFT, padx=5)
@@ -1573,88 +4838,67 @@ class AcadInfoApp:
         category_filter.pack(side=tk.LEFT, padx=5)
         category_filter.set("All")
 
+        ttk.Label(filter_frame, text="Max price ₹:").pack(side=tk.LEFT, padx=5)
+        self.equipment_max_price = tk.StringVar()
+        ttk.Entry(filter_frame, textvariable=self.equipment_max_price, width=8).pack(side=tk.LEFT, padx=5)
+
+        self.equipment_in_stock = tk.BooleanVar()
+        ttk.Checkbutton(filter_frame, text="In stock", variable=self.equipment_in_stock).pack(side=tk.LEFT, padx=5)
+
+        ttk.Label(filter_frame, text="Sort by:").pack(side=tk.LEFT, padx=5)
+        self.equipment_sort = tk.StringVar(value="Rating")
+        ttk.Combobox(filter_frame, textvariable=self.equipment_sort, state='readonly', width=10,
+                     values=list(Catalog.SORTS["equipment"])).pack(side=tk.LEFT, padx=5)
+
         ttk.Button(filter_frame, text="Apply Filter", style='Accent.TButton',
                    command=self.filter_equipment).pack(side=tk.LEFT, padx=10)
 
-        # Equipment container
-        self.equipment_container = ttk.Frame(self.content_frame)
+        # Equipment container, with a grid of cards (3 per row) that every filter refresh rebinds
+        self.equipment_container = ttk.Frame(page)
         self.equipment_container.pack(fill=tk.BOTH, expand=True)
+        self.equipment_list = VirtualList(self.equipment_container, lambda parent: EquipmentCard(parent, self),
+                                          EQUIPMENT_ROW_HEIGHT, columns=3)
+        self.equipment_empty = ttk.Frame(self.equipment_container, style='Card.TFrame', padding=20)
+        ttk.Label(self.equipment_empty, text="No equipment found matching your criteria",
+                  font=('Arial', 12)).pack()
 
         # Show all equipment initially
         self.filter_equipment()
 
     def filter_equipment(self):
-        # Clear previous equipment
-        for widget in self.equipment_container.winfo_children():
-            widget.destroy()
-
         category_filter = self.equip_category_filter.get()
 
-        filtered_equipment = []
-        for item in self.equipment.values():
-            if category_filter == "All" or item["category"] == category_filter:
-                filtered_equipment.append(item)
-
-        if not filtered_equipment:
-            no_results_frame = ttk.Frame(self.equipment_container, style='Card.TFrame', padding=20)
-            no_results_frame.pack(fill=tk.BOTH, expand=True, pady=20)
-
-            ttk.Label(no_results_frame, text="No equipment found matching your criteria",
-                      font=('Arial', 12)).pack()
+        category = None if category_filter == "All" else category_filter
+        equals = {"category": category} if category else {}
+        # Price filters apply to the price after discount
+        max_price = self.price_limit(self.equipment_max_price)
+        in_stock = self.equipment_in_stock.get()
+        ranges = {}
+        if max_price is not None:
+            ranges["discounted_price"] = (None, max_price)
+        if in_stock:
+            ranges["stock"] = (1, None)
+
+        sort = self.equipment_sort.get()
+        premium = self.user_data.get("premium", False)
+
+        def query(cursor):
+            return self.query_cache.get(
+                ("equipment", category, max_price, in_stock, sort, cursor, premium),
+                lambda: self.catalog.page("equipment", sort, equals, ranges, after=cursor),
+                tags=[("equipment", category)])
+
+        total = query(None)[2]
+
+        if not total:
+            self.equipment_list.cancel()
+            self.equipment_list.pack_forget()
+            self.equipment_empty.pack(fill=tk.BOTH, expand=True, pady=20)
             return
 
-        # Display equipment in a grid
-        rows = (len(filtered_equipment) + 2) // 3  # 3 columns
-        for i in range(rows):
-            row_frame = ttk.Frame(self.equipment_container)
-            row_frame.pack(fill=tk.X, pady=5)
-
-            for j in range(3):
-                idx = i * 3 + j
-                if idx >= len(filtered_equipment):
-                    break
-
-                item = filtered_equipment[idx]
-                self.display_equipment_card(row_frame, item)
-
-    def display_equipment_card(self, parent, item):
-        card = ttk.Frame(parent, style='Card.TFrame', padding=10)
-        card.pack(side=tk.LEFT, padx=5, fill=tk.BOTH, expand=True)
-
-        # Item name
-        ttk.Label(card, text=item["name"], font=('Arial', 11, 'bold'), wraplength=200).pack(anchor=tk.W)
-
-        # Category
-        ttk.Label(card, text=f"Category: {item['category']}").pack(anchor=tk.W)
-
-        # Rating
-        ttk.Label(card, text=f"⭐ {item['rating']}").pack(anchor=tk.W)
-
-        # Price
-        original_price = item["price"]
-        discount_price = original_price * (100 - item["discount"]) / 100
-
-        price_frame = ttk.Frame(card)
-        price_frame.pack(fill=tk.X, pady=5)
-
-        ttk.Label(price_frame, text=f"₹{original_price}",
-                  font=('Arial', 9), foreground='gray').pack(side=tk.LEFT)
-        ttk.Label(price_frame, text=f"₹{discount_price:.0f}",
-                  font=('Arial', 12, 'bold')).pack(side=tk.LEFT, padx=5)
-        ttk.Label(price_frame, text=f"{item['discount']}% OFF",
-                  font=('Arial', 9, 'bold'), foreground='green').pack(side=tk.LEFT)
-
-        # Buttons
-        btn_frame = ttk.Frame(card)
-        btn_frame.pack(fill=tk.X)
-
-        details_btn = ttk.Button(btn_frame, text="Details",
-                                 command=lambda i=item: self.show_equipment_details(i))
-        details_btn.pack(side=tk.LEFT, padx=2)
-
-        cart_btn = ttk.Button(btn_frame, text="Add to Cart", style='Accent.TButton',
-                              command=lambda i=item: self.add_to_cart(i))
-        cart_btn.pack(side=tk.LEFT, padx=2)
+        self.equipment_empty.pack_forget()
+        self.equipment_list.pack(fill=tk.BOTH, expand=True)
+        self.equipment_list.load(lambda cursor: query(cursor)[:2], total)
 
     def show_equipment_details(self, item):
         details_window = tk.Toplevel(self.root)
@@ -1678,7 +4922,7 @@ class AcadInfoApp:
         price_frame.pack(fill=tk.X, pady=5)
 
         original_price = item["price"]
-        discount_price = original_price * (100 - item["discount"]) / 100
+        discount_price = self.catalog.columns("equipment").value(item["id"], "discounted_price")
 
         ttk.Label(price_frame, text=f"Original Price: ₹{original_price}",
                   font=('Arial', 10), foreground='gray').pack(anchor=tk.W)
@@ -1714,13 +4958,14 @@ class AcadInfoApp:
             window.destroy()
 
     def show_upgrade_page(self):
-        self.clear_content_frame()
+        self.pages.show("upgrade", self.build_upgrade_page)
 
-        ttk.Label(self.content_frame, text="Upgrade to Premium", style='Header.TLabel').pack(pady=10)
+    def build_upgrade_page(self, page):
+        ttk.Label(page, text="Upgrade to Premium", style='Header.TLabel').pack(pady=10)
 
         if self.user_data.get("premium", False):
             # Already premium member
-            premium_frame = ttk.Frame(self.content_frame, style='Card.TFrame', padding=20)
+            premium_frame = ttk.Frame(page, style='Card.TFrame', padding=20)
             premium_frame.pack(fill=tk.BOTH, expand=True, pady=20)
 
             ttk.Label(premium_frame, text="You are already a Premium Member!",
@@ -1741,7 +4986,7 @@ class AcadInfoApp:
             return
 
         # Benefits
-        benefits_frame = ttk.LabelFrame(self.content_frame, text="Premium Benefits", padding=15)
+        benefits_frame = ttk.LabelFrame(page, text="Premium Benefits", padding=15)
         benefits_frame.pack(fill=tk.X, pady=10, padx=10)
 
         benefits = [
@@ -1759,7 +5004,7 @@ class AcadInfoApp:
             ttk.Label(benefits_frame, text=benefit, font=('Arial', 11)).pack(anchor=tk.W, pady=2)
 
         # Pricing options
-        pricing_frame = ttk.Frame(self.content_frame)
+        pricing_frame = ttk.Frame(page)
         pricing_frame.pack(pady=20)
 
         # Monthly option
@@ -1791,10 +5036,11 @@ class AcadInfoApp:
         pricing_frame.columnconfigure(1, weight=1)
 
         # Testimonials
-        testimonials_frame = ttk.LabelFrame(self.content_frame, text="What Our Premium Members Say", padding=10)
+        testimonials_frame = ttk.LabelFrame(page, text="What Our Premium Members Say", padding=10)
         testimonials_frame.pack(fill=tk.X, pady=10)
 
         testimonial = random.choice(self.testimonials)
+        self.add_thumbnail(testimonials_frame, testimonial.get("image"), side=tk.LEFT, anchor=tk.N, padx=(0, 8))
         ttk.Label(testimonials_frame, text=f"\"{testimonial['text']}\"",
                   font=('Arial', 10, 'italic'), wraplength=600).pack()
         ttk.Label(testimonials_frame, text=f"- {testimonial['name']}",
@@ -1817,16 +5063,13 @@ class AcadInfoApp:
             messagebox.showinfo("Processing", "Redirecting to secure payment gateway...")
 
     def complete_upgrade(self, plan):
-        self.users[self.current_user]["premium"] = True
-        self.user_data["premium"] = True
-
         # Record subscription date
         today = datetime.now().strftime("%Y-%m-%d")
-        self.users[self.current_user]["premium_since"] = today
+        fields = {"premium": True, "premium_since": today}
         if plan == "yearly":
-            self.users[self.current_user]["premium_until"] = (datetime.now() + timedelta(days=365)).strftime("%Y-%m-%d")
+            fields["premium_until"] = (datetime.now() + timedelta(days=365)).strftime("%Y-%m-%d")
 
-        self.save_users()
+        self.update_user(fields)
 
         messagebox.showinfo("Upgrade Complete",
                             "Thank you for upgrading to Premium!\n\n"
@@ -1839,8 +5082,7 @@ class AcadInfoApp:
                                        "You will lose access to premium benefits at the end of your billing period.")
         if response:
             # In a real app, we would schedule the cancellation
-            self.users[self.current_user]["premium_auto_renew"] = False
-            self.save_users()
+            self.update_user({"premium_auto_renew": False})
 
             messagebox.showinfo("Subscription Cancelled",
                                 "Your premium subscription will not renew.\n\n"
@@ -1891,31 +5133,83 @@ class AcadInfoApp:
         if not self.user_data.get("bookings", []):
             ttk.Label(bookings_frame, text="You have no bookings yet.").pack(pady=20)
         else:
-            # Create a treeview to display bookings
-            columns = ("type", "name", "date", "status")
-            tree = ttk.Treeview(bookings_frame, columns=columns, show="headings")
-
-            # Define headings
-            tree.heading("type", text="Type")
-            tree.heading("name", text="Name")
-            tree.heading("date", text="Date")
-            tree.heading("status", text="Status")
-
-            # Add data
-            for booking in self.user_data.get("bookings", []):
-                tree.insert("", tk.END, values=(
-                    booking.get("type", ""),
-                    booking.get("name", ""),
-                    booking.get("date", ""),
-                    booking.get("status", "")
-                ))
-
-            tree.pack(fill=tk.BOTH, expand=True)
+            self.build_bookings_table(bookings_frame, self.user_data["bookings"])
 
         # Close button
         close_btn = ttk.Button(container, text="Close", command=profile_window.destroy)
         close_btn.pack(pady=10)
 
+    def build_bookings_table(self, parent, bookings):
+        """Bookings table, sorted by clicking a heading and filtered by type or text, that reads rows as it scrolls"""
+        filter_frame = ttk.Frame(parent)
+        filter_frame.pack(fill=tk.X, pady=(0, 5))
+
+        ttk.Label(filter_frame, text="Type:").pack(side=tk.LEFT, padx=5)
+        type_var = tk.StringVar(value=ANY_OPTION)
+        type_filter = ttk.Combobox(filter_frame, textvariable=type_var, state='readonly', width=10,
+                                   values=[ANY_OPTION] + sorted({booking.get("type", "") for booking in bookings}))
+        type_filter.pack(side=tk.LEFT, padx=5)
+
+        ttk.Label(filter_frame, text="Search:").pack(side=tk.LEFT, padx=5)
+        text_var = tk.StringVar()
+        ttk.Entry(filter_frame, textvariable=text_var).pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
+
+        table_frame = ttk.Frame(parent)
+        table_frame.pack(fill=tk.BOTH, expand=True)
+
+        headings = {"type": "Type", "name": "Name", "date": "Date", "status": "Status"}
+        tree = ttk.Treeview(table_frame, columns=tuple(headings), show="headings")
+        scrollbar = ttk.Scrollbar(table_frame, orient=tk.VERTICAL, command=tree.yview)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        table = BookingsTable(bookings)
+        # Rows are inserted a page at a time; remember which ones are academy registrations
+        academy_rows = {}
+
+        def load_more():
+            for booking in table.next_page():
+                item = tree.insert("", tk.END, values=tuple(booking.get(column, "") for column in headings))
+                if "academy_id" in booking:
+                    academy_rows[item] = booking["academy_id"]
+
+        def reload(*args):
+            tree.delete(*tree.get_children())
+            academy_rows.clear()
+            kind = type_var.get()
+            table.filter(kind=None if kind == ANY_OPTION else kind, text=text_var.get())
+            for column, title in headings.items():
+                tree.heading(column, text=table.heading(column, title), command=lambda c=column: sort_by(c))
+            load_more()
+
+        def sort_by(column):
+            table.sort_by(column)
+            reload()
+
+        def on_scroll(first, last):
+            scrollbar.set(first, last)
+            # Fetch the next page once the last rows come into view (or while they all fit)
+            if float(last) > 0.9:
+                load_more()
+
+        def open_academy(event):
+            academy_id = academy_rows.get(tree.focus())
+            if academy_id is not None:
+                self.view_booked_academy(academy_id)
+
+        tree.configure(yscrollcommand=on_scroll)
+        tree.bind("<Double-1>", open_academy)
+        type_filter.bind("<<ComboboxSelected>>", reload)
+        text_var.trace_add("write", reload)
+        reload()
+
+    def view_booked_academy(self, academy_id):
+        resolved = self.catalog.academy_index.resolve(academy_id)
+        if resolved is None:
+            messagebox.showinfo("Academy", "This academy is no longer listed.")
+            return
+        self.view_academy_details(resolved[3])
+
     def show_about_dialog(self):
         about_text = (
             "ACADINFO - Sports Academy Platform\n"
@@ -1948,12 +5242,710 @@ class AcadInfoApp:
         )
         messagebox.showinfo("User Guide", guide_text)
 
-    def clear_content_frame(self):
-        for widget in self.content_frame.winfo_children():
-            widget.destroy()
 
+def _measure_allocations(build):
+    """Return ``(result, bytes still allocated)`` for ``build()``"""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    allocated = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, allocated
+
+
+def benchmark_memory(args):
+    """Compare the memory held by users/bookings/courses as dicts and as slotted records"""
+    statuses = ["Pending", "Enrolled", "Payment Pending", "Confirmed"]
+    types = ["academy", "course", "webinar"]
+    sports = ["Cricket", "Football", "Basketball", "Chess", "Hockey"]
+
+    def user_lines():
+        # JSON text so every string is a fresh object, as after json.load
+        for i in range(args.users):
+            bookings = [{"type": types[(i + j) % 3], "name": f"Booking {j}", "sport": sports[(i + j) % 5],
+                         "date": "2024-03-15", "status": statuses[(i + j) % 4]} for j in range(args.bookings)]
+            yield f"user{i}", json.dumps({
+                "password": hashlib.sha256(str(i).encode()).hexdigest(), "email": f"user{i}@example.com",
+                "full_name": f"User {i}", "phone": "9000000000", "type": "student", "premium": i % 5 == 0,
+                "joined": "2024-01-01", "last_login": "2024-03-15 10:00:00", "bookings": bookings})
+
+    def course_lines():
+        for i in range(args.courses):
+            yield i, json.dumps({
+                "id": i, "title": f"Course {i}", "price": 500 + i % 1000, "duration": "4 weeks",
+                "instructor": "Professional Coach", "sport": sports[i % 5], "description": "Course description",
+                "modules": ["Module 1", "Module 2"], "image": f"course{i}.jpg", "students": i, "rating": 4.5})
+
+    rows = []
+    for label, lines, record_class in (("users", user_lines, UserRecord), ("courses", course_lines, Course)):
+        count = args.users if label == "users" else args.courses
+        as_dicts, dict_bytes = _measure_allocations(lambda: {key: json.loads(text) for key, text in lines()})
+        del as_dicts
+        records, record_bytes = _measure_allocations(
+            lambda: {key: record_class.from_dict(json.loads(text)) for key, text in lines()})
+
+        # The records must carry exactly the same data
+        for key, text in lines():
+            if records[key].to_dict() != json.loads(text):
+                raise AssertionError(f"{label} record {key} did not round-trip")
+        del records
+        rows.append((label, count, dict_bytes, record_bytes))
+
+    print(f"{'data':<10}{'count':>10}{'dicts (MB)':>14}{'records (MB)':>14}{'saved':>8}")
+    for label, count, dict_bytes, record_bytes in rows:
+        print(f"{label:<10}{count:>10}{dict_bytes / 2 ** 20:>14.1f}{record_bytes / 2 ** 20:>14.1f}"
+              f"{1 - record_bytes / dict_bytes:>8.0%}")
+
+
+def benchmark_kdf(args):
+    """Calibrate the password KDF for a target latency and report verification times"""
+    settings = PasswordHasher.calibrate(args.algorithm, args.target_ms)
+    hasher = PasswordHasher(settings)
+    stored = hasher.hash("Benchmark123")
+    legacy = hashlib.sha256(b"Benchmark123").hexdigest()
+
+    print(f"Target: {args.target_ms} ms per hash")
+    print(f"Chosen: {json.dumps(settings)}")
+    for label, value in (("legacy sha256", legacy), (settings["algorithm"], stored)):
+        timings = []
+        for _ in range(args.rounds):
+            started = time.perf_counter()
+            hasher.verify("Benchmark123", value)
+            timings.append((time.perf_counter() - started) * 1000)
+        timings.sort()
+        print(f"{label:<16} verify median {timings[len(timings) // 2]:9.3f} ms   max {timings[-1]:9.3f} ms")
+    hasher.close()
+
+    if args.save:
+        PasswordHasher.save_settings(settings)
+        print(f"Saved to {KDF_SETTINGS_FILE}")
+
+
+def write_synthetic_catalog(directory, size):
+    """Write a catalog with ``size`` academies, courses, webinars and equipment items to ``directory``"""
+    sports = ["Cricket", "Football", "Basketball", "Chess", "Hockey"]
+    states = ["Delhi", "Maharashtra", "Karnataka", "West Bengal", "Tamil Nadu"]
+    academies = {}
+    for i in range(size):
+        academies.setdefault(sports[i % 5], {}).setdefault(states[i // 5 % 5], []).append({
+            "id": i + 1, "name": f"Academy {i}", "rating": 4.0 + i % 10 / 10, "coach": f"Coach {i}",
+            "established": 1990 + i % 30, "facilities": ["Gym", "Hostel"], "address": f"{i} Stadium Road", "contact": "011-23456789",
+            "fees": f"₹{5000 + i % 20 * 1000:,} per quarter", "timings": "6:00 AM - 9:00 AM",
+            "lat": 8.0 + i * 7919 % 2400 / 100, "lon": 68.0 + i * 104729 % 2900 / 100})
+    sections = {
+        "academies": academies,
+        "courses": [{"id": i, "title": f"Course {i}", "price": 500 + i % 1000, "duration": "4 weeks",
+                     "instructor": "Coach", "sport": sports[i % 5], "description": "Description", "modules": ["A"],
+                     "image": f"course{i}.jpg", "students": i, "rating": 4.5} for i in range(size)],
+        "webinars": [{"id": i, "title": f"Webinar {i}", "price": 399, "date": "Friday, 17th March 2023",
+                      "time": "7:00 PM - 8:00 PM", "duration": "1 hour", "instructor": "Coach",
+                      "description": "Description", "image": f"webinar{i}.jpg", "seats": 100, "registered": 0}
+                     for i in range(size)],
+        "equipment": [{"id": i, "name": f"Item {i}", "price": 1000 + i % 500, "category": sports[i % 5],
+                       "discount": i % 20, "description": "Description", "image": f"item{i}.jpg", "stock": 10,
+                       "rating": 4.5} for i in range(size)],
+        "articles": [],
+        "testimonials": [],
+        "cities": {},
+    }
+    for name, data in sections.items():
+        with open(os.path.join(directory, f"{name}.json"), 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+
+
+def benchmark_startup(args):
+    """Time the catalog work done before the login screen, eager versus lazy, as the catalog grows"""
+    print(f"{'items/section':>14}{'eager (ms)':>14}{'lazy (ms)':>12}{'academies page (ms)':>22}")
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as directory:
+            write_synthetic_catalog(directory, size)
+
+            # Previous behaviour: every section built before the login screen
+            started = time.perf_counter()
+            catalog = Catalog(directory)
+            for name in Catalog.SECTIONS:
+                catalog.section(name)
+            eager = time.perf_counter() - started
+            del catalog
+            gc.collect()
+
+            started = time.perf_counter()
+            catalog = Catalog(directory)
+            lazy = time.perf_counter() - started
+
+            # Paid later, when Find Academies first opens
+            started = time.perf_counter()
+            catalog.section("academies")
+            first_page = time.perf_counter() - started
+
+        print(f"{size:>14}{eager * 1000:>14.2f}{lazy * 1000:>12.3f}{first_page * 1000:>22.2f}")
+
+
+def benchmark_search(args):
+    """Build a BM25 index over synthetic catalog documents and time queries against it"""
+    rng = random.Random(42)
+    common = ["academy", "cricket", "football", "hockey", "chess", "tennis", "swimming", "pool", "hostel", "gym",
+              "coach", "training", "bangalore", "mumbai", "delhi", "chennai", "spin", "bowling", "batting", "course"]
+    rare = [f"term{i}" for i in range(20000)]
+
+    def text(words):
+        return " ".join(rng.choice(common) if rng.random() < 0.3 else rng.choice(rare) for _ in range(words))
+
+    index = SearchIndex()
+    started = time.perf_counter()
+    for doc_id in range(args.docs):
+        index.add(("academy", doc_id), text(4), text(30))
+    build = time.perf_counter() - started
+
+    queries = [" ".join(rng.choice(common + rare[:2000]) for _ in range(rng.randint(1, 4)))
+               for _ in range(args.queries)]
+
+    def run_queries():
+        timings = []
+        for query in queries:
+            started = time.perf_counter()
+            index.search(query)
+            timings.append((time.perf_counter() - started) * 1000)
+        timings.sort()
+        return (f"median {timings[len(timings) // 2]:.2f} ms, p95 {timings[int(len(timings) * 0.95)]:.2f} ms, "
+                f"max {timings[-1]:.2f} ms")
+
+    print(f"Indexed {args.docs} documents in {build:.2f}s")
+    # The first pass also builds each term's cached impact list
+    print(f"{args.queries} queries, cold: {run_queries()}")
+    print(f"{args.queries} queries, warm: {run_queries()}")
+
+
+def benchmark_typeahead(args):
+    """Time top-k prefix completions over a large set of ranked names"""
+    rng = random.Random(7)
+    syllables = ["ban", "ga", "lore", "mum", "bai", "del", "hi", "chen", "nai", "pu", "ne", "kol", "ka", "ta", "ja"]
+    index = PrefixIndex(k=args.k)
+
+    started = time.perf_counter()
+    for i in range(args.entries):
+        name = " ".join("".join(rng.choice(syllables) for _ in range(rng.randint(2, 4))).title()
+                        for _ in range(rng.randint(1, 3)))
+        index.add(f"{name} {i}", rng.random() * 5)
+    build = time.perf_counter() - started
+
+    prefixes = ["".join(rng.choice(syllables) for _ in range(rng.randint(1, 2)))[:rng.randint(1, 5)]
+                for _ in range(args.queries)]
+    started = time.perf_counter()
+    for prefix in prefixes:
+        index.complete(prefix)
+    per_query = (time.perf_counter() - started) / len(prefixes) * 1e6
+
+    print(f"Indexed {args.entries} names in {build:.2f}s")
+    print(f"Top-{args.k} completion: {per_query:.1f} µs per prefix over {args.queries} prefixes")
+
+
+def benchmark_fuzzy(args):
+    """Compare trigram-filtered fuzzy lookup with a brute-force Levenshtein scan"""
+    rng = random.Random(11)
+    syllables = ["bhai", "chung", "ras", "quin", "ha", "sha", "rma", "vik", "ram", "ath", "ore", "san", "jay", "ban", "gar"]
+    names = [" ".join("".join(rng.choice(syllables) for _ in range(rng.randint(2, 3))).title() for _ in range(2))
+             for _ in range(args.names)]
+    index = FuzzyIndex()
+    started = time.perf_counter()
+    for i, name in enumerate(names):
+        index.add(i, name)
+    build = time.perf_counter() - started
+
+    def misspell(word):
+        i = rng.randrange(len(word))
+        return word[:i] + rng.choice("aeiou") + word[i + 1:]
+
+    queries = [misspell(rng.choice(names).split()[0].lower()) for _ in range(args.queries)]
+    started = time.perf_counter()
+    fuzzy_results = [set(doc_key for _, doc_key in index.search(query, limit=len(names))) for query in queries]
+    fuzzy_ms = (time.perf_counter() - started) / len(queries) * 1000
+
+    normalized = [[FuzzyIndex.normalize(name)] + FuzzyIndex.normalize(name).split() for name in names]
+    started = time.perf_counter()
+    brute_results = []
+    for query in queries:
+        allowed = min(FuzzyIndex.default_distance(query), (len(query) + 1) // 3)
+        brute_results.append({i for i, terms in enumerate(normalized)
+                              if min(levenshtein(query, term) for term in terms) <= allowed})
+    brute_ms = (time.perf_counter() - started) / len(queries) * 1000
+
+    agree = sum(fuzzy == brute for fuzzy, brute in zip(fuzzy_results, brute_results))
+    print(f"Indexed {args.names} names in {build:.2f}s")
+    print(f"Trigram index: {fuzzy_ms:.2f} ms per query")
+    print(f"Brute force:   {brute_ms:.2f} ms per query ({brute_ms / max(fuzzy_ms, 1e-9):.0f}x slower)")
+    print(f"Identical matches for {agree}/{len(queries)} queries")
+
+
+def benchmark_geo(args):
+    """Time radius and nearest-neighbour queries on the grid index against a full scan"""
+    rng = random.Random(5)
+    points = [(i, rng.uniform(8.0, 32.0), rng.uniform(68.0, 97.0)) for i in range(args.academies)]
+    index = GeoIndex()
+    for key, lat, lon in points:
+        index.add(key, lat, lon, key)
+    queries = [(rng.uniform(8.0, 32.0), rng.uniform(68.0, 97.0)) for _ in range(args.queries)]
+
+    def timed(run):
+        started = time.perf_counter()
+        results = [run(lat, lon) for lat, lon in queries]
+        return results, (time.perf_counter() - started) / len(queries) * 1000
+
+    def scan_within(lat, lon):
+        return sorted((distance, key) for distance, key in
+                      ((distance_km(lat, lon, p_lat, p_lon), key) for key, p_lat, p_lon in points)
+                      if distance <= args.radius)
+
+    def scan_nearest(lat, lon):
+        return heapq.nsmallest(args.k, ((distance_km(lat, lon, p_lat, p_lon), key) for key, p_lat, p_lon in points))
+
+    grid_within, grid_within_ms = timed(lambda lat, lon: index.within(lat, lon, args.radius))
+    full_within, full_within_ms = timed(scan_within)
+    grid_nearest, grid_nearest_ms = timed(lambda lat, lon: index.nearest(lat, lon, args.k))
+    full_nearest, full_nearest_ms = timed(scan_nearest)
+
+    def same(a, b):
+        return all([key for _, key in x] == [key for _, key in y] for x, y in zip(a, b))
+
+    print(f"{args.academies} academies, {args.queries} queries")
+    print(f"Within {args.radius:g} km: grid {grid_within_ms:.3f} ms, scan {full_within_ms:.1f} ms"
+          f"{'' if same(grid_within, full_within) else ' (MISMATCH)'}")
+    print(f"{args.k} nearest:   grid {grid_nearest_ms:.3f} ms, scan {full_nearest_ms:.1f} ms"
+          f"{'' if same(grid_nearest, full_nearest) else ' (MISMATCH)'}")
+
+
+def benchmark_pages(args):
+    """Time one sorted page of courses as the category grows, presorted index against sorting the matches"""
+    sports = ["Cricket", "Football", "Basketball", "Chess", "Hockey"]
+    print(f"{'courses':>10}{'index page (µs)':>18}{'sorted page (µs)':>19}")
+    for size in args.sizes:
+        rng = random.Random(size)
+        courses = [Course.from_dict({"id": i, "title": f"Course {i}", "price": rng.randint(200, 3000),
+                                     "sport": sports[i % 5], "rating": round(rng.uniform(3, 5), 1),
+                                     "students": rng.randint(0, 5000)}) for i in range(size)]
+        index = SortedIndex(Catalog.SORTS["courses"]["Rating"],
+                            lambda course: Catalog._sort_groups("courses", course))
+        for course in courses:
+            index.add(course)
+        group = ("Cricket", "standard")
+        matches = [course for course in courses if course["sport"] == "Cricket"
+                   and course["price"] <= FREE_TIER_MAX_COURSE_PRICE]
+
+        def timed(make_fetch):
+            started = time.perf_counter()
+            fetch, cursor = make_fetch(), None
+            for _ in range(args.pages):
+                page, cursor = fetch(cursor)
+            return (time.perf_counter() - started) / args.pages * 1e6
+
+        indexed = timed(lambda: lambda cursor: index.page(group, after=cursor, limit=PAGE_SIZE))
+        # An unindexed result list (e.g. academies near a city) pays one sort per query, amortised over its pages
+        unindexed = timed(lambda: sorted_pages(matches, Catalog.SORTS["courses"]["Rating"]))
+        print(f"{size:>10}{indexed:>18.1f}{unindexed:>19.1f}")
+
+
+def benchmark_cache(args):
+    """Replay skewed page navigation with occasional stock updates, with and without the query cache"""
+    sorts = list(Catalog.SORTS["equipment"])
+    with tempfile.TemporaryDirectory() as directory:
+        write_synthetic_catalog(directory, args.size)
+        catalog = Catalog(directory)
+        items = catalog.section("equipment")
+        categories = sorted({item["category"] for item in items.values()}) + [None]
+        for sort in sorts:
+            catalog.sorted_index("equipment", sort)
+
+        rng = random.Random(3)
+        # A few popular views get most of the traffic
+        views = [(category, sort) for category in categories for sort in sorts]
+        weights = [1 / (rank + 1) for rank in range(len(views))]
+        plan = rng.choices(views, weights, k=args.queries)
+        updates = set(rng.sample(range(args.queries), int(args.queries * args.update_rate)))
+
+        def run(cache):
+            started = time.perf_counter()
+            for step, (category, sort) in enumerate(plan):
+                if step in updates:
+                    item = items[rng.randrange(len(items))]
+                    catalog.update_record("equipment", item, {"stock": max(0, item["stock"] - 1)})
+                index = catalog.sorted_index("equipment", sort)
+                compute = lambda: index.page(category, limit=PAGE_SIZE)
+                if cache is None:
+                    compute()
+                else:
+                    cache.get(("equipment", category, sort), compute, tags=[("equipment", category)])
+            return (time.perf_counter() - started) / len(plan) * 1e6
+
+        uncached = run(None)
+        cache = QueryCache(max_entries=args.cache_size)
+        catalog.listeners.append(
+            lambda kind, groups: cache.invalidate(*[(kind, group) for group in groups | {None}]))
+        cached = run(cache)
+
+    stats = cache.stats()
+    print(f"{args.queries} page views over {args.size} items, {len(updates)} stock updates")
+    print(f"Uncached: {uncached:.1f} µs per view")
+    print(f"Cached:   {cached:.1f} µs per view, hit rate {stats['hit_rate']:.0%} "
+          f"({stats['hits']} hits, {stats['misses']} misses, {stats['evictions']} evictions, "
+          f"{stats['invalidations']} invalidations)")
+
+
+def benchmark_columnar(args):
+    """Filter, price and sort a large equipment catalog row by row versus over columns"""
+    rng = random.Random(9)
+    categories = ["Cricket", "Football", "Basketball", "Chess", "Hockey", "Tennis", "Badminton", "Swimming"]
+    columns = {
+        "id": list(range(args.items)),
+        "price": [rng.randint(100, 20000) for _ in range(args.items)],
+        "discount": [rng.randint(0, 40) for _ in range(args.items)],
+        "rating": [round(rng.uniform(3.0, 5.0), 1) for _ in range(args.items)],
+        "stock": [rng.randint(0, 50) for _ in range(args.items)],
+        "category": [rng.choice(categories) for _ in range(args.items)],
+    }
+    spec = Catalog.COLUMNS["equipment"]
+    started = time.perf_counter()
+    table = ColumnarTable.from_columns(columns, spec["categorical"], spec["derived"])
+    build = time.perf_counter() - started
+
+    # Row-at-a-time, as the equipment page used to work: per-row predicates and discounted price, full sort
+    rows = list(zip(columns["id"], columns["price"], columns["discount"], columns["rating"], columns["stock"],
+                    columns["category"]))
+
+    def row_query(category, max_price):
+        matches = []
+        for record_id, price, discount, rating, stock, row_category in rows:
+            final_price = price * (100 - discount) / 100
+            if row_category == category and stock > 0 and final_price <= max_price:
+                matches.append((final_price, record_id))
+        matches.sort()
+        return [record_id for _, record_id in matches[:PAGE_SIZE]]
+
+    def column_query(category, max_price):
+        return table.select({"category": category}, {"discounted_price": (None, max_price), "stock": (1, None)},
+                            "discounted_price")[0]
+
+    queries = [(rng.choice(categories), rng.randint(1000, 15000)) for _ in range(args.queries)]
+    timings = {}
+    for name, run in (("row loop", row_query), ("columnar", column_query)):
+        started = time.perf_counter()
+        results = [run(*query) for query in queries]
+        timings[name] = ((time.perf_counter() - started) / len(queries) * 1000, results)
+
+    engine = "NumPy" if np is not None else "array fallback"
+    print(f"{args.items} items, columnar engine: {engine} (built in {build:.2f}s)")
+    for name, (ms, _) in timings.items():
+        print(f"{name:>10}: {ms:8.1f} ms per filtered, sorted page")
+    print(f"Same pages: {timings['row loop'][1] == timings['columnar'][1]}")
+
+
+def benchmark_cards(args):
+    """Widgets built and refresh latency for course grids that recycle cards versus rebuild them"""
+    rng = random.Random(21)
+    sports = ["Cricket", "Football", "Basketball", "Chess", "Hockey", "Tennis"]
+    courses = [{"id": course_id, "title": f"Course {course_id}", "sport": rng.choice(sports),
+                "duration": f"{rng.randint(2, 24)} weeks", "instructor": f"Coach {course_id % 97}",
+                "rating": round(rng.uniform(3.0, 5.0), 1), "students": rng.randint(10, 5000),
+                "price": rng.randint(500, 20000)} for course_id in range(args.courses)]
+    # Each refresh is a different sport filter, as when the member changes the course page filters
+    by_sport = {sport: [course for course in courses if course["sport"] == sport] for sport in sports}
+    refreshes = [by_sport[rng.choice(sports)] for _ in range(args.refreshes)]
+    app = argparse.Namespace(user_data={"premium": False})
+
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        print(f"Card benchmark needs a display: {e}")
+        return
+    root.geometry("900x700")
+    for recycle in (False, True):
+        course_list = VirtualList(root, lambda parent: CourseCard(parent, app), COURSE_ROW_HEIGHT, columns=3,
+                                  recycle=recycle)
+        course_list.pack(fill=tk.BOTH, expand=True)
+        root.update()
+        timings = []
+        first_screen = []
+        for results in refreshes:
+            started = time.perf_counter()
+            course_list.load(offset_pages(results), len(results))
+            first_screen.append(course_list.last_refresh_ms)
+            # Let the remaining slices run, as the event loop would between user actions
+            while course_list.rendering:
+                root.update()
+            root.update_idletasks()
+            timings.append((time.perf_counter() - started) * 1000)
+        stats = course_list.stats()
+        timings.sort()
+        name = "pooled" if recycle else "recreate"
+        print(f"{name:>8}: {stats['cards_created']:5d} cards built, {stats['reused']:5d} rows reused, "
+              f"first slice {max(first_screen):5.1f} ms worst, "
+              f"full refresh {timings[len(timings) // 2]:6.1f} ms median, {timings[-1]:6.1f} ms worst")
+        course_list.destroy()
+    root.destroy()
+
+
+def benchmark_images(args):
+    """Thumbnail latency decoding product photos versus reading the content-hashed disk cache"""
+    rng = random.Random(25)
+    with tempfile.TemporaryDirectory() as directory:
+        image_dir = os.path.join(directory, "images")
+        os.makedirs(image_dir)
+        names = []
+        for i in range(args.images):
+            name = f"item{i}.jpg"
+            image = Image.new("RGB", (args.width, args.height), tuple(rng.randrange(256) for _ in range(3)))
+            image.paste(tuple(rng.randrange(256) for _ in range(3)), (0, 0, args.width // 2, args.height // 2))
+            image.save(os.path.join(image_dir, name), "JPEG", quality=85)
+            names.append(name)
+        loader = ImageLoader(None, image_dir=image_dir, cache_dir=os.path.join(directory, "thumbnails"))
+        print(f"{args.images} photos of {args.width}x{args.height}, thumbnails {loader.size[0]}x{loader.size[1]}")
+        for label in ("decode + resize", "disk cache"):
+            started = time.perf_counter()
+            for name in names:
+                loader.thumbnail(name)
+            ms = (time.perf_counter() - started) / len(names) * 1000
+            print(f"{label:>15}: {ms:6.2f} ms per image on a worker thread")
+        loader.close()
+
+
+class ThroughputReporter:
+    """Prints progress of a long-running transfer to stderr about once a second"""
+
+    def __init__(self, label, interval=1.0):
+        self.label = label
+        self.interval = interval
+        self.started = self._last_report = time.perf_counter()
+        self.records = 0
+        self.bytes = 0
+
+    def update(self, records=1, nbytes=0):
+        self.records += records
+        self.bytes += nbytes
+        now = time.perf_counter()
+        if now - self._last_report >= self.interval:
+            self._last_report = now
+            print(f"{self.label}: {self.rate_text()}", file=sys.stderr)
+
+    def rate_text(self):
+        elapsed = max(time.perf_counter() - self.started, 1e-9)
+        return (f"{self.records} records, {self.bytes / 2 ** 20:.1f} MB in {elapsed:.1f}s "
+                f"({self.records / elapsed:,.0f} records/s, {self.bytes / 2 ** 20 / elapsed:.1f} MB/s)")
+
+
+def export_users(store, out, reporter):
+    """Stream every account to ``out`` as JSON Lines: one user line followed by its booking lines"""
+    for username, record in store.iter_users():
+        bookings = record.pop("bookings", [])
+        lines = [json.dumps({"kind": "user", "username": username, **record}, ensure_ascii=False)]
+        lines.extend(json.dumps({"kind": "booking", "username": username, **booking}, ensure_ascii=False)
+                     for booking in bookings)
+        text = "\n".join(lines) + "\n"
+        out.write(text)
+        reporter.update(len(lines), len(text.encode('utf-8')))
+
+
+def import_users(store, lines, reporter, batch_size=1000):
+    """Stream JSON Lines into ``store`` in batches, skipping usernames or emails that already exist.
+
+    Memory is bounded by ``batch_size``: duplicates are detected against the
+    store plus the batch not yet written. Booking lines belong to the most
+    recent user line; bookings of a skipped duplicate are skipped with it.
+    User lines without a password are counted as invalid and skipped along
+    with their bookings, since nobody could log in to them. Returns a dict
+    of counters.
+    """
+    counts = {"users": 0, "bookings": 0, "duplicates": 0, "invalid": 0, "orphaned": 0}
+    batch = []
+    batch_usernames = set()
+    batch_emails = set()
+    current_user = None
+    current_imported = False
+
+    def flush():
+        store.apply(batch)
+        batch.clear()
+        batch_usernames.clear()
+        batch_emails.clear()
+
+    for line in lines:
+        reporter.update(1, len(line))
+        if not line.strip():
+            continue
+        try:
+            entry = json.loads(line)
+            kind = entry.pop("kind", "user")
+            username = entry.pop("username")
+        except (ValueError, KeyError, AttributeError):
+            counts["invalid"] += 1
+            continue
+
+        if kind == "user":
+            current_user = username
+            password = entry.get("password")
+            if not isinstance(password, str) or not password:
+                current_imported = False
+                counts["invalid"] += 1
+                continue
+            email = entry.get("email")
+            current_imported = not (username in batch_usernames or username in store
+                                    or (email and (email in batch_emails or store.find_by_email(email))))
+            if not current_imported:
+                counts["duplicates"] += 1
+                continue
+            entry["bookings"] = []
+            batch.append(("create", username, entry))
+            batch_usernames.add(username)
+            if email:
+                batch_emails.add(email)
+            counts["users"] += 1
+        elif kind == "booking":
+            if username == current_user:
+                if not current_imported:
+                    continue
+            elif username not in batch_usernames and username not in store:
+                counts["orphaned"] += 1
+                continue
+            batch.append(("booking", username, entry))
+            counts["bookings"] += 1
+        else:
+            counts["invalid"] += 1
+            continue
+
+        if len(batch) >= batch_size:
+            flush()
+
+    if batch:
+        flush()
+    return counts
+
+
+def run_export(args):
+    store = open_user_store(args.backend)
+    reporter = ThroughputReporter("export")
+    try:
+        if args.path == "-":
+            export_users(store, sys.stdout, reporter)
+        else:
+            with open(args.path, 'w', encoding='utf-8') as out:
+                export_users(store, out, reporter)
+    finally:
+        store.close()
+    print(f"Exported {reporter.rate_text()}", file=sys.stderr)
+
+
+def run_import(args):
+    store = open_user_store(args.backend)
+    reporter = ThroughputReporter("import")
+    try:
+        if args.path == "-":
+            counts = import_users(store, sys.stdin.buffer, reporter, args.batch_size)
+        else:
+            with open(args.path, 'rb') as lines:
+                counts = import_users(store, lines, reporter, args.batch_size)
+    finally:
+        store.close()
+    print(f"Read {reporter.rate_text()}", file=sys.stderr)
+    print(", ".join(f"{value} {key}" for key, value in counts.items()), file=sys.stderr)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="ACADINFO - Enlightens Your Dream")
+    commands = parser.add_subparsers(dest="command")
+
+    benchmark = commands.add_parser("benchmark", help="Run a performance benchmark")
+    benchmarks = benchmark.add_subparsers(dest="benchmark", required=True)
+
+    memory = benchmarks.add_parser("memory", help="Memory used by dict vs slotted records")
+    memory.add_argument("--users", type=int, default=100000)
+    memory.add_argument("--bookings", type=int, default=3, help="Bookings per user")
+    memory.add_argument("--courses", type=int, default=100000)
+    memory.set_defaults(run=benchmark_memory)
+
+    kdf = benchmarks.add_parser("kdf", help="Pick password hashing cost for a target latency")
+    kdf.add_argument("--algorithm", choices=["pbkdf2_sha256", "scrypt"], default="pbkdf2_sha256")
+    kdf.add_argument("--target-ms", type=float, default=250)
+    kdf.add_argument("--rounds", type=int, default=5)
+    kdf.add_argument("--save", action="store_true", help=f"Write the chosen parameters to {KDF_SETTINGS_FILE}")
+    kdf.set_defaults(run=benchmark_kdf)
+
+    startup = benchmarks.add_parser("startup", help="Catalog cost before the login screen, eager vs lazy")
+    startup.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000, 100000],
+                         help="Items per catalog section")
+    startup.set_defaults(run=benchmark_startup)
+
+    search = benchmarks.add_parser("search", help="BM25 full-text query latency")
+    search.add_argument("--docs", type=int, default=100000)
+    search.add_argument("--queries", type=int, default=200)
+    search.set_defaults(run=benchmark_search)
+
+    typeahead = benchmarks.add_parser("typeahead", help="Top-k prefix completion latency")
+    typeahead.add_argument("--entries", type=int, default=100000)
+    typeahead.add_argument("--queries", type=int, default=10000)
+    typeahead.add_argument("-k", type=int, default=10)
+    typeahead.set_defaults(run=benchmark_typeahead)
+
+    fuzzy = benchmarks.add_parser("fuzzy", help="Typo-tolerant name lookup against brute-force Levenshtein")
+    fuzzy.add_argument("--names", type=int, default=20000)
+    fuzzy.add_argument("--queries", type=int, default=20)
+    fuzzy.set_defaults(run=benchmark_fuzzy)
+
+    geo = benchmarks.add_parser("geo", help="Radius and nearest-academy queries on the spatial grid")
+    geo.add_argument("--academies", type=int, default=100000)
+    geo.add_argument("--queries", type=int, default=50)
+    geo.add_argument("--radius", type=float, default=25.0)
+    geo.add_argument("-k", type=int, default=5)
+    geo.set_defaults(run=benchmark_geo)
+
+    pages = benchmarks.add_parser("pages", help="Cost of one sorted page as a category grows")
+    pages.add_argument("--sizes", type=int, nargs="+", default=[50, 5000, 50000])
+    pages.add_argument("--pages", type=int, default=5, help="Consecutive pages fetched per size")
+    pages.set_defaults(run=benchmark_pages)
+
+    cache = benchmarks.add_parser("cache", help="Query cache hit rate and latency on skewed page navigation")
+    cache.add_argument("--size", type=int, default=50000)
+    cache.add_argument("--queries", type=int, default=20000)
+    cache.add_argument("--update-rate", type=float, default=0.01, help="Fraction of views preceded by a stock change")
+    cache.add_argument("--cache-size", type=int, default=256)
+    cache.set_defaults(run=benchmark_cache)
+
+    columnar = benchmarks.add_parser("columnar", help="Row-by-row versus columnar filtering and sorting")
+    columnar.add_argument("--items", type=int, default=1000000)
+    columnar.add_argument("--queries", type=int, default=10)
+    columnar.set_defaults(run=benchmark_columnar)
+
+    cards = benchmarks.add_parser("cards", help="Widgets built and refresh latency, pooled versus recreated cards")
+    cards.add_argument("--courses", type=int, default=3000)
+    cards.add_argument("--refreshes", type=int, default=50)
+    cards.set_defaults(run=benchmark_cards)
+
+    images = benchmarks.add_parser("images", help="Card thumbnail latency, decoding versus the disk cache")
+    images.add_argument("--images", type=int, default=200)
+    images.add_argument("--width", type=int, default=1600)
+    images.add_argument("--height", type=int, default=1200)
+    images.set_defaults(run=benchmark_images)
+
+    backends = sorted(USER_STORE_BACKENDS)
+
+    export = commands.add_parser("export", help="Stream user accounts and bookings out as JSON Lines")
+    export.add_argument("path", help="Output file, or - for stdout")
+    export.add_argument("--backend", choices=backends, help="User store to read (default: ACADINFO_USER_STORE)")
+    export.set_defaults(run=run_export)
+
+    import_ = commands.add_parser("import", help="Stream user accounts and bookings in from JSON Lines")
+    import_.add_argument("path", help="Input file, or - for stdin")
+    import_.add_argument("--backend", choices=backends, help="User store to write (default: ACADINFO_USER_STORE)")
+    import_.add_argument("--batch-size", type=int, default=1000, help="Operations written per batch")
+    import_.set_defaults(run=run_import)
+
+    args = parser.parse_args(argv)
+    if args.command is not None:
+        args.run(args)
+        return
 
-if __name__ == "__main__":
     root = tk.Tk()
     app = AcadInfoApp(root)
     root.mainloop()
+
+
+if __name__ == "__main__":
+    main()